@@ -8,6 +8,7 @@ from .followup import FollowupAgent
 from .evaluator import EvaluatorAgent
 from .feedback import FeedbackAgent
 from .report import ReportAgent
+from .profile import CandidateProfile
 
 __all__ = [
     'InterviewerAgent',
@@ -15,5 +16,6 @@ __all__ = [
     'EvaluatorAgent',
     'FeedbackAgent',
     'ReportAgent',
+    'CandidateProfile',
 ]
 
@@ -0,0 +1,119 @@
+"""
+Session Aggregate
+Running statistics over a session's evaluated answers, updated once per
+answer so reports and live stats never rescan the history
+"""
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class SessionAggregate:
+    """Running sums, counts, minimums and maximums per score dimension,
+    plus how often each strength and improvement phrase was given.
+
+    ``add`` is O(1) per answer (a fixed number of dimensions and phrases),
+    and every statistic is read without touching the per-answer history.
+    """
+
+    __slots__ = ("count", "sums", "minimums", "maximums", "strengths", "improvements")
+
+    def __init__(self):
+        self.count = 0
+        self.sums: Dict[str, float] = {}
+        self.minimums: Dict[str, float] = {}
+        self.maximums: Dict[str, float] = {}
+        self.strengths: Counter = Counter()
+        self.improvements: Counter = Counter()
+
+    @classmethod
+    def from_history(cls, all_scores: Iterable[Dict[str, float]],
+                     all_feedback: Iterable[Dict[str, Any]] = ()) -> "SessionAggregate":
+        """Build an aggregate from stored per-answer scores and feedback"""
+        aggregate = cls()
+        for scores in all_scores:
+            aggregate.add_scores(scores)
+        for feedback in all_feedback:
+            aggregate.add_feedback(feedback)
+        return aggregate
+
+    def add(self, scores: Dict[str, float], feedback: Optional[Dict[str, Any]] = None):
+        """Fold in one evaluated answer"""
+        self.add_scores(scores)
+        if feedback is not None:
+            self.add_feedback(feedback)
+
+    def add_scores(self, scores: Dict[str, float]):
+        self.count += 1
+        for key, value in scores.items():
+            if key in self.sums:
+                self.sums[key] += value
+                if value < self.minimums[key]:
+                    self.minimums[key] = value
+                if value > self.maximums[key]:
+                    self.maximums[key] = value
+            else:
+                self.sums[key] = value
+                self.minimums[key] = value
+                self.maximums[key] = value
+
+    def add_feedback(self, feedback: Dict[str, Any]):
+        self.strengths.update(feedback.get("strengths", []))
+        self.improvements.update(feedback.get("improvements", []))
+
+    def averages(self) -> Dict[str, float]:
+        """Average score per dimension"""
+        if not self.count:
+            return {}
+        return {key: total / self.count for key, total in self.sums.items()}
+
+    def average(self, key: str, default: float = 0.0) -> float:
+        if not self.count or key not in self.sums:
+            return default
+        return self.sums[key] / self.count
+
+    @staticmethod
+    def _top(counter: Counter, limit: int, min_count: int) -> List[str]:
+        return [phrase for phrase, count in counter.most_common(limit) if count >= min_count]
+
+    def top_strengths(self, limit: int = 1, min_count: int = 2) -> List[str]:
+        """Most frequent strength phrases, given at least min_count times"""
+        return self._top(self.strengths, limit, min_count)
+
+    def top_improvements(self, limit: int = 1, min_count: int = 2) -> List[str]:
+        """Most frequent improvement phrases, given at least min_count times"""
+        return self._top(self.improvements, limit, min_count)
+
+    def stats(self) -> Dict[str, Any]:
+        """Live statistics for the session stats endpoint"""
+        return {
+            "answer_count": self.count,
+            "average_score": self.average("overall"),
+            "averages": self.averages(),
+            "minimums": dict(self.minimums),
+            "maximums": dict(self.maximums),
+            "top_strengths": self.top_strengths(limit=3, min_count=1),
+            "top_improvements": self.top_improvements(limit=3, min_count=1),
+        }
+
+    def to_state(self) -> Dict[str, Any]:
+        """JSON-serializable form"""
+        return {
+            "count": self.count,
+            "sums": self.sums,
+            "minimums": self.minimums,
+            "maximums": self.maximums,
+            "strengths": dict(self.strengths),
+            "improvements": dict(self.improvements),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "SessionAggregate":
+        aggregate = cls()
+        aggregate.count = state.get("count", 0)
+        aggregate.sums = dict(state.get("sums", {}))
+        aggregate.minimums = dict(state.get("minimums", {}))
+        aggregate.maximums = dict(state.get("maximums", {}))
+        aggregate.strengths = Counter(state.get("strengths", {}))
+        aggregate.improvements = Counter(state.get("improvements", {}))
+        return aggregate
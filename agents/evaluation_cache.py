@@ -0,0 +1,111 @@
+"""
+Evaluation Cache
+Memoizes scores and feedback across sessions, so answers resubmitted by
+practice users, demo scripts and load tests are only scored once
+"""
+
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import json
+import os
+import threading
+
+from utils.lru import LRUCache
+
+
+class EvaluationCache:
+    """LRU cache of (scores, feedback) keyed by a hash of what scoring reads.
+
+    The key covers the question (case-insensitive, as the rubric reads
+    it), the exact answer text and the question type. Cached dicts are
+    shared between sessions and must not be modified.
+
+    With a ``backend`` (the session store's KeyValueBackend), local misses
+    fall through to it and new results are written to it with
+    ``shared_ttl_seconds``, so workers share one cache that does not grow
+    without bound. Unreadable shared entries count as misses. Safe to use
+    from worker threads.
+    """
+
+    def __init__(self, max_items: int = 4096, backend=None, prefix: str = "evaluation:",
+                 shared_ttl_seconds: Optional[float] = 24 * 3600):
+        self.max_items = max_items
+        self.backend = backend
+        self.prefix = prefix
+        self.shared_ttl_seconds = shared_ttl_seconds
+        self._entries = LRUCache(max_items)
+        self._lock = threading.Lock()
+        self.shared_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(question: str, answer: str, question_type: Optional[str] = None) -> str:
+        payload = "\0".join((question.lower(), answer, question_type or "general"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, float], Dict[str, Any]]]:
+        if not self.max_items:
+            return None
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+
+        entry = self._get_shared(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.shared_hits += 1
+        self._entries.put(key, entry)
+        return entry
+
+    def put(self, key: str, scores: Dict[str, float], feedback: Dict[str, Any]):
+        if not self.max_items:
+            return
+        self._entries.put(key, (scores, feedback))
+        self._put_shared(key, scores, feedback)
+
+    def _get_shared(self, key: str) -> Optional[Tuple[Dict[str, float], Dict[str, Any]]]:
+        if self.backend is None:
+            return None
+        try:
+            data = self.backend.get(self.prefix + key)
+            if data is None:
+                return None
+            entry = json.loads(data)
+            return entry["scores"], entry["feedback"]
+        except Exception as e:
+            print(f"Warning: shared evaluation cache read failed: {e}")
+            return None
+
+    def _put_shared(self, key: str, scores: Dict[str, float], feedback: Dict[str, Any]):
+        if self.backend is None:
+            return
+        data = json.dumps({"scores": scores, "feedback": feedback}, separators=(",", ":"))
+        try:
+            self.backend.set(self.prefix + key, data.encode("utf-8"), ttl_seconds=self.shared_ttl_seconds)
+        except Exception as e:
+            print(f"Warning: shared evaluation cache write failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Figures for the health endpoint"""
+        hits = self._entries.hits
+        with self._lock:
+            lookups = hits + self.shared_hits + self.misses
+            return {
+                "items": len(self._entries),
+                "max_items": self.max_items,
+                "shared": self.backend is not None,
+                "hits": hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "hit_rate": (hits + self.shared_hits) / lookups if lookups else 0.0,
+            }
+
+
+# Process-wide cache; EVALUATION_CACHE_MAX_ITEMS=0 disables it, and
+# EVALUATION_CACHE_SHARED_TTL bounds how long shared entries live
+evaluation_cache = EvaluationCache(
+    max_items=int(os.getenv("EVALUATION_CACHE_MAX_ITEMS", "4096")),
+    shared_ttl_seconds=float(os.getenv("EVALUATION_CACHE_SHARED_TTL", "86400")),
+)
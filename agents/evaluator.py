@@ -3,153 +3,162 @@ Evaluator Agent
 Scores answers using a structured rubric
 """
 
-from typing import Dict, Optional
-import re
+from typing import Dict, List, Optional, Sequence
+
+from .rubric import (
+    AnswerFeatures,
+    DEPTH_PHRASES,
+    EXAMPLE_PHRASES,
+    FILLER_WORDS,
+    PROFESSIONAL_TERMS,
+    REASONING_PHRASES,
+    STAR_INDICATORS,
+    TECH_INDICATORS,
+    extract_features,
+    question_keywords,
+)
 
 
 class EvaluatorAgent:
-    """Evaluates and scores interview answers"""
-    
-    def __init__(self):
-        self.scores = []
+    """Evaluates and scores interview answers.
+    Stateless: scores are recorded by the caller, so one instance can be
+    shared by every session."""
     
     def evaluate(self, question: str, answer: str, question_type: str = "general") -> Dict[str, float]:
         """Evaluate an answer and return scores"""
         if not answer or len(answer.strip()) < 10:
             return self._default_low_scores()
         
+        return self._score_features(question, AnswerFeatures(answer), question_type)
+    
+    def evaluate_batch(self, questions: Sequence[str], answers: Sequence[str],
+                       question_types: Sequence[str],
+                       features: Optional[List[AnswerFeatures]] = None) -> List[Dict[str, float]]:
+        """Evaluate many answers in one call.
+        Pass the same features list to FeedbackAgent.generate_feedback_batch
+        so each answer is only analysed once."""
+        if not len(questions) == len(answers) == len(question_types):
+            raise ValueError("questions, answers and question_types must have the same length")
+        if features is None:
+            features = extract_features(answers)
+        
+        results = []
+        for question, answer, question_type, answer_features in zip(
+            questions, answers, question_types, features
+        ):
+            if not answer or len(answer.strip()) < 10:
+                results.append(self._default_low_scores())
+                continue
+            results.append(self._score_features(question, answer_features, question_type))
+        
+        return results
+    
+    def _score_features(self, question: str, features: AnswerFeatures,
+                        question_type: str) -> Dict[str, float]:
+        """Score an answer from its extracted features"""
         scores = {
-            "clarity": self._score_clarity(answer),
-            "communication": self._score_communication(answer),
-            "star_structure": self._score_star_structure(answer, question_type),
-            "role_relevance": self._score_role_relevance(question, answer),
-            "technical_depth": self._score_technical_depth(answer, question_type),
+            "clarity": self._score_clarity(features),
+            "communication": self._score_communication(features),
+            "star_structure": self._score_star_structure(features, question_type),
+            "role_relevance": self._score_role_relevance(question, features),
+            "technical_depth": self._score_technical_depth(features, question_type),
         }
         
         # Calculate overall score
         scores["overall"] = sum(scores.values()) / len(scores)
         
-        self.scores.append(scores)
         return scores
     
-    def _score_clarity(self, answer: str) -> float:
+    def _score_clarity(self, features: AnswerFeatures) -> float:
         """Score clarity of the answer (1-10)"""
         score = 5.0  # Base score
         
         # Positive indicators
-        if len(answer) > 100:
+        if features.char_count > 100:
             score += 1.0
-        if any(word in answer.lower() for word in ["specifically", "for example", "to illustrate"]):
+        if features.contains_any(EXAMPLE_PHRASES):
             score += 0.5
-        if answer.count(".") > 2:  # Well-structured sentences
+        if features.period_count > 2:  # Well-structured sentences
             score += 0.5
         
         # Negative indicators
-        if "um" in answer.lower() or "uh" in answer.lower():
+        if features.contains_any(FILLER_WORDS):
             score -= 0.5
-        if answer.count("like") > 3:
+        if features.like_count > 3:
             score -= 0.5
-        if len(answer) < 50:
+        if features.char_count < 50:
             score -= 2.0
         
         return max(1.0, min(10.0, score))
     
-    def _score_communication(self, answer: str) -> float:
+    def _score_communication(self, features: AnswerFeatures) -> float:
         """Score communication effectiveness (1-10)"""
         score = 5.0
         
         # Positive indicators
-        if len(answer.split()) > 50:  # Substantive answer
+        if features.word_count > 50:  # Substantive answer
             score += 1.5
-        if any(word in answer.lower() for word in ["because", "therefore", "as a result"]):
+        if features.contains_any(REASONING_PHRASES):
             score += 0.5  # Shows reasoning
-        if answer.count(",") > 3:  # Well-structured
+        if features.comma_count > 3:  # Well-structured
             score += 0.5
         
         # Negative indicators
-        if len(answer.split()) < 20:
+        if features.word_count < 20:
             score -= 2.0
-        if answer.count("I don't know") > 0 or answer.count("I'm not sure") > 0:
+        if features.hedges:
             score -= 1.0
         
         return max(1.0, min(10.0, score))
     
-    def _score_star_structure(self, answer: str, question_type: str) -> float:
+    def _score_star_structure(self, features: AnswerFeatures, question_type: str) -> float:
         """Score STAR format usage (1-10)"""
         if question_type != "behavioral":
             return 7.0  # Not applicable, neutral score
         
         score = 3.0  # Base score
         
-        answer_lower = answer.lower()
-        
         # Check for STAR components
-        situation_indicators = ["situation", "context", "when", "where", "background"]
-        task_indicators = ["task", "goal", "objective", "responsibility", "challenge"]
-        action_indicators = ["action", "did", "implemented", "created", "developed", "worked"]
-        result_indicators = ["result", "outcome", "impact", "achieved", "improved", "saved"]
-        
-        if any(indicator in answer_lower for indicator in situation_indicators):
-            score += 1.5
-        if any(indicator in answer_lower for indicator in task_indicators):
-            score += 1.5
-        if any(indicator in answer_lower for indicator in action_indicators):
-            score += 1.5
-        if any(indicator in answer_lower for indicator in result_indicators):
-            score += 1.5
+        for indicators in STAR_INDICATORS.values():
+            if features.contains_any(indicators):
+                score += 1.5
         
         # Bonus for clear structure
-        if answer.count(".") > 3:
+        if features.period_count > 3:
             score += 0.5
         
         return max(1.0, min(10.0, score))
     
-    def _score_role_relevance(self, question: str, answer: str) -> float:
+    def _score_role_relevance(self, question: str, features: AnswerFeatures) -> float:
         """Score relevance to the role (1-10)"""
         score = 5.0
         
-        # Extract keywords from question
-        question_lower = question.lower()
-        answer_lower = answer.lower()
-        
         # Check if answer addresses the question
-        question_keywords = set(re.findall(r'\b\w{4,}\b', question_lower))
-        answer_keywords = set(re.findall(r'\b\w{4,}\b', answer_lower))
-        
-        overlap = len(question_keywords.intersection(answer_keywords))
+        overlap = sum(1 for keyword in question_keywords(question) if features.has_word(keyword))
         if overlap > 0:
             score += min(2.0, overlap * 0.3)
         
         # Check for professional language
-        professional_terms = ["project", "team", "experience", "developed", "implemented", "managed"]
-        if any(term in answer_lower for term in professional_terms):
+        if features.contains_any(PROFESSIONAL_TERMS):
             score += 1.0
         
         return max(1.0, min(10.0, score))
     
-    def _score_technical_depth(self, answer: str, question_type: str) -> float:
+    def _score_technical_depth(self, features: AnswerFeatures, question_type: str) -> float:
         """Score technical depth (1-10)"""
         if question_type != "technical":
             return 7.0  # Not applicable, neutral score
         
         score = 4.0
         
-        answer_lower = answer.lower()
-        
         # Technical indicators
-        tech_indicators = [
-            "algorithm", "architecture", "system", "database", "api", "framework",
-            "optimization", "scalability", "performance", "debug", "test", "deploy",
-            "code", "implementation", "design", "pattern", "protocol"
-        ]
-        
-        found_indicators = sum(1 for indicator in tech_indicators if indicator in answer_lower)
+        found_indicators = features.count_present(TECH_INDICATORS)
         score += min(3.0, found_indicators * 0.5)
         
         # Depth indicators
-        if len(answer.split()) > 100:
+        if features.word_count > 100:
             score += 1.0
-        if any(word in answer_lower for word in ["because", "reason", "why", "how"]):
+        if features.contains_any(DEPTH_PHRASES):
             score += 1.0
         
         return max(1.0, min(10.0, score))
@@ -164,15 +173,3 @@ class EvaluatorAgent:
             "technical_depth": 3.0,
             "overall": 3.0,
         }
-    
-    def get_average_scores(self) -> Dict[str, float]:
-        """Get average scores across all evaluations"""
-        if not self.scores:
-            return {}
-        
-        averages = {}
-        for key in self.scores[0].keys():
-            averages[key] = sum(s[key] for s in self.scores) / len(self.scores)
-        
-        return averages
-
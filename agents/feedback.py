@@ -3,7 +3,9 @@ Feedback Agent
 Provides improvement suggestions, strengths, weaknesses, and example responses
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
+
+from .rubric import AnswerFeatures, FILLER_WORDS, STAR_COMPONENTS, extract_features
 
 
 class FeedbackAgent:
@@ -15,9 +17,33 @@ class FeedbackAgent:
     def generate_feedback(self, question: str, answer: str, scores: Dict[str, float], 
                          question_type: str = "general") -> Dict[str, any]:
         """Generate comprehensive feedback"""
-        strengths = self._identify_strengths(answer, scores, question_type)
-        improvements = self._identify_improvements(answer, scores, question_type)
-        sample_answer = self._generate_sample_answer(question, question_type)
+        return self._feedback_from_features(
+            question, AnswerFeatures(answer), scores, question_type
+        )
+    
+    def generate_feedback_batch(self, questions: Sequence[str], answers: Sequence[str],
+                                scores: Sequence[Dict[str, float]],
+                                question_types: Sequence[str],
+                                features: Optional[List[AnswerFeatures]] = None) -> List[Dict[str, any]]:
+        """Generate feedback for many answers in one call"""
+        if not len(questions) == len(answers) == len(scores) == len(question_types):
+            raise ValueError("questions, answers, scores and question_types must have the same length")
+        if features is None:
+            features = extract_features(answers)
+        
+        return [
+            self._feedback_from_features(question, answer_features, answer_scores, question_type)
+            for question, answer_features, answer_scores, question_type in zip(
+                questions, features, scores, question_types
+            )
+        ]
+    
+    def _feedback_from_features(self, question: str, features: AnswerFeatures,
+                                scores: Dict[str, float], question_type: str) -> Dict[str, any]:
+        """Build feedback from an answer's extracted features"""
+        strengths = self._identify_strengths(features, scores, question_type)
+        improvements = self._identify_improvements(features, scores, question_type)
+        sample_answer = self.generate_sample_answer(question, question_type)
         
         return {
             "strengths": strengths,
@@ -25,7 +51,7 @@ class FeedbackAgent:
             "sample_answer": sample_answer,
         }
     
-    def _identify_strengths(self, answer: str, scores: Dict[str, float], 
+    def _identify_strengths(self, features: AnswerFeatures, scores: Dict[str, float], 
                            question_type: str) -> List[str]:
         """Identify strengths in the answer"""
         strengths = []
@@ -41,7 +67,7 @@ class FeedbackAgent:
         if scores.get("role_relevance", 0) >= 7.0:
             strengths.append("Answer was relevant to the role")
         
-        if len(answer.split()) > 100:
+        if features.word_count > 100:
             strengths.append("Comprehensive and detailed response")
         
         if not strengths:
@@ -49,7 +75,7 @@ class FeedbackAgent:
         
         return strengths
     
-    def _identify_improvements(self, answer: str, scores: Dict[str, float], 
+    def _identify_improvements(self, features: AnswerFeatures, scores: Dict[str, float], 
                               question_type: str) -> List[str]:
         """Identify areas for improvement"""
         improvements = []
@@ -65,16 +91,14 @@ class FeedbackAgent:
         if scores.get("role_relevance", 0) < 6.0:
             improvements.append("Better connect your answer to the role requirements")
         
-        if len(answer.split()) < 50:
+        if features.word_count < 50:
             improvements.append("Provide more detail and examples")
         
-        answer_lower = answer.lower()
-        if "um" in answer_lower or "uh" in answer_lower:
+        if features.contains_any(FILLER_WORDS):
             improvements.append("Reduce filler words - practice speaking more confidently")
         
         if question_type == "behavioral":
-            star_components = ["situation", "task", "action", "result"]
-            missing = [comp for comp in star_components if comp not in answer_lower]
+            missing = [comp for comp in STAR_COMPONENTS if not features.contains(comp)]
             if missing:
                 improvements.append(f"Ensure you cover all STAR components, especially: {', '.join(missing)}")
         
@@ -83,7 +107,7 @@ class FeedbackAgent:
         
         return improvements
     
-    def _generate_sample_answer(self, question: str, question_type: str) -> str:
+    def generate_sample_answer(self, question: str, question_type: str) -> str:
         """Generate a sample improved answer"""
         if question_type == "behavioral":
             return self._sample_behavioral_answer(question)
@@ -9,9 +9,6 @@ from typing import Optional, List
 class FollowupAgent:
     """Generates contextual follow-up questions"""
     
-    def __init__(self):
-        self.followup_count = 0
-    
     def should_ask_followup(self, answer: str, question_type: str = "general") -> bool:
         """Determine if a follow-up question is needed"""
         if not answer or len(answer.strip()) < 50:
@@ -43,8 +40,6 @@ class FollowupAgent:
         if not self.should_ask_followup(answer, question_type):
             return None
         
-        self.followup_count += 1
-        
         answer_lower = answer.lower()
         
         # Behavioral follow-ups
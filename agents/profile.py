@@ -0,0 +1,61 @@
+"""
+Candidate Profile
+Analyses the job description once per session, so agents read
+precomputed technologies instead of rescanning it on every turn
+"""
+
+from typing import Any, Dict, Optional
+
+
+COMMON_TECH = [
+    "Python", "JavaScript", "Java", "React", "AWS", "Docker", "Kubernetes",
+    "SQL", "MongoDB", "PostgreSQL", "Git", "CI/CD", "Agile", "Scrum",
+    "Machine Learning", "Data Science", "API", "REST", "GraphQL",
+    "Microservices", "Cloud", "DevOps", "Testing", "Security"
+]
+
+
+def count_technologies(text_lower: str) -> Dict[str, int]:
+    """Occurrences of each known technology in lowercase text"""
+    counts = {}
+    for tech in COMMON_TECH:
+        count = text_lower.count(tech.lower())
+        if count:
+            counts[tech] = count
+    return counts
+
+
+class CandidateProfile:
+    """What the job description asks for, found once.
+
+    ``technologies`` lists the known technologies the role mentions, in
+    COMMON_TECH order; the interviewer personalizes questions with them.
+    """
+
+    __slots__ = ("technologies",)
+
+    def __init__(self, job_description: str = ""):
+        jd_tech = count_technologies(job_description.lower())
+        self.technologies = [tech for tech in COMMON_TECH if tech in jd_tech]
+
+    def focus_technology(self) -> Optional[str]:
+        """The technology to personalize questions with: the first one the
+        role asks for"""
+        return self.technologies[0] if self.technologies else None
+
+    def to_state(self) -> Dict[str, Any]:
+        """JSON-serializable form, so stored sessions skip re-analysis"""
+        return {"technologies": self.technologies}
+
+    @classmethod
+    def from_state(cls, state: Optional[Dict[str, Any]]) -> Optional["CandidateProfile"]:
+        if not state:
+            return None
+        profile = cls.__new__(cls)
+        if "technologies" in state:
+            profile.technologies = list(state["technologies"])
+        else:
+            # Sessions stored with the earlier, fuller profile
+            jd_tech = state.get("jd_tech", {})
+            profile.technologies = [tech for tech in COMMON_TECH if tech in jd_tech]
+        return profile
@@ -0,0 +1,145 @@
+"""
+Question Bank
+Loads the tagged interview questions once and indexes them by tag, so the
+interviewer picks each next unseen question in constant time
+"""
+
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+import json
+import os
+import random
+
+from .profile import COMMON_TECH
+
+
+DEFAULT_BANK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "question_bank.json")
+
+TAGS = ("type", "stage", "topic", "difficulty", "technology")
+
+
+class Question(NamedTuple):
+    text: str
+    type: str
+    stage: str = "main"
+    topic: str = "general"
+    difficulty: str = "medium"
+    technology: Optional[str] = None
+
+
+class QuestionBank:
+    """Immutable, tag-indexed set of questions.
+
+    Every question has a position; ``indexed(**tags)`` returns the
+    positions carrying all of the given tags. Technology templates in the
+    data file are expanded once per known technology at load time.
+    """
+
+    def __init__(self, questions: Sequence[Question]):
+        self.questions: Tuple[Question, ...] = tuple(questions)
+        self.position: Dict[str, int] = {}
+        self._by_tag: Dict[Tuple[str, str], List[int]] = {}
+        for index, question in enumerate(self.questions):
+            self.position.setdefault(question.text, index)
+            for tag in TAGS:
+                value = getattr(question, tag)
+                if value is not None:
+                    self._by_tag.setdefault((tag, value), []).append(index)
+        self._pools: Dict[Tuple, Tuple[int, ...]] = {}
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_BANK_PATH) -> "QuestionBank":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+
+        questions = [Question(**entry) for entry in data.get("questions", [])]
+        for template in data.get("technology_templates", []):
+            for tech in COMMON_TECH:
+                questions.append(Question(**{**template, "text": template["text"].format(tech=tech),
+                                             "technology": tech}))
+        return cls(questions)
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def text(self, index: int) -> str:
+        return self.questions[index].text
+
+    def indexed(self, **tags: str) -> Tuple[int, ...]:
+        """Positions of the questions carrying every given tag (memoized)"""
+        key = tuple(sorted(tags.items()))
+        pool = self._pools.get(key)
+        if pool is None:
+            sets = [set(self._by_tag.get(item, ())) for item in key]
+            matches = set.intersection(*sets) if sets else set(range(len(self.questions)))
+            pool = self._pools[key] = tuple(sorted(matches))
+        return pool
+
+    def pool(self, interview_type: str, technology: Optional[str] = None) -> Tuple[int, ...]:
+        """Main-stage questions for an interview type, personalized with one technology"""
+        key = ("pool", interview_type, technology)
+        pool = self._pools.get(key)
+        if pool is None:
+            indices: List[int] = []
+            if interview_type in ("Behavioral", "Mixed"):
+                indices.extend(self.indexed(type="behavioral", stage="main"))
+            if interview_type in ("Technical", "Mixed"):
+                indices.extend(i for i in self.indexed(type="technical", stage="main")
+                               if self.questions[i].technology is None)
+                if technology:
+                    indices.extend(self.indexed(stage="main", technology=technology))
+            pool = self._pools[key] = tuple(indices)
+        return pool
+
+    def openings(self, interview_type: str) -> Tuple[int, ...]:
+        key = ("openings", interview_type)
+        pool = self._pools.get(key)
+        if pool is None:
+            indices: List[int] = []
+            if interview_type in ("Behavioral", "Mixed"):
+                indices.extend(self.indexed(type="behavioral", stage="opening"))
+            if interview_type in ("Technical", "Mixed"):
+                indices.extend(self.indexed(type="technical", stage="opening"))
+            pool = self._pools[key] = tuple(indices)
+        return pool
+
+
+class QuestionCursor:
+    """One session's walk through a pool in a random order.
+
+    The order is a lazy Fisher-Yates shuffle: each step draws one of the
+    remaining positions and records the swap in a small dict, so starting
+    a walk costs nothing however large the pool is. ``asked`` holds a byte
+    per bank question, so the checks are O(1) and picking the next unasked
+    question is amortized O(1) per turn.
+    """
+
+    __slots__ = ("key", "pool", "position", "_swaps")
+
+    def __init__(self, key: Tuple, pool: Sequence[int]):
+        self.key = key
+        self.pool = pool
+        self.position = 0
+        self._swaps: Dict[int, int] = {}
+
+    def _draw(self) -> int:
+        i = self.position
+        j = random.randrange(i, len(self.pool))
+        drawn = self._swaps.pop(j, j)
+        if j != i:
+            self._swaps[j] = self._swaps.pop(i, i)
+        self.position += 1
+        return self.pool[drawn]
+
+    def next_unasked(self, asked: bytearray) -> Optional[int]:
+        while self.position < len(self.pool):
+            index = self._draw()
+            if not asked[index]:
+                return index
+        return None
+
+
+@lru_cache(maxsize=1)
+def default_bank() -> QuestionBank:
+    """The bank every interviewer shares, loaded on first use"""
+    return QuestionBank.load(os.getenv("QUESTION_BANK_PATH") or DEFAULT_BANK_PATH)
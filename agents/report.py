@@ -5,6 +5,8 @@ Generates final evaluation and development plan
 
 from typing import Dict, List, Optional
 
+from .aggregate import SessionAggregate
+
 
 class ReportAgent:
     """Generates final interview session report"""
@@ -14,9 +16,15 @@ class ReportAgent:
     
     def generate_report(self, all_scores: List[Dict[str, float]], 
                        all_feedback: List[Dict[str, any]],
-                       interview_type: str = "Mixed") -> Dict[str, any]:
-        """Generate comprehensive final report"""
-        if not all_scores:
+                       interview_type: str = "Mixed",
+                       aggregate: Optional[SessionAggregate] = None) -> Dict[str, any]:
+        """Generate comprehensive final report.
+        Pass the session's running aggregate to build the report from
+        ready-made statistics instead of rescanning every answer."""
+        if aggregate is None:
+            aggregate = SessionAggregate.from_history(all_scores, all_feedback)
+        
+        if not aggregate.count:
             return {
                 "average_score": 0.0,
                 "key_strengths": ["No answers evaluated yet"],
@@ -26,14 +34,14 @@ class ReportAgent:
             }
         
         # Calculate averages
-        avg_scores = self._calculate_averages(all_scores)
+        avg_scores = aggregate.averages()
         
         # Identify key strengths and improvements
-        strengths = self._identify_key_strengths(all_scores, all_feedback)
-        improvements = self._identify_key_improvements(all_scores, all_feedback)
+        strengths = self._identify_key_strengths(avg_scores, aggregate)
+        improvements = self._identify_key_improvements(avg_scores, aggregate)
         
         # Recommend practice topics
-        topics = self._recommend_topics(all_scores, interview_type)
+        topics = self._recommend_topics(avg_scores, interview_type)
         
         # Next session focus
         next_focus = self._suggest_next_focus(improvements, interview_type)
@@ -47,28 +55,11 @@ class ReportAgent:
             "next_focus": next_focus,
         }
     
-    def _calculate_averages(self, all_scores: List[Dict[str, float]]) -> Dict[str, float]:
-        """Calculate average scores across all answers"""
-        if not all_scores:
-            return {}
-        
-        averages = {}
-        for key in all_scores[0].keys():
-            averages[key] = sum(s[key] for s in all_scores) / len(all_scores)
-        
-        return averages
-    
-    def _identify_key_strengths(self, all_scores: List[Dict[str, float]], 
-                                all_feedback: List[Dict[str, any]]) -> List[str]:
+    def _identify_key_strengths(self, avg_scores: Dict[str, float],
+                                aggregate: SessionAggregate) -> List[str]:
         """Identify key strengths across the interview"""
         strengths = []
         
-        if not all_scores:
-            return strengths
-        
-        # Analyze average scores
-        avg_scores = self._calculate_averages(all_scores)
-        
         if avg_scores.get("clarity", 0) >= 7.0:
             strengths.append("Strong clarity and articulation")
         if avg_scores.get("communication", 0) >= 7.0:
@@ -80,34 +71,19 @@ class ReportAgent:
         if avg_scores.get("role_relevance", 0) >= 7.0:
             strengths.append("Answers were relevant to the role")
         
-        # Extract common strengths from feedback
-        common_strengths = {}
-        for feedback in all_feedback:
-            for strength in feedback.get("strengths", []):
-                common_strengths[strength] = common_strengths.get(strength, 0) + 1
-        
-        # Add most common strengths
-        if common_strengths:
-            top_strength = max(common_strengths.items(), key=lambda x: x[1])
-            if top_strength[1] > 1:
-                strengths.append(top_strength[0])
+        # Add the most common strength from feedback, if it recurred
+        strengths.extend(aggregate.top_strengths())
         
         if not strengths:
             strengths.append("Demonstrated effort in answering questions")
         
         return strengths[:5]  # Top 5 strengths
     
-    def _identify_key_improvements(self, all_scores: List[Dict[str, float]], 
-                                  all_feedback: List[Dict[str, any]]) -> List[str]:
+    def _identify_key_improvements(self, avg_scores: Dict[str, float],
+                                   aggregate: SessionAggregate) -> List[str]:
         """Identify key improvement areas"""
         improvements = []
         
-        if not all_scores:
-            return improvements
-        
-        # Analyze average scores
-        avg_scores = self._calculate_averages(all_scores)
-        
         if avg_scores.get("clarity", 0) < 6.0:
             improvements.append("Improve clarity and specificity in responses")
         if avg_scores.get("communication", 0) < 6.0:
@@ -119,33 +95,22 @@ class ReportAgent:
         if avg_scores.get("role_relevance", 0) < 6.0:
             improvements.append("Better connect answers to role requirements")
         
-        # Extract common improvements from feedback
-        common_improvements = {}
-        for feedback in all_feedback:
-            for improvement in feedback.get("improvements", []):
-                common_improvements[improvement] = common_improvements.get(improvement, 0) + 1
-        
-        # Add most common improvements
-        if common_improvements:
-            top_improvement = max(common_improvements.items(), key=lambda x: x[1])
-            if top_improvement[1] > 1:
-                improvements.append(top_improvement[0])
+        # Add the most common improvement from feedback, if it recurred
+        improvements.extend(aggregate.top_improvements())
         
         if not improvements:
             improvements.append("Continue practicing to refine your responses")
         
         return improvements[:5]  # Top 5 improvements
     
-    def _recommend_topics(self, all_scores: List[Dict[str, float]], 
+    def _recommend_topics(self, avg_scores: Dict[str, float], 
                          interview_type: str) -> List[str]:
         """Recommend practice topics based on performance"""
         topics = []
         
-        if not all_scores:
+        if not avg_scores:
             return topics
         
-        avg_scores = self._calculate_averages(all_scores)
-        
         if avg_scores.get("star_structure", 0) < 7.0:
             topics.append("STAR method for behavioral questions")
         
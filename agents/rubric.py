@@ -0,0 +1,91 @@
+"""
+Rubric Engine
+Extracts answer features once and shares them across every rubric scorer
+"""
+
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Pattern, Tuple
+import re
+
+
+KEYWORD_PATTERN = re.compile(r'\b\w{4,}\b')
+
+# Indicator groups, matched as lowercase substrings of the answer
+EXAMPLE_PHRASES = ("specifically", "for example", "to illustrate")
+FILLER_WORDS = ("um", "uh")
+REASONING_PHRASES = ("because", "therefore", "as a result")
+STAR_INDICATORS: Dict[str, Tuple[str, ...]] = {
+    "situation": ("situation", "context", "when", "where", "background"),
+    "task": ("task", "goal", "objective", "responsibility", "challenge"),
+    "action": ("action", "did", "implemented", "created", "developed", "worked"),
+    "result": ("result", "outcome", "impact", "achieved", "improved", "saved"),
+}
+PROFESSIONAL_TERMS = ("project", "team", "experience", "developed", "implemented", "managed")
+TECH_INDICATORS = (
+    "algorithm", "architecture", "system", "database", "api", "framework",
+    "optimization", "scalability", "performance", "debug", "test", "deploy",
+    "code", "implementation", "design", "pattern", "protocol",
+)
+DEPTH_PHRASES = ("because", "reason", "why", "how")
+
+# Case-sensitive phrases, matched against the original answer
+HEDGE_PHRASES = ("I don't know", "I'm not sure")
+
+# STAR components the feedback agent expects to see named explicitly
+STAR_COMPONENTS = ("situation", "task", "action", "result")
+
+
+class AnswerFeatures:
+    """Feature vector for one answer, computed once and read by all scorers"""
+
+    __slots__ = (
+        "text", "lower", "char_count", "word_count", "period_count",
+        "comma_count", "like_count", "hedges", "_phrases",
+    )
+
+    def __init__(self, answer: str):
+        self.text = answer
+        self.lower = answer.lower()
+        self.char_count = len(answer)
+        self.word_count = len(answer.split())
+        self.period_count = answer.count(".")
+        self.comma_count = answer.count(",")
+        self.like_count = answer.count("like")
+        self.hedges = any(phrase in answer for phrase in HEDGE_PHRASES)
+        self._phrases: Dict[str, bool] = {}
+
+    def contains(self, phrase: str) -> bool:
+        """Check whether a lowercase phrase occurs in the answer (memoized)"""
+        found = self._phrases.get(phrase)
+        if found is None:
+            found = self._phrases[phrase] = phrase in self.lower
+        return found
+
+    def contains_any(self, phrases: Iterable[str]) -> bool:
+        """Check whether any of the phrases occurs in the answer"""
+        return any(self.contains(phrase) for phrase in phrases)
+
+    def count_present(self, phrases: Iterable[str]) -> int:
+        """Count how many of the phrases occur in the answer"""
+        return sum(1 for phrase in phrases if self.contains(phrase))
+
+    def has_word(self, word: str) -> bool:
+        """Check whether a keyword occurs as a whole word in the answer.
+        A substring check rejects most words before any regex runs."""
+        return self.contains(word) and _word_pattern(word).search(self.lower) is not None
+
+
+@lru_cache(maxsize=4096)
+def _word_pattern(word: str) -> Pattern[str]:
+    return re.compile(r'\b' + re.escape(word) + r'\b')
+
+
+@lru_cache(maxsize=1024)
+def question_keywords(question: str) -> FrozenSet[str]:
+    """Keywords of a question; questions come from a small bank, so cache them"""
+    return frozenset(KEYWORD_PATTERN.findall(question.lower()))
+
+
+def extract_features(answers: Iterable[str]) -> List[AnswerFeatures]:
+    """Extract features for a batch of answers"""
+    return [AnswerFeatures(answer) for answer in answers]
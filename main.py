@@ -145,8 +145,8 @@ def main():
     print_header("Interview Complete - Final Report")
     
     final_result = session.end_interview()
-    if "final_report" in final_result:
-        print(final_result["final_report"])
+    if "report" in final_result:
+        print(session.format_final_report(final_result["report"]))
         print()
     
     if "session_summary" in final_result:
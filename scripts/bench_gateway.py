@@ -0,0 +1,210 @@
+"""
+Gateway benchmark
+Drives GET /api/sessions/{id} through a checkout's API gateway against
+stub interview and voice services, and reports requests per second and
+how many upstream connections the gateway opened for them.
+
+    python scripts/bench_gateway.py [--root PATH] [--clients 32] [--seconds 10]
+    python scripts/bench_gateway.py --tracing-overhead [--root PATH]
+
+Starts the gateway on port 8000 and the stubs on 8001/8002, so stop any
+running services first. --tracing-overhead instead times 5,000 requests
+in-process through a one-route app: without tracing, with the former
+@app.middleware("http") tracing, and with the checkout's tracing.
+
+Results, 32 clients for 15 s, stub upstream answering after 2 ms, one CPU,
+Python 3.11 (three runs each):
+                                             req/s     gateway CPU/request
+    before managed upstream pools (15da597^) 126-153   3.06-3.24 ms
+    BaseHTTPMiddleware tracing (c18673c)     114-157   3.94-4.66 ms
+    ASGI tracing middleware                  123-166   3.00-4.02 ms
+Requests per second swing by a third between identical runs here, as the
+gateway, stubs and load generator share the core. The first 10 s runs
+gave 126-131 req/s before against 107-117 after, a 10-15% regression. The
+CPU time shows where it came from. In-process, per request:
+    no tracing                 416-501 us
+    @app.middleware("http")    629-851 us
+    ASGI TracingMiddleware     430-481 us
+Both versions reuse keep-alive connections (~30-50 requests each); the
+pools bound and close connections and set per-route timeouts.
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from benchlib import PORTS, REPO_ROOT, start_service, stop_service  # noqa: E402
+
+GATEWAY_URL = f"http://127.0.0.1:{PORTS['api-gateway']}"
+
+
+def serve_stubs(upstream_ms: float):
+    """Stub interview and voice services that count client connections"""
+    import uvicorn
+    from fastapi import FastAPI, Request
+
+    connections = set()
+    requests = 0
+    interview = FastAPI()
+    voice = FastAPI()
+
+    @interview.get("/sessions/{session_id}")
+    async def session_status(session_id: str, request: Request):
+        nonlocal requests
+        requests += 1
+        connections.add((request.client.host, request.client.port))
+        await asyncio.sleep(upstream_ms / 1000)
+        return {"session_id": session_id, "status": "active", "question_count": 1, "answer_count": 0}
+
+    @interview.get("/stats")
+    async def stats():
+        return {"requests": requests, "connections": len(connections)}
+
+    @interview.get("/health")
+    @voice.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    async def main():
+        servers = [
+            uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+            for app, port in ((interview, PORTS["interview-service"]), (voice, PORTS["voice-service"]))
+        ]
+        await asyncio.gather(*(server.serve() for server in servers))
+
+    asyncio.run(main())
+
+
+def cpu_seconds(pid: int) -> float:
+    """User + system CPU time of a process so far (Linux /proc)"""
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+async def drive(clients: int, seconds: float, gateway_pid: int):
+    async with httpx.AsyncClient(base_url=GATEWAY_URL, timeout=30,
+                                 limits=httpx.Limits(max_connections=clients)) as client:
+        stub = httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORTS['interview-service']}")
+        before = (await stub.get("/stats")).json()
+        completed = 0
+        cpu_before = cpu_seconds(gateway_pid)
+        deadline = time.perf_counter() + seconds
+
+        async def worker():
+            nonlocal completed
+            while time.perf_counter() < deadline:
+                response = await client.get("/api/sessions/bench")
+                assert response.status_code == 200, response.text
+                completed += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+        cpu = cpu_seconds(gateway_pid) - cpu_before
+        after = (await stub.get("/stats")).json()
+        await stub.aclose()
+
+    opened = after["connections"] - before["connections"]
+    print(f"requests/s: {completed / elapsed:.0f}")
+    print(f"gateway CPU per request: {cpu / completed * 1e6:.0f} us")
+    print(f"upstream connections opened: {opened} for {after['requests'] - before['requests']} requests")
+
+
+def tracing_overhead(root: str, requests: int):
+    """Time requests through the checkout's tracing middleware in-process,
+    against the same app without it and with the former
+    @app.middleware("http") version"""
+    from fastapi import FastAPI, Request
+
+    sys.path.insert(0, os.path.join(os.path.abspath(root), "services", "api-gateway"))
+    import tracing
+
+    def make_app(kind: str) -> FastAPI:
+        app = FastAPI()
+
+        @app.get("/sessions/{session_id}")
+        async def session_status(session_id: str):
+            return await tracing.traced("interview.status", asyncio.sleep(0, {"session_id": session_id}))
+
+        if kind == "http middleware":
+            @app.middleware("http")
+            async def trace_requests(request: Request, call_next):
+                trace = tracing.RouteTrace(request.url.path)
+                token = tracing._current_trace.set(trace)
+                try:
+                    response = await call_next(request)
+                finally:
+                    tracing._current_trace.reset(token)
+                response.headers["Server-Timing"] = trace.server_timing()
+                return response
+        elif kind == "checkout":
+            tracing.install_tracing(app)
+        return app
+
+    async def time_app(app: FastAPI) -> float:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as client:
+            for _ in range(200):
+                await client.get("/sessions/warmup")
+            start = time.process_time()
+            for _ in range(requests):
+                await client.get("/sessions/bench")
+            return (time.process_time() - start) / requests
+
+    for kind in ("none", "http middleware", "checkout"):
+        print(f"tracing {kind:16s} {asyncio.run(time_app(make_app(kind))) * 1e6:6.0f} us CPU per request")
+
+
+def wait_for(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not answer")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--root", default=REPO_ROOT, help="checkout to benchmark (default: this one)")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--upstream-ms", type=float, default=2.0, help="stub upstream latency")
+    parser.add_argument("--tracing-overhead", action="store_true",
+                        help="time the checkout's tracing middleware in-process instead")
+    parser.add_argument("--serve-stubs", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve_stubs:
+        serve_stubs(args.upstream_ms)
+        return
+    if args.tracing_overhead:
+        tracing_overhead(args.root, 5000)
+        return
+
+    print(f"root: {os.path.abspath(args.root)}")
+    stubs = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--serve-stubs", "--upstream-ms", str(args.upstream_ms)]
+    )
+    try:
+        wait_for(f"http://127.0.0.1:{PORTS['interview-service']}/health")
+        gateway = start_service(args.root, "api-gateway")
+        try:
+            asyncio.run(drive(args.clients, args.seconds, gateway.pid))
+        finally:
+            stop_service(gateway)
+    finally:
+        stop_service(stubs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Offload benchmark
+Measures a cheap interview-service endpoint (GET /sessions/{id}) while
+other sessions run heavy evaluate-all calls, to show whether scoring
+stalls the event loop.
+
+    python scripts/bench_offload.py [--root PATH]
+
+Starts the checkout's interview service on port 8001, so stop any running
+one first. Every answer is distinct, so neither checkout can skip scoring.
+
+Results, 8 sessions x 200 answers of ~5,000 words, 2 concurrent
+evaluators, one CPU, Python 3.11 (two runs each):
+    before the executor (e9b18f0^)   probe p50 160-205 ms  p99 336-381 ms  evaluation 1.6-1.7 s
+    after                            probe p50  19-21 ms   p99  55-60 ms   evaluation 2.5-2.7 s
+The executor keeps the loop responsive; scoring itself slows down because
+it now shares the one CPU with the requests it no longer blocks.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from benchlib import REPO_ROOT, latency_summary, start_service, stop_service  # noqa: E402
+
+URL = "http://127.0.0.1:8001"
+SENTENCE = "In that situation the system design was slow, so I implemented a cache and the result improved. "
+
+
+async def collect(client: httpx.AsyncClient, answers: int, words: int, tag: int) -> str:
+    session_id = (await client.post("/sessions", json={
+        "resume": "Python developer", "job_description": "Backend engineer: Python, AWS",
+        "interview_type": "Mixed",
+    })).json()["session_id"]
+    await client.post(f"/sessions/{session_id}/start")
+    repeat = max(1, words // len(SENTENCE.split()))
+    for i in range(answers):
+        response = await client.post(f"/sessions/{session_id}/submit-answer", params={"collect_mode": True}, json={
+            "session_id": session_id,
+            "question": "",  # Older checkouts require the field
+            "answer": f"Answer {tag}-{i}. " + SENTENCE * repeat,
+        })
+        assert response.status_code == 200, response.text
+    return session_id
+
+
+async def run(sessions: int, answers: int, words: int, evaluators: int):
+    async with httpx.AsyncClient(base_url=URL, timeout=300) as client:
+        heavy_ids = [await collect(client, answers, words, tag) for tag in range(sessions)]
+        probe_id = await collect(client, 0, words, -1)
+
+        latencies = []
+        running = evaluators
+
+        async def evaluate(ids):
+            nonlocal running
+            for session_id in ids:
+                response = await client.post(f"/sessions/{session_id}/evaluate-all")
+                assert response.status_code == 200, response.text
+            running -= 1
+
+        async def probe():
+            while running:
+                start = time.perf_counter()
+                await client.get(f"/sessions/{probe_id}")
+                latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.005)
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            probe(), *(evaluate(heavy_ids[i::evaluators]) for i in range(evaluators))
+        )
+        print(f"evaluate-all wall time: {time.perf_counter() - start:.1f} s")
+        print(f"GET /sessions/{{id}} while evaluating: {latency_summary(latencies)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--root", default=REPO_ROOT, help="checkout to benchmark (default: this one)")
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--answers", type=int, default=200, help="answers per session")
+    parser.add_argument("--words", type=int, default=5000, help="words per answer")
+    parser.add_argument("--evaluators", type=int, default=2, help="concurrent evaluate-all clients")
+    args = parser.parse_args()
+
+    print(f"root: {os.path.abspath(args.root)}")
+    service = start_service(args.root, "interview-service")
+    try:
+        asyncio.run(run(args.sessions, args.answers, args.words, args.evaluators))
+    finally:
+        stop_service(service)
+
+
+if __name__ == "__main__":
+    main()
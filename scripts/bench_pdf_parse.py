@@ -0,0 +1,125 @@
+"""
+PDF parsing benchmark
+Uploads several large PDFs to a checkout's API gateway at once, and
+reports the latency of a cheap gateway request (GET /openapi.json)
+meanwhile, i.e. how much parsing holds up every other client.
+
+    python scripts/bench_pdf_parse.py [--root PATH] [--documents 10] [--pages 50]
+
+Starts the gateway on port 8000, so stop any running services first.
+
+PyPDF2 and pdfplumber are not installed here, so a stand-in PyPDF2 module
+is put on the gateway's path. It spends --page-ms of CPU per page, as text
+extraction does. Every upload is distinct, so the text cache never hits.
+
+Results, 10 documents x 50 pages x 20 ms, one CPU, Python 3.11:
+                                        all parsed   probes   probe p50   probe p99
+    before the worker pool (ddc6ad5^)   11.0-11.1 s    87-102   91-115 ms   235-432 ms
+    after                               15.9-16.0 s     ~1050    4.0 ms      13-14 ms
+Parsing in threads held the GIL, so every gateway request queued behind
+it. Worker processes keep the loop free; the batch takes longer on one
+CPU because the gateway now answers ten times as many other requests
+meanwhile, on top of process start-up and hand-off.
+"""
+
+import argparse
+import asyncio
+import base64
+import os
+import sys
+import tempfile
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from benchlib import PORTS, REPO_ROOT, latency_summary, start_service, stop_service  # noqa: E402
+
+URL = f"http://127.0.0.1:{PORTS['api-gateway']}"
+
+# Stand-in documents are b"PDF:<pages>:" followed by filler
+FAKE_PYPDF2 = '''\
+"""Stand-in for PyPDF2 written by scripts/bench_pdf_parse.py"""
+import os
+import time
+
+PAGE_SECONDS = float(os.environ["FAKE_PDF_PAGE_MS"]) / 1000
+
+
+class _Page:
+    def __init__(self, index):
+        self.index = index
+
+    def extract_text(self):
+        # Burn this thread's CPU like a real parser rather than sleeping
+        deadline = time.thread_time() + PAGE_SECONDS
+        while time.thread_time() < deadline:
+            pass
+        return f"page {self.index} " * 200
+
+
+class PdfReader:
+    def __init__(self, stream):
+        pages = int(stream.read().split(b":")[1])
+        self.pages = [_Page(index) for index in range(pages)]
+'''
+
+
+async def run(documents: int, pages: int):
+    async with httpx.AsyncClient(base_url=URL, timeout=300) as client:
+        await client.get("/openapi.json")
+        latencies, statuses = [], []
+        done = False
+
+        async def probe():
+            while not done:
+                start = time.perf_counter()
+                await client.get("/openapi.json")
+                latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.01)
+
+        async def upload(index: int):
+            data = f"PDF:{pages}:".encode() + os.urandom(1 << 20)
+            response = await client.post("/api/parse-pdf", json={
+                "file_data": base64.b64encode(data).decode(), "file_name": f"{index}.pdf",
+            })
+            statuses.append(response.status_code)
+
+        prober = asyncio.create_task(probe())
+        start = time.perf_counter()
+        await asyncio.gather(*(upload(index) for index in range(documents)))
+        elapsed = time.perf_counter() - start
+        done = True
+        await prober
+
+    print(f"parsed {statuses.count(200)}/{documents} in {elapsed:.1f} s, statuses {sorted(set(statuses))}")
+    print(f"GET /openapi.json while parsing: {latency_summary(latencies)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--root", default=REPO_ROOT, help="checkout to benchmark (default: this one)")
+    parser.add_argument("--documents", type=int, default=10, help="concurrent uploads")
+    parser.add_argument("--pages", type=int, default=50, help="pages per document")
+    parser.add_argument("--page-ms", type=float, default=20.0, help="stand-in parser CPU per page")
+    args = parser.parse_args()
+
+    print(f"root: {os.path.abspath(args.root)}")
+    with tempfile.TemporaryDirectory() as scratch:
+        os.makedirs(os.path.join(scratch, "PyPDF2"))
+        with open(os.path.join(scratch, "PyPDF2", "__init__.py"), "w") as f:
+            f.write(FAKE_PYPDF2)
+        env = {
+            "FAKE_PDF_PAGE_MS": str(args.page_ms),
+            "PDF_MAX_QUEUE": str(args.documents),  # Measure parsing, not admission
+            "PYTHONPATH": os.pathsep.join(filter(None, (scratch, os.environ.get("PYTHONPATH")))),
+        }
+        service = start_service(args.root, "api-gateway", env)
+        try:
+            asyncio.run(run(args.documents, args.pages))
+        finally:
+            stop_service(service)
+
+
+if __name__ == "__main__":
+    main()
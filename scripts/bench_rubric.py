@@ -0,0 +1,79 @@
+"""
+Rubric benchmark
+Times EvaluatorAgent.evaluate on long answers and prints a digest of the
+scores, so two checkouts can be compared for speed and identical output.
+
+    python scripts/bench_rubric.py [--root PATH] [--words 10000]
+
+Use --root with a worktree of another commit to measure it, e.g.
+    git worktree add /tmp/before <commit>^
+    python scripts/bench_rubric.py --root /tmp/before
+
+Results, 10,000-word answers, one CPU, Python 3.11 (best of two runs):
+    before the single-pass rubric (fe048e3^)   technical 7.3 ms  behavioral 6.8 ms
+    after                                      technical 1.8 ms  behavioral 2.0 ms
+    Both print score digest 90eaa0ea21ddd417.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Rubric words mixed with filler, so every scorer has something to find
+VOCABULARY = (
+    "the system we developed handled performance issues because our team "
+    "implemented a new database architecture and I like to test code result "
+    "outcome situation for example specifically um api framework scalability"
+).split()
+
+QUESTIONS = (
+    ("technical", "How would you design a scalable API?"),
+    ("behavioral", "Tell me about a time you led a project"),
+)
+
+
+def make_answer(words: int, seed: int) -> str:
+    rng = random.Random(seed)
+    sentences = []
+    while words > 0:
+        length = min(words, rng.randint(8, 25))
+        sentences.append(" ".join(rng.choice(VOCABULARY) for _ in range(length)).capitalize() + ".")
+        words -= length
+    return " ".join(sentences)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--root", default=REPO_ROOT, help="checkout to benchmark (default: this one)")
+    parser.add_argument("--words", type=int, default=10000, help="words per answer")
+    parser.add_argument("--repeat", type=int, default=20, help="evaluations per question type")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.abspath(args.root))
+    from agents.evaluator import EvaluatorAgent
+
+    evaluator = EvaluatorAgent()
+    answers = [make_answer(args.words, seed) for seed in range(args.repeat)]
+    digest = hashlib.sha256()
+    print(f"root: {os.path.abspath(args.root)}")
+    for question_type, question in QUESTIONS:
+        for answer in answers[:2]:
+            # Warm caches and compiled patterns
+            evaluator.evaluate(question, answer, question_type)
+        start = time.perf_counter()
+        for answer in answers:
+            scores = evaluator.evaluate(question, answer, question_type)
+            digest.update(json.dumps(scores, sort_keys=True).encode("utf-8"))
+        elapsed = (time.perf_counter() - start) / len(answers)
+        print(f"{question_type:>10}: {elapsed * 1000:6.1f} ms per {args.words}-word answer")
+    print(f"score digest: {digest.hexdigest()[:16]}")
+
+
+if __name__ == "__main__":
+    main()
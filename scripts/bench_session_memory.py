@@ -0,0 +1,79 @@
+"""
+Session memory benchmark
+Reports the traced memory each InterviewSession holds, idle and after
+scoring answers, as many sessions stay resident in one process.
+
+    python scripts/bench_session_memory.py [--root PATH]
+
+The process-wide evaluation cache is disabled, so scores and feedback are
+counted per session as they would be for distinct answers.
+
+Checkouts without InterviewSession.evaluate_answers score the same answers
+one at a time with process_answer.
+
+Results, bytes per session, Python 3.11:
+                                           idle   10 answers
+    baseline (dff9116)                      961        9,985
+    before slotted sessions (ccc2975^)      961        9,575
+    slotted sessions (ccc2975)              528        5,783
+    current tree                            900        9,813
+The aggregate and the evaluation ledger are created with the first
+answer, so idle sessions stay below the baseline. With answers they cost
+~1.6 KB and ~2.1 KB per 10 answers. They buy O(1) live stats and
+evaluate-all that never scores an answer twice.
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+QUESTION = "Tell me about a time you fixed a bug"
+ANSWER = "In that situation my task was to act, and the result was good because we measured it. "
+
+
+def bytes_per_session(sessions: int, answers: int) -> float:
+    from session import InterviewSession
+
+    gc.collect()
+    tracemalloc.start()
+    keep = []
+    for i in range(sessions):
+        session = InterviewSession()
+        session.initialize("Python developer with AWS experience", "Backend engineer: Python, AWS", "Mixed")
+        session.start_interview()
+        qa_pairs = [
+            {"question": QUESTION, "answer": f"{ANSWER * 3} ({i}-{j})", "question_type": "behavioral"}
+            for j in range(answers)
+        ]
+        if hasattr(session, "evaluate_answers"):
+            session.evaluate_answers(qa_pairs)
+        else:
+            # Checkouts before batch evaluation (7e45681^) score one answer at a time
+            session.current_question, session.current_question_type = QUESTION, "behavioral"
+            for qa in qa_pairs:
+                session.process_answer(qa["answer"])
+        keep.append(session)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / sessions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--root", default=REPO_ROOT, help="checkout to benchmark (default: this one)")
+    parser.add_argument("--sessions", type=int, default=2000)
+    args = parser.parse_args()
+
+    os.environ["EVALUATION_CACHE_MAX_ITEMS"] = "0"
+    sys.path.insert(0, os.path.abspath(args.root))
+    print(f"root: {os.path.abspath(args.root)}")
+    for answers in (0, 10):
+        print(f"{answers:2d} answers: {bytes_per_session(args.sessions, answers):8.0f} bytes/session")
+
+
+if __name__ == "__main__":
+    main()
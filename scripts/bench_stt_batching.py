@@ -0,0 +1,106 @@
+"""
+STT micro-batching benchmark
+Drives the voice service's STTPool with closed-loop clients against a
+simulated batch-capable backend, and reports throughput, latency and the
+mean batch size for a range of STT_BATCH_SIZE / STT_BATCH_WAIT_MS
+settings. Batch size 1 is the one-job-per-call path used before
+micro-batching.
+
+    python scripts/bench_stt_batching.py [--pass-ms 60] [--clip-ms 6] [--seconds 3]
+
+The simulated backend costs a fixed --pass-ms per model call plus
+--clip-ms per clip in it, and releases the GIL while it works, like a
+native or GPU inference call. Whisper on this machine's one CPU would
+spend most of its time per clip, which batching cannot save.
+
+Results, 60 ms per call + 6 ms per clip, 2 workers, one CPU, Python 3.11:
+    clients  size  wait ms   jobs/s   p50 ms   p99 ms  mean batch
+          1     1        0     14.6     66.6     97.1     (no batching)
+          1     8       25     10.8     92.1     99.4        1.00
+          8     1        0     29.9    265.7    278.2     (no batching)
+          8     4       10     93.5     85.0     89.6        4.00
+          8     8       25     72.9    109.0    122.6        8.00
+         32     1        0     29.8   1065.0   1089.1     (no batching)
+         32     8       25    146.0    218.5    224.3        8.00
+         32    16       25    202.5    157.7    162.2       16.00
+A lone client pays the batch window in latency with nothing to share it
+with. Under load the defaults (8 jobs, 25 ms) raise throughput 2.4-4.9x
+and cut p50 from 266-1065 ms to 109-219 ms. Batch sizes larger than the
+offered concurrency only add waiting.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import speech_recognition as sr
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from benchlib import REPO_ROOT, percentile  # noqa: E402
+
+sys.path[:0] = [REPO_ROOT, os.path.join(REPO_ROOT, "services", "voice-service")]
+from stt_backends import STTBackend, STTPool  # noqa: E402
+
+SETTINGS = ((1, 0), (4, 10), (8, 10), (8, 25), (16, 25), (16, 50))
+
+
+def simulated_backend(pass_seconds: float, clip_seconds: float):
+    class SimulatedBackend(STTBackend):
+        name = "simulated"
+        supports_batching = True
+
+        def transcribe(self, audio, language):
+            time.sleep(pass_seconds + clip_seconds)
+            return "simulated", 1.0
+
+        def transcribe_batch(self, audios, languages):
+            time.sleep(pass_seconds + clip_seconds * len(audios))
+            return [("simulated", 1.0)] * len(audios)
+
+    return SimulatedBackend
+
+
+async def measure(backend, batch_size: int, batch_wait_ms: float, clients: int, seconds: float):
+    pool = STTPool(backend, workers=2, max_pending=1000, batch_size=batch_size, batch_wait_ms=batch_wait_ms)
+    pool.start()
+    audio = sr.AudioData(b"\x01\x00" * 16000, 16000, 2)
+    latencies = []
+    deadline = time.perf_counter() + seconds
+
+    async def client():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await pool.transcribe(audio)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    stats = pool.stats()
+    pool.shutdown()
+    return (len(latencies) / elapsed, percentile(latencies, 0.5) * 1000,
+            percentile(latencies, 0.99) * 1000, stats["mean_batch_size"])
+
+
+async def run(backend, seconds: float):
+    print("clients  size  wait ms   jobs/s   p50 ms   p99 ms  mean batch")
+    for clients in (1, 8, 32):
+        for batch_size, batch_wait_ms in SETTINGS:
+            rate, p50, p99, mean_batch = await measure(backend, batch_size, batch_wait_ms, clients, seconds)
+            print(f"{clients:7d} {batch_size:5d} {batch_wait_ms:8.0f} {rate:8.1f} {p50:8.1f} {p99:8.1f} {mean_batch:11.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pass-ms", type=float, default=60.0, help="simulated cost per model call")
+    parser.add_argument("--clip-ms", type=float, default=6.0, help="simulated cost per clip")
+    parser.add_argument("--seconds", type=float, default=3.0, help="duration of each setting")
+    args = parser.parse_args()
+
+    asyncio.run(run(simulated_backend(args.pass_ms / 1000, args.clip_ms / 1000), args.seconds))
+
+
+if __name__ == "__main__":
+    main()
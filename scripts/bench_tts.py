@@ -0,0 +1,177 @@
+"""
+TTS benchmark
+Sends distinct /synthesize requests to a checkout's voice service at 1, 4
+and 16 concurrent clients, and reports throughput, request latency and
+the latency of GET /health meanwhile (how long synthesis holds up the
+event loop).
+
+    python scripts/bench_tts.py [--root PATH] [--requests 48]
+    python scripts/bench_tts.py --fake-render-ms 50 [--root PATH]
+
+Starts the voice service on port 8002, so stop any running one first.
+Each run uses a fresh TTS cache directory, and waits for the question-bank
+pre-warm to finish before measuring.
+
+With --fake-render-ms, a stand-in pyttsx3 module is put on the service's
+path. It spends that much CPU time per phrase and writes a short WAV. It
+measures how each checkout schedules synthesis where no speech engine can
+be installed. Without the flag the installed engine is used.
+
+Results with --fake-render-ms 50, 48 requests, one CPU, Python 3.11:
+                             req/s   synthesize p50/p99     /health p50/p99
+    before the pool (6af0e0b^)
+        concurrency  1        16.5        60 / 79 ms          48 / 66 ms
+        concurrency  4        17.6       226 / 291 ms        215 / 277 ms
+        concurrency 16        17.5       899 / 1168 ms       893 / 1086 ms
+    after
+        concurrency  1        14.5        68 / 90 ms           4 / 9 ms
+        concurrency  4        15.1       266 / 278 ms          5 / 15 ms
+        concurrency 16        14.7      1080 / 1111 ms         5 / 16 ms
+One CPU caps throughput at 20 phrases/s either way, and process hand-off
+costs ~10%. With more cores, TTS_WORKERS scales it. What the pool buys
+here is an event loop that keeps serving other requests during synthesis.
+Real-engine figures need eSpeak, which this environment cannot install.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from benchlib import PORTS, REPO_ROOT, latency_summary, start_service, stop_service  # noqa: E402
+
+URL = f"http://127.0.0.1:{PORTS['voice-service']}"
+
+FAKE_PYTTSX3 = '''\
+"""Stand-in for pyttsx3 written by scripts/bench_tts.py"""
+import os
+import time
+import wave
+
+RENDER_SECONDS = float(os.environ["FAKE_TTS_RENDER_MS"]) / 1000
+
+
+class Voice:
+    id = "fake"
+    name = "Fake voice"
+    languages = []
+
+
+class Engine:
+    def __init__(self):
+        self._properties = {"voices": [Voice()]}
+        self._jobs = []
+
+    def getProperty(self, name):
+        return self._properties.get(name)
+
+    def setProperty(self, name, value):
+        self._properties[name] = value
+
+    def save_to_file(self, text, path):
+        self._jobs.append(path)
+
+    def runAndWait(self):
+        for path in self._jobs:
+            # Burn CPU like a real engine rather than sleeping
+            deadline = time.process_time() + RENDER_SECONDS
+            while time.process_time() < deadline:
+                pass
+            with wave.open(path, "wb") as out:
+                out.setnchannels(1)
+                out.setsampwidth(2)
+                out.setframerate(16000)
+                out.writeframes(bytes(3200))
+        self._jobs = []
+
+
+def init():
+    return Engine()
+'''
+
+
+async def wait_for_prewarm(client: httpx.AsyncClient, timeout: float = 300.0):
+    """Wait until the pre-warm stops adding entries to the cache"""
+    deadline = time.monotonic() + timeout
+    previous, stable_since = -1, time.monotonic()
+    while time.monotonic() < deadline:
+        items = (await client.get("/health")).json()["tts_cache"]["memory_items"]
+        if items != previous:
+            previous, stable_since = items, time.monotonic()
+        elif time.monotonic() - stable_since > 2.0:
+            return items
+        await asyncio.sleep(0.25)
+    raise RuntimeError("TTS pre-warm did not finish")
+
+
+async def measure(client: httpx.AsyncClient, concurrency: int, requests: int, tag: str):
+    texts = [f"Benchmark phrase {tag} number {i}, please describe a recent project." for i in range(requests)]
+    latencies, probes, failures = [], [], 0
+    done = False
+
+    async def worker():
+        nonlocal failures
+        while texts:
+            text = texts.pop()
+            start = time.perf_counter()
+            response = await client.post("/synthesize", json={"text": text})
+            if response.status_code == 200:
+                latencies.append(time.perf_counter() - start)
+            else:
+                failures += 1
+
+    async def probe():
+        while not done:
+            start = time.perf_counter()
+            await client.get("/health")
+            probes.append(time.perf_counter() - start)
+            await asyncio.sleep(0.01)
+
+    prober = asyncio.create_task(probe())
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    done = True
+    await prober
+
+    print(f"concurrency {concurrency:2d}: {len(latencies) / elapsed:5.1f} req/s, failed {failures}")
+    print(f"    synthesize: {latency_summary(latencies)}")
+    print(f"    /health:    {latency_summary(probes)}")
+
+
+async def run(requests: int):
+    async with httpx.AsyncClient(base_url=URL, timeout=300) as client:
+        print(f"pre-warmed {await wait_for_prewarm(client)} phrases")
+        for concurrency in (1, 4, 16):
+            await measure(client, concurrency, requests, f"c{concurrency}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--root", default=REPO_ROOT, help="checkout to benchmark (default: this one)")
+    parser.add_argument("--requests", type=int, default=48, help="requests per concurrency level")
+    parser.add_argument("--fake-render-ms", type=float, help="use a stand-in engine costing this much CPU per phrase")
+    args = parser.parse_args()
+
+    print(f"root: {os.path.abspath(args.root)}")
+    with tempfile.TemporaryDirectory() as scratch:
+        env = {"TTS_CACHE_DIR": os.path.join(scratch, "cache"), "STT_BACKEND": "stub"}
+        if args.fake_render_ms is not None:
+            with open(os.path.join(scratch, "pyttsx3.py"), "w") as f:
+                f.write(FAKE_PYTTSX3)
+            env["FAKE_TTS_RENDER_MS"] = str(args.fake_render_ms)
+            env["PYTHONPATH"] = os.pathsep.join(filter(None, (scratch, os.environ.get("PYTHONPATH"))))
+        service = start_service(args.root, "voice-service", env)
+        try:
+            asyncio.run(run(args.requests))
+        finally:
+            stop_service(service)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark helpers
+Starts a checkout's services as subprocesses and summarizes latencies
+"""
+
+from typing import Dict, List, Optional
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PORTS = {"api-gateway": 8000, "interview-service": 8001, "voice-service": 8002}
+
+
+def start_service(root: str, name: str, env: Optional[Dict[str, str]] = None,
+                  timeout: float = 60.0) -> subprocess.Popen:
+    """Run services/<name>/main.py from ``root`` and wait until /health answers"""
+    script = os.path.join(os.path.abspath(root), "services", name, "main.py")
+    process = subprocess.Popen(
+        [sys.executable, script],
+        env={**os.environ, **(env or {})},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{PORTS[name]}/health"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{name} exited with status {process.returncode}")
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    stop_service(process)
+    raise RuntimeError(f"{name} did not become healthy within {timeout:.0f} s")
+
+
+def stop_service(process: subprocess.Popen):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def latency_summary(seconds: List[float]) -> str:
+    """p50 / p99 / max in milliseconds"""
+    if not seconds:
+        return "no samples"
+    return (f"n={len(seconds)} p50={percentile(seconds, 0.5) * 1000:.1f} ms "
+            f"p99={percentile(seconds, 0.99) * 1000:.1f} ms max={max(seconds) * 1000:.1f} ms")
@@ -6,7 +6,10 @@ Coordinates Interview Service and Voice Service
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from contextlib import asynccontextmanager
+from typing import Optional
 import httpx
 import json
 import base64
@@ -23,8 +26,31 @@ from services.shared.models import (
     PDFParseResponse,
     VoiceTranscriptionRequest
 )
+from upstream import UpstreamClients, UpstreamConfig, route_timeout
+from tracing import install_tracing, start_trace, traced
+from ws_audio import StreamingTranscription, UtteranceBuffer
+from pdf_workers import PDFQueueFullError, PDFTimeoutError, PDFTooLargeError, pool_from_env
 
-app = FastAPI(title="Interview Practice API Gateway", version="1.0.0")
+# Pooled clients for the upstream services, one connection pool each
+upstreams = UpstreamClients({
+    "interview": UpstreamConfig.from_env("INTERVIEW_SERVICE", "http://localhost:8001"),
+    "voice": UpstreamConfig.from_env("VOICE_SERVICE", "http://localhost:8002"),
+})
+
+# Resume / job description parsing, off the event loop
+pdf_pool = pool_from_env()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await upstreams.start()
+    pdf_pool.start()
+    yield
+    await upstreams.close()
+    await asyncio.to_thread(pdf_pool.shutdown)
+
+
+app = FastAPI(title="Interview Practice API Gateway", version="1.0.0", lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -33,14 +59,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
-# Service URLs (use environment variables in production)
-INTERVIEW_SERVICE_URL = os.getenv("INTERVIEW_SERVICE_URL", "http://localhost:8001")
-VOICE_SERVICE_URL = os.getenv("VOICE_SERVICE_URL", "http://localhost:8002")
-
-# HTTP client for service communication
-http_client = httpx.AsyncClient(timeout=30.0)
+# Server-Timing header with upstream spans for every route
+install_tracing(app)
 
 
 class ConnectionManager:
@@ -48,14 +71,45 @@ class ConnectionManager:
     
     def __init__(self):
         self.active_connections: dict[str, WebSocket] = {}
+        # Per-session microphone calibration, passed with every transcription
+        self.noise_profiles: dict[str, dict] = {}
     
     async def connect(self, websocket: WebSocket, session_id: str):
         await websocket.accept()
         self.active_connections[session_id] = websocket
+        try:
+            response = await upstreams.interview.get(f"/sessions/{session_id}")
+            if response.status_code == 200 and response.json().get("noise_profile"):
+                self.noise_profiles[session_id] = response.json()["noise_profile"]
+        except httpx.HTTPError:
+            pass
     
     def disconnect(self, session_id: str):
         if session_id in self.active_connections:
             del self.active_connections[session_id]
+        self.noise_profiles.pop(session_id, None)
+    
+    def noise_params(self, session_id: str) -> dict:
+        profile = self.noise_profiles.get(session_id)
+        if not profile:
+            return {}
+        return {
+            "noise_rms": str(profile["noise_rms"]),
+            "energy_threshold": str(profile["energy_threshold"])
+        }
+    
+    async def save_noise_profile(self, session_id: str, profile: Optional[dict]):
+        """Keep a freshly measured profile and store it with the session"""
+        if not profile:
+            return
+        self.noise_profiles[session_id] = profile
+        try:
+            await traced("interview.noise_profile", upstreams.interview.put(
+                f"/sessions/{session_id}/noise-profile",
+                json=profile
+            ))
+        except httpx.HTTPError as e:
+            print(f"Warning: Could not store noise profile for {session_id}: {e}")
     
     async def send_message(self, session_id: str, message: dict):
         if session_id in self.active_connections:
@@ -69,14 +123,14 @@ manager = ConnectionManager()
 async def create_session(session_data: SessionCreate):
     """Create a new interview session"""
     try:
-        response = await http_client.post(
-            f"{INTERVIEW_SERVICE_URL}/sessions",
+        response = await traced("interview.create", upstreams.interview.post(
+            "/sessions",
             json={
                 "resume": session_data.resume,
                 "job_description": session_data.job_description,
                 "interview_type": session_data.interview_type.value
             }
-        )
+        ))
         response.raise_for_status()
         return response.json()
     except httpx.HTTPError as e:
@@ -87,26 +141,38 @@ async def create_session(session_data: SessionCreate):
 async def get_session(session_id: str):
     """Get session status"""
     try:
-        response = await http_client.get(f"{INTERVIEW_SERVICE_URL}/sessions/{session_id}")
+        response = await traced("interview.status", upstreams.interview.get(f"/sessions/{session_id}"))
         response.raise_for_status()
         return response.json()
     except httpx.HTTPError as e:
         raise HTTPException(status_code=500, detail=f"Failed to get session: {str(e)}")
 
 
+@app.get("/api/sessions/{session_id}/stats")
+async def get_session_stats(session_id: str):
+    """Live score statistics for a session in progress"""
+    try:
+        response = await traced("interview.stats", upstreams.interview.get(f"/sessions/{session_id}/stats"))
+        response.raise_for_status()
+        return response.json()
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get session stats: {str(e)}")
+
+
 @app.post("/api/sessions/{session_id}/start")
 async def start_interview(session_id: str):
     """Start interview and get first question"""
     try:
-        response = await http_client.post(f"{INTERVIEW_SERVICE_URL}/sessions/{session_id}/start")
+        response = await traced("interview.start", upstreams.interview.post(f"/sessions/{session_id}/start"))
         response.raise_for_status()
         question_data = response.json()
         
         # Get TTS audio for the question
-        tts_response = await http_client.post(
-            f"{VOICE_SERVICE_URL}/synthesize",
-            json={"text": question_data["question"]}
-        )
+        tts_response = await traced("voice.synthesize", upstreams.voice.post(
+            "/synthesize",
+            json={"text": question_data["question"]},
+            timeout=route_timeout("synthesize")
+        ))
         tts_data = tts_response.json() if tts_response.status_code == 200 else None
         
         return {
@@ -124,20 +190,16 @@ async def submit_answer(session_id: str, answer_data: dict):
         answer = answer_data.get("answer", "")
         collect_mode = answer_data.get("collect_mode", True)
         
-        # Get current question from session
-        session_response = await http_client.get(f"{INTERVIEW_SERVICE_URL}/sessions/{session_id}")
-        session = session_response.json()
-        current_question = session.get("current_question", "")
-        
-        response = await http_client.post(
-            f"{INTERVIEW_SERVICE_URL}/sessions/{session_id}/submit-answer",
+        # The interview service fills in its current question when none is given
+        response = await traced("interview.submit", upstreams.interview.post(
+            f"/sessions/{session_id}/submit-answer",
             params={"collect_mode": collect_mode},
             json={
                 "session_id": session_id,
-                "question": current_question,
+                "question": answer_data.get("question", ""),
                 "answer": answer
             }
-        )
+        ))
         response.raise_for_status()
         return response.json()
     except httpx.HTTPError as e:
@@ -148,15 +210,16 @@ async def submit_answer(session_id: str, answer_data: dict):
 async def get_next_question(session_id: str):
     """Get next question with TTS audio"""
     try:
-        response = await http_client.post(f"{INTERVIEW_SERVICE_URL}/sessions/{session_id}/next-question")
+        response = await traced("interview.next", upstreams.interview.post(f"/sessions/{session_id}/next-question"))
         response.raise_for_status()
         question_data = response.json()
         
         # Get TTS audio
-        tts_response = await http_client.post(
-            f"{VOICE_SERVICE_URL}/synthesize",
-            json={"text": question_data["question"]}
-        )
+        tts_response = await traced("voice.synthesize", upstreams.voice.post(
+            "/synthesize",
+            json={"text": question_data["question"]},
+            timeout=route_timeout("synthesize")
+        ))
         tts_data = tts_response.json() if tts_response.status_code == 200 else None
         
         return {
@@ -171,27 +234,64 @@ async def get_next_question(session_id: str):
 async def evaluate_all(session_id: str):
     """Evaluate all collected answers"""
     try:
-        response = await http_client.post(f"{INTERVIEW_SERVICE_URL}/sessions/{session_id}/evaluate-all")
+        response = await traced("interview.evaluate", upstreams.interview.post(
+            f"/sessions/{session_id}/evaluate-all", timeout=route_timeout("evaluate")
+        ))
         response.raise_for_status()
         return response.json()
     except httpx.HTTPError as e:
         raise HTTPException(status_code=500, detail=f"Failed to evaluate: {str(e)}")
 
 
+@app.post("/api/sessions/{session_id}/evaluate-all/stream")
+async def evaluate_all_stream(session_id: str, format: str = "ndjson"):
+    """Evaluate all collected answers, passing each evaluation through as
+    the interview service streams it (format=ndjson or format=sse)"""
+    request = upstreams.interview.build_request(
+        "POST", f"/sessions/{session_id}/evaluate-all/stream",
+        params={"format": format}, timeout=route_timeout("evaluate")
+    )
+    try:
+        response = await traced("interview.evaluate", upstreams.interview.send(request, stream=True))
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=500, detail=f"Failed to evaluate: {str(e)}")
+    
+    if response.status_code != 200:
+        await response.aread()
+        await response.aclose()
+        try:
+            detail = response.json().get("detail", response.text)
+        except ValueError:
+            detail = response.text
+        headers = {"Retry-After": response.headers["Retry-After"]} if "Retry-After" in response.headers else None
+        raise HTTPException(status_code=response.status_code, detail=detail, headers=headers)
+    
+    # Relay raw chunks as they arrive; nothing is buffered here
+    return StreamingResponse(
+        response.aiter_raw(),
+        media_type=response.headers.get("content-type"),
+        headers={"Cache-Control": "no-cache"},
+        background=BackgroundTask(response.aclose),
+    )
+
+
 @app.post("/api/sessions/{session_id}/end")
 async def end_interview(session_id: str):
     """End interview and get final report"""
     try:
-        response = await http_client.post(f"{INTERVIEW_SERVICE_URL}/sessions/{session_id}/end")
+        response = await traced("interview.end", upstreams.interview.post(
+            f"/sessions/{session_id}/end", timeout=route_timeout("evaluate")
+        ))
         response.raise_for_status()
         report = response.json()
         
-        # Generate TTS for feedback summary
+        # Generate TTS for feedback summary (the text needs the report's score)
         feedback_text = f"Your average score was {report.get('average_score', 0):.1f} out of 10."
-        tts_response = await http_client.post(
-            f"{VOICE_SERVICE_URL}/synthesize",
-            json={"text": feedback_text}
-        )
+        tts_response = await traced("voice.synthesize", upstreams.voice.post(
+            "/synthesize",
+            json={"text": feedback_text},
+            timeout=route_timeout("synthesize")
+        ))
         tts_data = tts_response.json() if tts_response.status_code == 200 else None
         
         return {
@@ -206,14 +306,16 @@ async def end_interview(session_id: str):
 async def transcribe_audio(request: VoiceTranscriptionRequest):
     """Transcribe audio using Voice Service"""
     try:
-        response = await http_client.post(
-            f"{VOICE_SERVICE_URL}/transcribe-base64",
+        response = await traced("voice.transcribe", upstreams.voice.post(
+            "/transcribe-base64",
             json={
                 "audio_data": request.audio_data,
                 "audio_format": request.audio_format,
-                "language": request.language
-            }
-        )
+                "language": request.language,
+                "noise_profile": request.noise_profile.model_dump() if request.noise_profile else None
+            },
+            timeout=route_timeout("transcribe")
+        ))
         response.raise_for_status()
         return response.json()
     except httpx.HTTPError as e:
@@ -231,39 +333,32 @@ async def transcribe_audio(request: VoiceTranscriptionRequest):
 async def parse_pdf_endpoint(request: PDFParseRequest):
     """Parse PDF file and extract text"""
     try:
-        import base64
-        import tempfile
-        import os
-        
-        # Import parser from project root
-        sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
-        from utils.parser import parse_pdf as parse_pdf_file
-        
         if not request.file_data:
             raise HTTPException(status_code=400, detail="No file data provided")
         
+        # Reject oversized uploads before decoding them
+        if len(request.file_data) * 3 // 4 > pdf_pool.max_bytes:
+            raise HTTPException(status_code=413, detail=f"PDF exceeds {pdf_pool.max_bytes} bytes")
+        
         # Decode base64
         try:
             pdf_bytes = base64.b64decode(request.file_data)
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Invalid base64 data: {str(e)}")
         
-        # Save to temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-            tmp_file.write(pdf_bytes)
-            tmp_file_path = tmp_file.name
-        
+        # Parse in a worker process; repeat uploads come from the content-hash cache
         try:
-            # Parse PDF
-            text = parse_pdf_file(tmp_file_path)
-            if not text:
-                raise HTTPException(status_code=400, detail="Could not extract text from PDF")
-            
-            return PDFParseResponse(text=text, file_name=request.file_name)
-        finally:
-            # Clean up temp file
-            if os.path.exists(tmp_file_path):
-                os.unlink(tmp_file_path)
+            text = await traced("pdf.parse", pdf_pool.parse(pdf_bytes))
+        except PDFTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except PDFQueueFullError as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+        except PDFTimeoutError as e:
+            raise HTTPException(status_code=408, detail=str(e))
+        if not text:
+            raise HTTPException(status_code=400, detail="Could not extract text from PDF")
+        
+        return PDFParseResponse(text=text, file_name=request.file_name)
                 
     except HTTPException:
         raise
@@ -271,13 +366,210 @@ async def parse_pdf_endpoint(request: PDFParseRequest):
         raise HTTPException(status_code=500, detail=f"PDF parsing failed: {str(e)}")
 
 
+async def transcribe_and_submit(websocket: WebSocket, session_id: str,
+                                audio: bytes, params: dict):
+    """Transcribe one buffered utterance and auto-submit it as the current answer"""
+    # Raw bytes go straight through; no base64 round-trip
+    transcribe_response = await traced("voice.transcribe", upstreams.voice.post(
+        "/transcribe-raw",
+        params={**params, **manager.noise_params(session_id)},
+        content=audio,
+        headers={"Content-Type": "application/octet-stream"},
+        timeout=route_timeout("transcribe")
+    ))
+    
+    if transcribe_response.status_code != 200:
+        return
+    
+    transcription = transcribe_response.json()
+    await manager.save_noise_profile(session_id, transcription.get("noise_profile"))
+    await submit_transcription(websocket, session_id, transcription)
+
+
+async def calibrate(websocket: WebSocket, session_id: str, audio: bytes, params: dict):
+    """Measure the session's noise profile from a recording of the room"""
+    response = await traced("voice.calibrate", upstreams.voice.post(
+        "/calibrate",
+        params={k: v for k, v in params.items() if k != "language"},
+        content=audio,
+        headers={"Content-Type": "application/octet-stream"},
+        timeout=route_timeout("transcribe")
+    ))
+    
+    if response.status_code != 200:
+        await websocket.send_json({"type": "error", "message": "Calibration failed"})
+        return
+    
+    profile = response.json()
+    await manager.save_noise_profile(session_id, profile)
+    await websocket.send_json({"type": "calibrated", "noise_profile": profile})
+
+
+async def open_stream(websocket: WebSocket, session_id: str, utterance: UtteranceBuffer):
+    """Start relaying the utterance's frames to the voice service as they arrive"""
+    
+    async def relay(message: dict):
+        if message.get("type") == "partial":
+            await websocket.send_json({
+                "type": "transcription",
+                "partial": True,
+                "segment": message.get("segment"),
+                "text": message.get("text_so_far", "")
+            })
+        elif message.get("type") == "error":
+            await websocket.send_json({"type": "error", "message": message.get("message", "")})
+    
+    params = {**utterance.params, **manager.noise_params(session_id)}
+    utterance.stream = StreamingTranscription(upstreams.base_url("voice"), params, relay)
+    await traced("voice.stream_open", utterance.stream.open())
+
+
+async def finish_stream(websocket: WebSocket, session_id: str, utterance: UtteranceBuffer):
+    """Wait for the streamed utterance's final transcript and submit it"""
+    stream, utterance.stream = utterance.stream, None
+    utterance.reset()
+    final = await traced("voice.stream_final", stream.finish(route_timeout("transcribe").read))
+    await manager.save_noise_profile(session_id, final.get("noise_profile"))
+    if not final.get("complete", True):
+        # Part of the answer was never transcribed; don't submit a fragment
+        await websocket.send_json({
+            "type": "error",
+            "message": "Part of your answer could not be transcribed, please answer again"
+        })
+        return
+    await submit_transcription(websocket, session_id, final)
+
+
+async def submit_transcription(websocket: WebSocket, session_id: str, transcription: dict):
+    """Report a final transcription and auto-submit it as the current answer"""
+    text = transcription.get("text", "")
+    
+    # Send transcription back
+    send_transcription = websocket.send_json({
+        "type": "transcription",
+        "text": text,
+        "confidence": transcription.get("confidence", 0.0)
+    })
+    
+    if not text.strip():
+        await send_transcription
+        return
+    
+    # Auto-submit the answer while the transcription goes out
+    _, answer_response = await asyncio.gather(
+        send_transcription,
+        traced("interview.submit", upstreams.interview.post(
+            f"/sessions/{session_id}/submit-answer",
+            params={"collect_mode": True},
+            json={
+                "session_id": session_id,
+                "question": "",  # Will be filled by service
+                "answer": text
+            }
+        ))
+    )
+    
+    if answer_response.status_code == 200:
+        await websocket.send_json({
+            "type": "answer_submitted",
+            "message": "Answer received"
+        })
+
+
+async def send_audio(websocket: WebSocket, message: dict, audio: bytes):
+    """Send a JSON header describing the audio, then the audio as one binary frame"""
+    await websocket.send_json({**message, "audio_format": "wav", "audio_bytes": len(audio)})
+    await websocket.send_bytes(audio)
+
+
+async def handle_ws_message(websocket: WebSocket, session_id: str, data: dict,
+                            utterance: UtteranceBuffer):
+    """Handle one client control message on the interview WebSocket"""
+    message_type = data.get("type")
+    
+    if message_type == "audio_start":
+        if utterance.stream is not None:
+            # A new utterance abandons one that never got its audio_end
+            await utterance.stream.close()
+            utterance.stream = None
+        utterance.start(data)
+        if utterance.wants_stream(data):
+            await open_stream(websocket, session_id, utterance)
+    
+    elif message_type == "audio_end":
+        if utterance.stream is not None:
+            await finish_stream(websocket, session_id, utterance)
+            return
+        calibration = utterance.calibration
+        audio, params = utterance.finish()
+        if audio and calibration:
+            await calibrate(websocket, session_id, audio, params)
+        elif audio:
+            await transcribe_and_submit(websocket, session_id, audio, params)
+    
+    elif message_type == "audio":
+        # Legacy single-message form with base64 audio in the JSON body
+        audio_base64 = data.get("audio_data")
+        if audio_base64:
+            await transcribe_and_submit(
+                websocket, session_id, base64.b64decode(audio_base64),
+                {"audio_format": data.get("audio_format", "wav")}
+            )
+    
+    elif message_type == "command":
+        command = data.get("command")
+        
+        if command == "next_question":
+            # Get next question
+            question_response = await traced("interview.next", upstreams.interview.post(
+                f"/sessions/{session_id}/next-question"
+            ))
+            
+            if question_response.status_code == 200:
+                question_data = question_response.json()
+                
+                # Get TTS as raw WAV bytes
+                tts_response = await traced("voice.synthesize", upstreams.voice.post(
+                    "/synthesize-raw",
+                    json={"text": question_data["question"]},
+                    timeout=route_timeout("synthesize")
+                ))
+                
+                if tts_response.status_code == 200:
+                    await send_audio(websocket, {
+                        "type": "question",
+                        "question": question_data["question"]
+                    }, tts_response.content)
+                else:
+                    await websocket.send_json({
+                        "type": "question",
+                        "question": question_data["question"]
+                    })
+        
+        elif command == "end_interview":
+            # /end evaluates any collected answers itself, so no separate
+            # /evaluate-all round-trip is needed
+            end_response = await traced("interview.end", upstreams.interview.post(
+                f"/sessions/{session_id}/end",
+                timeout=route_timeout("evaluate")
+            ))
+            
+            if end_response.status_code == 200:
+                report = end_response.json()
+                await websocket.send_json({
+                    "type": "report",
+                    "report": report
+                })
+
+
 @app.websocket("/ws/{session_id}")
 async def websocket_endpoint(websocket: WebSocket, session_id: str):
     """
     WebSocket endpoint for real-time voice interaction
-    Handles bidirectional audio streaming
+    Audio arrives in binary frames; text frames carry JSON control messages
     """
     await manager.connect(websocket, session_id)
+    utterance = UtteranceBuffer()
     
     try:
         # Send welcome message
@@ -289,93 +581,24 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
         
         while True:
             # Receive message from client
-            data = await websocket.receive_json()
-            message_type = data.get("type")
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
             
-            if message_type == "audio":
-                # Handle audio transcription
-                audio_base64 = data.get("audio_data")
-                if audio_base64:
-                    # Transcribe
-                    transcribe_response = await http_client.post(
-                        f"{VOICE_SERVICE_URL}/transcribe-base64",
-                        json={
-                            "audio_data": audio_base64,
-                            "audio_format": "wav"
-                        }
-                    )
-                    
-                    if transcribe_response.status_code == 200:
-                        transcription = transcribe_response.json()
-                        text = transcription.get("text", "")
-                        
-                        # Send transcription back
-                        await websocket.send_json({
-                            "type": "transcription",
-                            "text": text,
-                            "confidence": transcription.get("confidence", 0.0)
-                        })
-                        
-                        # Auto-submit if it's an answer
-                        if text.strip():
-                            answer_response = await http_client.post(
-                                f"{INTERVIEW_SERVICE_URL}/sessions/{session_id}/submit-answer",
-                                params={"collect_mode": True},
-                                json={
-                                    "session_id": session_id,
-                                    "question": "",  # Will be filled by service
-                                    "answer": text
-                                }
-                            )
-                            
-                            if answer_response.status_code == 200:
-                                await websocket.send_json({
-                                    "type": "answer_submitted",
-                                    "message": "Answer received"
-                                })
+            if message.get("bytes") is not None:
+                if utterance.stream is not None:
+                    await utterance.stream.send(message["bytes"])
+                    continue
+                try:
+                    utterance.append(message["bytes"])
+                except ValueError as e:
+                    await websocket.send_json({"type": "error", "message": str(e)})
+                continue
             
-            elif message_type == "command":
-                command = data.get("command")
-                
-                if command == "next_question":
-                    # Get next question
-                    question_response = await http_client.post(
-                        f"{INTERVIEW_SERVICE_URL}/sessions/{session_id}/next-question"
-                    )
-                    
-                    if question_response.status_code == 200:
-                        question_data = question_response.json()
-                        
-                        # Get TTS
-                        tts_response = await http_client.post(
-                            f"{VOICE_SERVICE_URL}/synthesize",
-                            json={"text": question_data["question"]}
-                        )
-                        
-                        if tts_response.status_code == 200:
-                            tts_data = tts_response.json()
-                            await websocket.send_json({
-                                "type": "question",
-                                "question": question_data["question"],
-                                "audio": tts_data.get("audio_data")
-                            })
-                
-                elif command == "end_interview":
-                    # Evaluate and get report
-                    eval_response = await http_client.post(
-                        f"{INTERVIEW_SERVICE_URL}/sessions/{session_id}/evaluate-all"
-                    )
-                    
-                    end_response = await http_client.post(
-                        f"{INTERVIEW_SERVICE_URL}/sessions/{session_id}/end"
-                    )
-                    
-                    if end_response.status_code == 200:
-                        report = end_response.json()
-                        await websocket.send_json({
-                            "type": "report",
-                            "report": report
-                        })
+            data = json.loads(message["text"])
+            
+            with start_trace(f"ws {data.get('type')} {data.get('command', '')}".rstrip()):
+                await handle_ws_message(websocket, session_id, data, utterance)
     
     except WebSocketDisconnect:
         manager.disconnect(session_id)
@@ -385,30 +608,37 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
             "message": str(e)
         })
         manager.disconnect(session_id)
+    finally:
+        if utterance.stream is not None:
+            await utterance.stream.close()
 
 
 @app.get("/health")
 async def health_check():
     """Health check for all services"""
-    services_status = {}
     
-    # Check Interview Service
-    try:
-        response = await http_client.get(f"{INTERVIEW_SERVICE_URL}/health", timeout=5.0)
-        services_status["interview_service"] = "healthy" if response.status_code == 200 else "unhealthy"
-    except:
-        services_status["interview_service"] = "unreachable"
+    async def check(name: str, client: httpx.AsyncClient) -> str:
+        try:
+            response = await traced(f"{name}.health", client.get("/health", timeout=route_timeout("health")))
+            return "healthy" if response.status_code == 200 else "unhealthy"
+        except:
+            return "unreachable"
     
-    # Check Voice Service
-    try:
-        response = await http_client.get(f"{VOICE_SERVICE_URL}/health", timeout=5.0)
-        services_status["voice_service"] = "healthy" if response.status_code == 200 else "unhealthy"
-    except:
-        services_status["voice_service"] = "unreachable"
+    # Check both services concurrently
+    interview_status, voice_status = await asyncio.gather(
+        check("interview", upstreams.interview),
+        check("voice", upstreams.voice),
+    )
+    services_status = {
+        "interview_service": interview_status,
+        "voice_service": voice_status,
+    }
     
     return {
         "status": "healthy" if all(s == "healthy" for s in services_status.values()) else "degraded",
-        "services": services_status
+        "services": services_status,
+        "upstreams": upstreams.stats(),
+        "pdf_workers": pdf_pool.stats()
     }
 
 
@@ -0,0 +1,147 @@
+"""
+PDF Workers
+Pool of worker processes that extract text from uploaded PDFs, so a large
+document never blocks the gateway's event loop
+"""
+
+from typing import Any, Dict, Optional
+import os
+import signal
+import time
+
+from services.shared.pools import AdmissionGate, ProcessWorkerPool
+from utils.parser import PDFTextCache, PDFTimeoutError, extract_pdf_text, pdf_cache
+
+
+class PDFQueueFullError(Exception):
+    """Raised when the parsing queue-depth limit has been reached"""
+
+
+class PDFTooLargeError(ValueError):
+    """Raised for uploads over the size limit"""
+
+
+def _init_worker():
+    """Load the PDF libraries once, when the process starts"""
+    # Parsing is background work; the gateway's own process keeps priority
+    if hasattr(os, "nice"):
+        os.nice(10)
+    for module in ("PyPDF2", "pdfplumber"):
+        try:
+            __import__(module)
+            break
+        except ImportError:
+            continue
+
+
+# CPU seconds between repeat interruptions once a document is over its limit
+CPU_TIMEOUT_REPEAT_SECONDS = 0.1
+
+
+def _cpu_timeout(signum, frame):
+    raise PDFTimeoutError("PDF parsing exceeded its CPU time limit")
+
+
+def _extract_job(data: bytes, max_pages: Optional[int], cpu_seconds: Optional[float]) -> Optional[str]:
+    """Extract one document, interrupted once it has used cpu_seconds of CPU.
+    The timer keeps firing after the limit, and the CPU used is checked
+    again at the end, so a parser that swallows the exception still fails."""
+    if not cpu_seconds or not hasattr(signal, "setitimer"):
+        return extract_pdf_text(data, max_pages)
+
+    started = time.process_time()
+    previous = signal.signal(signal.SIGPROF, _cpu_timeout)
+    signal.setitimer(signal.ITIMER_PROF, cpu_seconds, CPU_TIMEOUT_REPEAT_SECONDS)
+    try:
+        text = extract_pdf_text(data, max_pages)
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, previous)
+    if time.process_time() - started > cpu_seconds:
+        raise PDFTimeoutError("PDF parsing exceeded its CPU time limit")
+    return text
+
+
+class PDFWorkerPool:
+    """Bounded pool of PDF parsing processes.
+
+    At most ``workers`` documents parse at once and up to ``max_queue`` more
+    may wait; beyond that ``parse`` raises PDFQueueFullError. Each document
+    is limited to ``max_bytes`` of input, ``max_pages`` pages and
+    ``cpu_seconds`` of CPU time. Results are cached by content hash in the
+    gateway process, so repeat uploads never reach a worker.
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 8, max_bytes: int = 10 * 1024 * 1024,
+                 max_pages: Optional[int] = 50, cpu_seconds: Optional[float] = 20.0):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.max_bytes = max_bytes
+        self.max_pages = max_pages
+        self.cpu_seconds = cpu_seconds
+        self._processes = ProcessWorkerPool(workers, _init_worker, "PDF")
+        self._gate = AdmissionGate(
+            workers + max_queue, PDFQueueFullError, "PDF parsing queue is full, retry shortly"
+        )
+        self.completed = 0
+        self.timeouts = 0
+        self.failed = 0
+
+    def start(self):
+        self._processes.start()
+
+    def shutdown(self):
+        """Stop the workers, cancelling jobs that have not started"""
+        self._processes.shutdown()
+
+    async def parse(self, data: bytes) -> Optional[str]:
+        """Extracted text of a PDF, from the cache or a worker process"""
+        if len(data) > self.max_bytes:
+            raise PDFTooLargeError(f"PDF exceeds {self.max_bytes} bytes")
+
+        key = PDFTextCache.key(data, self.max_pages)
+        cached = pdf_cache.get(key)
+        if cached is not None:
+            return cached
+
+        with self._gate.admit():
+            try:
+                text = await self._processes.submit(
+                    _extract_job, data, self.max_pages, self.cpu_seconds
+                )
+                self.completed += 1
+            except PDFTimeoutError:
+                self.timeouts += 1
+                raise
+            except Exception:
+                self.failed += 1
+                raise
+
+        if text:
+            pdf_cache.put(key, text)
+        return text
+
+    def stats(self) -> Dict[str, Any]:
+        """Current load figures for health reporting"""
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._gate.pending,
+            "completed": self.completed,
+            "rejected": self._gate.rejected,
+            "timeouts": self.timeouts,
+            "failed": self.failed,
+            "restarts": self._processes.restarts,
+            "cache": pdf_cache.stats(),
+        }
+
+
+def pool_from_env() -> PDFWorkerPool:
+    """Build the pool from PDF_* environment variables"""
+    return PDFWorkerPool(
+        workers=int(os.getenv("PDF_WORKERS", "2")),
+        max_queue=int(os.getenv("PDF_MAX_QUEUE", "8")),
+        max_bytes=int(os.getenv("PDF_MAX_BYTES", str(10 * 1024 * 1024))),
+        max_pages=int(os.getenv("PDF_MAX_PAGES", "50")) or None,
+        cpu_seconds=float(os.getenv("PDF_CPU_SECONDS", "20")) or None,
+    )
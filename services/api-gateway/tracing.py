@@ -0,0 +1,123 @@
+"""
+Request Tracing
+Records upstream call spans per gateway route and reports them as a
+Server-Timing header, so the critical path of each route is visible
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Iterator, List, Optional, Tuple, TypeVar
+import os
+import time
+
+from fastapi import FastAPI
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+T = TypeVar("T")
+
+TRACE_LOG = os.getenv("GATEWAY_TRACE_LOG", "").lower() in ("1", "true", "yes")
+
+_current_trace: ContextVar[Optional["RouteTrace"]] = ContextVar("route_trace", default=None)
+
+
+class RouteTrace:
+    """Spans recorded while handling one request or WebSocket command"""
+
+    def __init__(self, route: str):
+        self.route = route
+        self.started = time.perf_counter()
+        self.spans: List[Tuple[str, float, float]] = []  # (name, offset, duration)
+
+    def record(self, name: str, started: float, finished: float):
+        self.spans.append((name, started - self.started, finished - started))
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def critical_path(self) -> float:
+        """Wall time covered by upstream calls; overlapping spans count once"""
+        covered = 0.0
+        end = 0.0
+        for _, offset, duration in sorted(self.spans, key=lambda span: span[1]):
+            start = max(offset, end)
+            if offset + duration > start:
+                covered += offset + duration - start
+                end = offset + duration
+        return covered
+
+    def server_timing(self) -> str:
+        entries = [
+            f'{name};dur={duration * 1000:.1f};desc="at {offset * 1000:.1f}ms"'
+            for name, offset, duration in self.spans
+        ]
+        entries.append(f"upstream;dur={self.critical_path() * 1000:.1f}")
+        entries.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(entries)
+
+    def log(self):
+        if TRACE_LOG:
+            print(f"[trace] {self.route} {self.server_timing()}")
+
+
+@contextmanager
+def start_trace(route: str) -> Iterator[RouteTrace]:
+    """Trace a unit of work outside the HTTP middleware (e.g. a WebSocket command)"""
+    trace = RouteTrace(route)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        trace.log()
+
+
+async def traced(name: str, awaitable: Awaitable[T]) -> T:
+    """Await an upstream call, recording it as a span on the current trace"""
+    trace = _current_trace.get()
+    if trace is None:
+        return await awaitable
+    started = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        trace.record(name, started, time.perf_counter())
+
+
+class TracingMiddleware:
+    """Traces every HTTP request and adds its Server-Timing header.
+
+    Plain ASGI rather than ``@app.middleware("http")``, whose
+    BaseHTTPMiddleware runs each request in an extra task and copies the
+    response body through a stream.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = RouteTrace(scope["path"])
+
+        async def send_with_timing(message: Message):
+            if message["type"] == "http.response.start":
+                route = scope.get("route")
+                if route is not None:
+                    trace.route = f"{scope['method']} {route.path}"
+                MutableHeaders(scope=message)["Server-Timing"] = trace.server_timing()
+            await send(message)
+
+        token = _current_trace.set(trace)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_trace.reset(token)
+            trace.log()
+
+
+def install_tracing(app: FastAPI):
+    """Add the middleware that traces every HTTP request"""
+    app.add_middleware(TracingMiddleware)
@@ -0,0 +1,127 @@
+"""
+Upstream Clients
+Pooled HTTP clients for the services behind the gateway
+"""
+
+from typing import Dict, Optional
+import os
+
+import httpx
+
+
+# Per-route timeouts. Scoring and speech work can take far longer than a
+# session lookup, so they get their own budgets instead of one global 30s.
+ROUTE_TIMEOUTS: Dict[str, httpx.Timeout] = {
+    "default": httpx.Timeout(10.0, connect=2.0),
+    "evaluate": httpx.Timeout(120.0, connect=2.0),
+    "synthesize": httpx.Timeout(60.0, connect=2.0),
+    "transcribe": httpx.Timeout(60.0, connect=2.0),
+    "health": httpx.Timeout(5.0, connect=2.0),
+}
+
+
+class UpstreamConfig:
+    """Connection pool settings for one upstream service"""
+
+    def __init__(self, base_url: str, max_connections: int = 100,
+                 max_keepalive_connections: int = 50,
+                 keepalive_expiry: float = 30.0, http2: bool = False):
+        self.base_url = base_url
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+
+    @classmethod
+    def from_env(cls, prefix: str, default_url: str) -> "UpstreamConfig":
+        """Read <PREFIX>_URL, <PREFIX>_MAX_CONNECTIONS, <PREFIX>_MAX_KEEPALIVE
+        and UPSTREAM_HTTP2 from the environment"""
+        return cls(
+            base_url=os.getenv(f"{prefix}_URL", default_url),
+            max_connections=int(os.getenv(f"{prefix}_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv(f"{prefix}_MAX_KEEPALIVE", "50")),
+            keepalive_expiry=float(os.getenv("UPSTREAM_KEEPALIVE_EXPIRY", "30")),
+            http2=os.getenv("UPSTREAM_HTTP2", "").lower() in ("1", "true", "yes"),
+        )
+
+
+class UpstreamClients:
+    """One tuned httpx.AsyncClient per upstream service.
+
+    Clients are opened by start() and closed by close(), which the gateway
+    calls from its lifespan handler.
+    """
+
+    def __init__(self, configs: Dict[str, UpstreamConfig]):
+        self.configs = configs
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._request_counts: Dict[str, int] = {name: 0 for name in configs}
+
+    async def start(self):
+        for name, config in self.configs.items():
+            self._clients[name] = self._build_client(name, config)
+
+    async def close(self):
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+    def client(self, name: str) -> httpx.AsyncClient:
+        client = self._clients.get(name)
+        if client is None:
+            raise RuntimeError(f"Upstream client '{name}' is not started")
+        return client
+
+    @property
+    def interview(self) -> httpx.AsyncClient:
+        return self.client("interview")
+
+    @property
+    def voice(self) -> httpx.AsyncClient:
+        return self.client("voice")
+
+    def base_url(self, name: str) -> str:
+        return self.configs[name].base_url
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        return {
+            name: {
+                "base_url": config.base_url,
+                "max_connections": config.max_connections,
+                "http2": self._http2_enabled(config),
+                "requests": self._request_counts[name],
+            }
+            for name, config in self.configs.items()
+        }
+
+    def _build_client(self, name: str, config: UpstreamConfig) -> httpx.AsyncClient:
+        async def count_request(request: httpx.Request):
+            self._request_counts[name] += 1
+
+        return httpx.AsyncClient(
+            base_url=config.base_url,
+            timeout=ROUTE_TIMEOUTS["default"],
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+            http2=self._http2_enabled(config),
+            event_hooks={"request": [count_request]},
+        )
+
+    @staticmethod
+    def _http2_enabled(config: UpstreamConfig) -> bool:
+        """HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 without it"""
+        if not config.http2:
+            return False
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+
+def route_timeout(route: str) -> httpx.Timeout:
+    """Timeout budget for a named route"""
+    return ROUTE_TIMEOUTS.get(route, ROUTE_TIMEOUTS["default"])
@@ -0,0 +1,136 @@
+"""
+WebSocket Audio Framing
+Collects binary audio frames for one utterance on the interview WebSocket.
+
+Audio travels as raw bytes in binary frames; JSON text frames carry only
+control messages:
+  {"type": "audio_start", "format": "wav"|"pcm"|"webm"|"ogg",
+   "sample_rate": 16000, "sample_width": 2, "channels": 1}
+  <binary frame>...
+  {"type": "audio_end"}
+
+With "stream": true on a pcm or wav utterance, frames are relayed to the
+voice service as they arrive and partial transcripts come back before
+audio_end. With "purpose": "calibration" the utterance is a recording of
+room noise used to calibrate the session instead of an answer.
+"""
+
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+import asyncio
+import json
+import os
+
+import websockets
+
+AUDIO_FORMATS = ("wav", "pcm", "webm", "ogg", "mp3")
+STREAMING_FORMATS = ("wav", "pcm")
+MAX_UTTERANCE_BYTES = int(os.getenv("WS_MAX_UTTERANCE_BYTES", str(10 * 1024 * 1024)))
+
+
+class UtteranceBuffer:
+    """Binary audio frames received for the utterance in progress"""
+
+    def __init__(self, max_bytes: int = MAX_UTTERANCE_BYTES):
+        self.max_bytes = max_bytes
+        self._chunks: List[bytes] = []
+        self._size = 0
+        self._params: Dict[str, str] = {"audio_format": "wav"}
+        self.stream: Optional["StreamingTranscription"] = None
+        self.calibration = False
+
+    @property
+    def params(self) -> Dict[str, str]:
+        return self._params
+
+    def wants_stream(self, message: dict) -> bool:
+        return (bool(message.get("stream")) and not self.calibration
+                and self._params["audio_format"] in STREAMING_FORMATS)
+
+    def start(self, message: dict):
+        """Begin a new utterance described by an audio_start message"""
+        self.reset()
+        audio_format = message.get("format", "wav")
+        self._params = {"audio_format": audio_format if audio_format in AUDIO_FORMATS else "wav"}
+        self.calibration = message.get("purpose") == "calibration"
+        for field in ("sample_rate", "sample_width", "channels", "language"):
+            if message.get(field) is not None:
+                self._params[field] = str(message[field])
+
+    def append(self, chunk: bytes):
+        if self._size + len(chunk) > self.max_bytes:
+            self.reset()
+            raise ValueError(f"Utterance exceeds {self.max_bytes} bytes")
+        self._chunks.append(chunk)
+        self._size += len(chunk)
+
+    def finish(self) -> Tuple[bytes, Dict[str, str]]:
+        """The whole utterance and its voice-service query parameters"""
+        audio = self._chunks[0] if len(self._chunks) == 1 else b"".join(self._chunks)
+        params = self._params
+        self.reset()
+        return audio, params
+
+    def reset(self):
+        self._chunks = []
+        self._size = 0
+        self._params = {"audio_format": "wav"}
+        self.calibration = False
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class StreamingTranscription:
+    """Relays one utterance to the voice service's /transcribe-stream endpoint.
+
+    Audio frames are forwarded as they arrive; partial and error messages
+    from the voice service are handed to ``on_message`` as they come back.
+    """
+
+    def __init__(self, voice_base_url: str, params: Dict[str, str],
+                 on_message: Callable[[dict], Awaitable[None]]):
+        ws_base = "ws" + voice_base_url[len("http"):] if voice_base_url.startswith("http") else voice_base_url
+        self.url = f"{ws_base.rstrip('/')}/transcribe-stream?{urlencode(params)}"
+        self.on_message = on_message
+        self._connection = None
+        self._reader: Optional[asyncio.Task] = None
+        self._final: Optional[asyncio.Future] = None
+
+    async def open(self):
+        self._connection = await websockets.connect(self.url, max_size=None)
+        self._final = asyncio.get_running_loop().create_future()
+        self._reader = asyncio.create_task(self._read())
+
+    async def send(self, chunk: bytes):
+        await self._connection.send(chunk)
+
+    async def finish(self, timeout: float) -> dict:
+        """Signal the end of audio and wait for the final transcript"""
+        try:
+            await self._connection.send(json.dumps({"type": "end"}))
+            return await asyncio.wait_for(asyncio.shield(self._final), timeout)
+        finally:
+            await self.close()
+
+    async def close(self):
+        if self._final is not None and not self._final.done():
+            self._final.cancel()
+        if self._reader is not None:
+            self._reader.cancel()
+        if self._connection is not None:
+            await self._connection.close()
+
+    async def _read(self):
+        try:
+            async for raw in self._connection:
+                message = json.loads(raw)
+                if message.get("type") == "final":
+                    self._final.set_result(message)
+                    return
+                await self.on_message(message)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            if not self._final.done():
+                self._final.set_exception(RuntimeError("Voice stream closed before the final transcript"))
@@ -14,6 +14,21 @@ API_GATEWAY_URL = "http://localhost:8000"
 WS_URL = "ws://localhost:8000"
 
 
+async def receive_message(websocket):
+    """Receive the next JSON message, plus its audio if it announces any.
+    
+    Messages with ``audio_bytes`` (e.g. questions) are followed by one
+    binary frame holding the WAV; any other binary frame is skipped.
+    """
+    while True:
+        frame = await websocket.recv()
+        if isinstance(frame, bytes):
+            continue
+        message = json.loads(frame)
+        audio = await websocket.recv() if message.get("audio_bytes") else None
+        return message, audio
+
+
 async def voice_interview_example():
     """Example of voice-based interview flow"""
     
@@ -43,8 +58,8 @@ async def voice_interview_example():
         
         async with websockets.connect(f"{WS_URL}/ws/{session_id}") as websocket:
             # Receive welcome message
-            welcome = await websocket.recv()
-            print(f"Received: {json.loads(welcome)}")
+            welcome, _ = await receive_message(websocket)
+            print(f"Received: {welcome}")
             
             # Example: Send audio (in real app, this would be from microphone)
             # For demo, we'll use text commands
@@ -60,8 +75,10 @@ async def voice_interview_example():
             }))
             
             # Receive response
-            response = await websocket.recv()
-            print(f"\nResponse: {json.loads(response)}")
+            response, audio = await receive_message(websocket)
+            print(f"\nResponse: {response}")
+            if audio:
+                print(f"Question audio: {len(audio)} bytes of {response['audio_format']}")
             
             # End interview
             print("\nEnding interview...")
@@ -70,8 +87,7 @@ async def voice_interview_example():
                 "command": "end_interview"
             }))
             
-            final_response = await websocket.recv()
-            report = json.loads(final_response)
+            report, _ = await receive_message(websocket)
             print(f"\nFinal Report: {json.dumps(report, indent=2)}")
 
 
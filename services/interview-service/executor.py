@@ -0,0 +1,103 @@
+"""
+Evaluation Executor
+Runs CPU-bound scoring and report generation off the event loop
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict
+import asyncio
+import functools
+import os
+
+from services.shared.pools import AdmissionGate
+
+
+class ExecutorBusyError(Exception):
+    """Raised when the executor's pending-job limit has been reached"""
+
+
+class EvaluationExecutor:
+    """Bounded worker pool for heavy session work.
+
+    At most ``max_workers`` jobs run at once. Up to ``max_pending`` more may
+    wait for a slot; beyond that ``run`` raises ExecutorBusyError so callers
+    can shed load instead of queueing without limit.
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 32):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="evaluation"
+        )
+        self._slots = asyncio.Semaphore(max_workers)
+        self._gate = AdmissionGate(
+            max_workers + max_pending, ExecutorBusyError, "Evaluation queue is full, retry shortly"
+        )
+        self.completed = 0
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run func(*args, **kwargs) in the pool and await its result"""
+        with self._gate.admit():
+            async with self._slots:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(
+                    self._pool, functools.partial(func, *args, **kwargs)
+                )
+            self.completed += 1
+            return result
+
+    def stats(self) -> Dict[str, int]:
+        """Current load figures for health reporting"""
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_flight": self._gate.pending,
+            "completed": self.completed,
+            "rejected": self._gate.rejected,
+        }
+
+    def shutdown(self):
+        """Stop accepting work and wait for running jobs"""
+        self._pool.shutdown(wait=True)
+
+
+class SessionLocks:
+    """One asyncio lock per session id.
+
+    Session work runs on executor threads, so two requests for the same
+    session could otherwise mutate it at once, or save over each other's
+    changes. Handlers hold the session's lock from load to save. A lock is
+    dropped once no request holds or awaits it.
+    """
+
+    def __init__(self):
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._users: Dict[str, int] = {}
+
+    @asynccontextmanager
+    async def hold(self, session_id: str) -> AsyncIterator[None]:
+        lock = self._locks.get(session_id)
+        if lock is None:
+            lock = self._locks[session_id] = asyncio.Lock()
+        self._users[session_id] = self._users.get(session_id, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._users[session_id] -= 1
+            if not self._users[session_id]:
+                del self._users[session_id]
+                del self._locks[session_id]
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+
+def executor_from_env() -> EvaluationExecutor:
+    """Build the executor from INTERVIEW_EXECUTOR_* environment variables"""
+    return EvaluationExecutor(
+        max_workers=int(os.getenv("INTERVIEW_EXECUTOR_WORKERS", "4")),
+        max_pending=int(os.getenv("INTERVIEW_EXECUTOR_MAX_PENDING", "32")),
+    )
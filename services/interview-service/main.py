@@ -4,9 +4,13 @@ Core interview logic with REST API
 Handles session management, question generation, and evaluation
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Dict, Optional
+from fastapi.responses import JSONResponse, StreamingResponse
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Optional, TypeVar
+import asyncio
+import json
 import uuid
 import sys
 import os
@@ -15,6 +19,7 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
 
 from session import InterviewSession
+from agents.evaluation_cache import evaluation_cache
 from services.shared.models import (
     SessionCreate,
     SessionStatus,
@@ -26,9 +31,52 @@ from services.shared.models import (
     InterviewResponse,
     FinalReportRequest,
     FinalReportResponse,
+    NoiseProfile,
+    SessionStatsResponse,
 )
+from executor import ExecutorBusyError, SessionLocks, executor_from_env
+from session_store import KeyValueSessionStore, SessionConflictError, store_from_env
 
-app = FastAPI(title="Interview Service", version="1.0.0")
+T = TypeVar("T")
+
+# Worker pool for evaluation and report generation, so a long
+# evaluate-all never blocks cheap endpoints on the event loop
+executor = executor_from_env()
+
+# Serializes requests for the same session from load to save
+session_locks = SessionLocks()
+
+# Session storage; set SESSION_STORE=redis to share sessions across workers
+sessions = store_from_env()
+SWEEP_INTERVAL_SECONDS = float(os.getenv("SESSION_SWEEP_INTERVAL", "60"))
+
+# Set EVALUATION_CACHE_SHARED=1 with a redis/sqlite store to share
+# evaluation results across workers through the store's backend
+if isinstance(sessions, KeyValueSessionStore) and \
+        os.getenv("EVALUATION_CACHE_SHARED", "").lower() in ("1", "true", "yes"):
+    evaluation_cache.backend = sessions.backend
+
+
+async def sweep_sessions():
+    """Periodically expire idle sessions"""
+    while True:
+        await asyncio.sleep(SWEEP_INTERVAL_SECONDS)
+        try:
+            await store_call(sessions.sweep)
+            await asyncio.to_thread(sessions.sweep_files)
+        except Exception as e:
+            print(f"Warning: session sweep failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    sweeper = asyncio.create_task(sweep_sessions())
+    yield
+    sweeper.cancel()
+    executor.shutdown()
+
+
+app = FastAPI(title="Interview Service", version="1.0.0", lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -39,8 +87,41 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory session storage (use Redis in production)
-sessions: Dict[str, InterviewSession] = {}
+
+@app.exception_handler(ExecutorBusyError)
+async def executor_busy_handler(request: Request, exc: ExecutorBusyError):
+    """Shed load when the evaluation queue is full"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(SessionConflictError)
+async def session_conflict_handler(request: Request, exc: SessionConflictError):
+    """Another worker saved the session while this request was using it"""
+    return JSONResponse(
+        status_code=409,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+
+async def store_call(func: Callable[..., T], *args) -> T:
+    """Call a session store method; key-value stores do network or disk I/O
+    and JSON (de)serialization, so their calls run on a worker thread"""
+    if sessions.blocking:
+        return await asyncio.to_thread(func, *args)
+    return func(*args)
+
+
+async def load_session(session_id: str) -> InterviewSession:
+    """Fetch a session from the store or raise 404"""
+    session = await store_call(sessions.get, session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return session
 
 
 @app.post("/sessions", response_model=InterviewResponse)
@@ -55,7 +136,7 @@ async def create_session(session_data: SessionCreate):
         interview_type=session_data.interview_type.value
     )
     
-    sessions[session_id] = session
+    await store_call(sessions.save, session_id, session)
     
     return InterviewResponse(
         session_id=session_id,
@@ -69,192 +150,283 @@ async def create_session(session_data: SessionCreate):
 @app.get("/sessions/{session_id}", response_model=InterviewResponse)
 async def get_session_status(session_id: str):
     """Get session status"""
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    session = sessions[session_id]
+    session = await load_session(session_id)
     
     return InterviewResponse(
         session_id=session_id,
         status=SessionStatus.ACTIVE if session.session_active else SessionStatus.COMPLETED,
         question_count=session.question_count,
         answer_count=len(session.all_scores),
-        current_question=session.current_question if session.session_active else None
+        current_question=session.current_question if session.session_active else None,
+        noise_profile=session.noise_profile
     )
 
 
+@app.get("/sessions/{session_id}/stats", response_model=SessionStatsResponse)
+async def get_session_stats(session_id: str):
+    """Live statistics for the answers evaluated so far, from the session's running aggregate"""
+    async with session_locks.hold(session_id):
+        session = await load_session(session_id)
+        
+        return SessionStatsResponse(session_id=session_id, **session.get_stats())
+
+
+@app.put("/sessions/{session_id}/noise-profile")
+async def set_noise_profile(session_id: str, profile: NoiseProfile):
+    """Store the candidate's microphone calibration with the session"""
+    async with session_locks.hold(session_id):
+        session = await load_session(session_id)
+        session.noise_profile = profile.model_dump()
+        await store_call(sessions.save, session_id, session)
+        
+        return {"message": "Noise profile saved"}
+
+
 @app.post("/sessions/{session_id}/start", response_model=QuestionResponse)
 async def start_interview(session_id: str):
     """Start the interview and get first question"""
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    session = sessions[session_id]
-    question = session.start_interview()
-    
-    return QuestionResponse(
-        session_id=session_id,
-        question=question,
-        question_number=session.question_count,
-        question_type=session.current_question_type,
-        followup_needed=False
-    )
+    async with session_locks.hold(session_id):
+        session = await load_session(session_id)
+        question = session.start_interview()
+        await store_call(sessions.save, session_id, session)
+        
+        return QuestionResponse(
+            session_id=session_id,
+            question=question,
+            question_number=session.question_count,
+            question_type=session.current_question_type,
+            followup_needed=False
+        )
 
 
 @app.post("/sessions/{session_id}/next-question", response_model=QuestionResponse)
 async def get_next_question(session_id: str):
     """Get the next interview question"""
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    session = sessions[session_id]
-    
-    if not session.session_active:
-        raise HTTPException(status_code=400, detail="Session is not active")
-    
-    question = session.get_next_question()
-    
-    if not question:
-        raise HTTPException(status_code=400, detail="No more questions available")
-    
-    return QuestionResponse(
-        session_id=session_id,
-        question=question,
-        question_number=session.question_count,
-        question_type=session.current_question_type,
-        followup_needed=False
-    )
+    async with session_locks.hold(session_id):
+        session = await load_session(session_id)
+        
+        if not session.session_active:
+            raise HTTPException(status_code=400, detail="Session is not active")
+        
+        question = session.get_next_question()
+        
+        if not question:
+            raise HTTPException(status_code=400, detail="No more questions available")
+        
+        await store_call(sessions.save, session_id, session)
+        
+        return QuestionResponse(
+            session_id=session_id,
+            question=question,
+            question_number=session.question_count,
+            question_type=session.current_question_type,
+            followup_needed=False
+        )
 
 
 @app.post("/sessions/{session_id}/submit-answer", response_model=EvaluationResponse)
 async def submit_answer(session_id: str, answer_data: AnswerSubmission, collect_mode: bool = True):
     """Submit an answer (collect mode: just store, evaluate mode: evaluate immediately)"""
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    session = sessions[session_id]
-    
-    if not session.session_active:
-        raise HTTPException(status_code=400, detail="Session is not active")
-    
-    if collect_mode:
-        # Just collect the answer, don't evaluate yet
-        # Store in a temporary structure
-        if not hasattr(session, 'collected_answers'):
-            session.collected_answers = []
-        
-        session.collected_answers.append({
-            'question': answer_data.question,
-            'answer': answer_data.answer,
-            'question_type': answer_data.question_type or session.current_question_type
-        })
+    async with session_locks.hold(session_id):
+        session = await load_session(session_id)
         
-        return EvaluationResponse(
-            session_id=session_id,
-            question=answer_data.question,
-            answer=answer_data.answer,
-            scores={},
-            feedback={},
-            followup_question=None
-        )
-    else:
-        # Evaluate immediately (legacy mode)
-        result = session.process_answer(answer_data.answer)
+        if not session.session_active:
+            raise HTTPException(status_code=400, detail="Session is not active")
         
-        return EvaluationResponse(
-            session_id=session_id,
-            question=result.get('question', answer_data.question),
-            answer=result.get('answer', answer_data.answer),
-            scores=result.get('scores', {}),
-            feedback=result.get('feedback', {}),
-            followup_question=result.get('followup_question')
-        )
+        if collect_mode:
+            # Just collect the answer, don't evaluate yet
+            # Store in a temporary structure
+            if not hasattr(session, 'collected_answers'):
+                session.collected_answers = []
+            
+            session.collected_answers.append({
+                'question': answer_data.question or session.current_question,
+                'answer': answer_data.answer,
+                'question_type': answer_data.question_type or session.current_question_type
+            })
+            await store_call(sessions.save, session_id, session)
+            
+            return EvaluationResponse(
+                session_id=session_id,
+                question=answer_data.question or session.current_question,
+                answer=answer_data.answer,
+                scores={},
+                feedback={},
+                followup_question=None
+            )
+        else:
+            # Evaluate immediately (legacy mode)
+            result = await executor.run(session.process_answer, answer_data.answer)
+            await store_call(sessions.save, session_id, session)
+            
+            return EvaluationResponse(
+                session_id=session_id,
+                question=result.get('question', answer_data.question),
+                answer=result.get('answer', answer_data.answer),
+                scores=result.get('scores', {}),
+                feedback=result.get('feedback', {}),
+                followup_question=result.get('followup_question')
+            )
 
 
 @app.post("/sessions/{session_id}/evaluate-all", response_model=Dict)
 async def evaluate_all_answers(session_id: str):
     """Evaluate all collected answers and generate feedback"""
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    session = sessions[session_id]
+    async with session_locks.hold(session_id):
+        session = await load_session(session_id)
+        
+        if not hasattr(session, 'collected_answers') or not session.collected_answers:
+            raise HTTPException(status_code=400, detail="No answers collected to evaluate")
+        
+        # Score all collected answers in one batch
+        evaluations = await executor.run(session.evaluate_answers, list(session.collected_answers))
+        await store_call(sessions.save, session_id, session)
+        
+        return {
+            'session_id': session_id,
+            'evaluations': evaluations,
+            'total_evaluated': len(evaluations)
+        }
+
+
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+
+def encode_event(event: Dict[str, Any], format: str) -> str:
+    """One streamed event as an NDJSON line or a Server-Sent Event"""
+    data = json.dumps(event)
+    if format == "sse":
+        return f"event: {event['type']}\ndata: {data}\n\n"
+    return data + "\n"
+
+
+@app.post("/sessions/{session_id}/evaluate-all/stream")
+async def evaluate_all_answers_stream(session_id: str, format: str = "ndjson"):
+    """Evaluate all collected answers, streaming each evaluation as soon as
+    it is scored (format=ndjson or format=sse)"""
+    if format not in STREAM_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'sse'")
     
-    if not hasattr(session, 'collected_answers') or not session.collected_answers:
-        raise HTTPException(status_code=400, detail="No answers collected to evaluate")
+    async with session_locks.hold(session_id):
+        session = await load_session(session_id)
+        
+        if not hasattr(session, 'collected_answers') or not session.collected_answers:
+            raise HTTPException(status_code=400, detail="No answers collected to evaluate")
+        
+        # Score the first answer before responding, so a full queue is still a 503
+        first = await executor.run(session.evaluate_answers, session.collected_answers[:1])
+        await store_call(sessions.save, session_id, session)
     
-    # Process all collected answers
-    evaluations = []
-    for qa_pair in session.collected_answers:
-        result = session.process_answer(qa_pair['answer'])
-        evaluations.append({
-            'question': qa_pair['question'],
-            'answer': qa_pair['answer'],
-            'scores': result.get('scores', {}),
-            'feedback': result.get('feedback', {})
-        })
+    async def events():
+        for evaluation in first:
+            yield encode_event({"type": "evaluation", "index": 0, **evaluation}, format)
+        index = len(first)
+        error = None
+        
+        # Hold the session for the rest of the stream; reload it, since other
+        # requests may have changed it since the first answer was saved
+        async with session_locks.hold(session_id):
+            session = await store_call(sessions.get, session_id)
+            if session is None:
+                yield encode_event({"type": "error", "detail": "Session not found",
+                                    "total_evaluated": index}, format)
+                return
+            
+            qa_pairs = list(session.collected_answers)
+            try:
+                while index < len(qa_pairs):
+                    evaluated = await executor.run(
+                        session.evaluate_answers, qa_pairs[index:index + 1], index
+                    )
+                    for evaluation in evaluated:
+                        yield encode_event({"type": "evaluation", "index": index, **evaluation}, format)
+                        index += 1
+            except ExecutorBusyError as e:
+                error = str(e)
+            finally:
+                # Keep whatever was scored, even if the client went away
+                try:
+                    await store_call(sessions.save, session_id, session)
+                except SessionConflictError as e:
+                    error = str(e)
+        
+        if error is not None:
+            yield encode_event({"type": "error", "detail": error, "total_evaluated": index}, format)
+        else:
+            yield encode_event({
+                "type": "done",
+                "session_id": session_id,
+                "total_evaluated": index,
+            }, format)
     
-    return {
-        'session_id': session_id,
-        'evaluations': evaluations,
-        'total_evaluated': len(evaluations)
-    }
+    return StreamingResponse(
+        events(),
+        media_type=STREAM_MEDIA_TYPES[format],
+        headers={"Cache-Control": "no-cache"},
+    )
 
 
 @app.post("/sessions/{session_id}/end", response_model=FinalReportResponse)
 async def end_interview(session_id: str):
-    """End interview and generate final report"""
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    session = sessions[session_id]
-    
-    # Evaluate any remaining collected answers
-    if hasattr(session, 'collected_answers') and session.collected_answers:
-        for qa_pair in session.collected_answers:
-            session.process_answer(qa_pair['answer'])
-    
-    result = session.end_interview()
-    
-    if 'error' in result:
-        raise HTTPException(status_code=400, detail=result['error'])
-    
-    report_text = result.get('final_report', '')
-    summary = result.get('session_summary', {})
-    
-    # Parse report to extract structured data
-    # For now, return basic structure
-    avg_scores = session.evaluator.get_average_scores() if session.all_scores else {}
-    
-    return FinalReportResponse(
-        session_id=session_id,
-        average_score=avg_scores.get('overall', 0.0),
-        detailed_scores=avg_scores,
-        key_strengths=[],  # Would parse from report_text
-        key_improvements=[],  # Would parse from report_text
-        recommended_topics=[],  # Would parse from report_text
-        next_focus="",  # Would parse from report_text
-        total_questions=summary.get('total_questions', 0),
-        total_answers=summary.get('total_answers', 0)
-    )
+    """End interview and generate final report.
+    Ending an ended session returns its stored report."""
+    async with session_locks.hold(session_id):
+        session = await load_session(session_id)
+        
+        result = session.final_result
+        if result is None:
+            # Evaluate any collected answers not yet scored; ones already scored by
+            # /evaluate-all are returned from the session's ledger
+            if hasattr(session, 'collected_answers') and session.collected_answers:
+                await executor.run(session.evaluate_answers, list(session.collected_answers))
+            
+            result = await executor.run(session.end_interview)
+            
+            if 'error' in result:
+                raise HTTPException(status_code=400, detail=result['error'])
+            
+            await store_call(sessions.save, session_id, session)
+        
+        report = result['report']
+        summary = result.get('session_summary', {})
+        
+        return FinalReportResponse(
+            session_id=session_id,
+            average_score=report.get('average_score', 0.0),
+            detailed_scores=report.get('detailed_scores', {}),
+            key_strengths=report.get('key_strengths', []),
+            key_improvements=report.get('key_improvements', []),
+            recommended_topics=report.get('recommended_topics', []),
+            next_focus=report.get('next_focus', ''),
+            total_questions=summary.get('total_questions', 0),
+            total_answers=summary.get('total_answers', 0)
+        )
 
 
 @app.delete("/sessions/{session_id}")
 async def delete_session(session_id: str):
     """Delete a session"""
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    del sessions[session_id]
-    return {"message": "Session deleted"}
+    async with session_locks.hold(session_id):
+        if not await store_call(sessions.delete, session_id):
+            raise HTTPException(status_code=404, detail="Session not found")
+        
+        return {"message": "Session deleted"}
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
+    store_stats = await store_call(sessions.stats)
     return {
         "status": "healthy",
         "service": "interview-service",
-        "active_sessions": len(sessions)
+        "active_sessions": store_stats["live_sessions"],
+        "session_store": store_stats,
+        "executor": executor.stats(),
+        "evaluation_cache": evaluation_cache.stats()
     }
 
 
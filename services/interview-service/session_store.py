@@ -0,0 +1,529 @@
+"""
+Session Store
+Pluggable storage for interview sessions.
+
+InMemorySessionStore keeps live InterviewSession objects in this process.
+KeyValueSessionStore keeps compact serialized session state in a key-value
+backend (Redis in production, SQLite as a local stand-in), so any worker
+on any node can serve any session. Its saves are compare-and-set, so a
+request never overwrites changes another worker saved after it loaded.
+Its calls block on I/O, so the service runs them on worker threads.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, Optional, Tuple
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from session import InterviewSession, SCORE_DIMENSIONS
+
+
+class SessionConflictError(Exception):
+    """The stored session changed after this copy was loaded"""
+
+
+class SessionStore:
+    """Interface for session storage backends.
+
+    ``blocking`` stores do I/O on every call; callers on an event loop
+    should run their methods on a worker thread.
+    """
+
+    blocking = False
+
+    def get(self, session_id: str) -> Optional[InterviewSession]:
+        """Load a session, or None if it does not exist"""
+        raise NotImplementedError
+
+    def save(self, session_id: str, session: InterviewSession):
+        """Persist a session after it has been created or changed.
+        Raises SessionConflictError if another request saved it first."""
+        raise NotImplementedError
+
+    def delete(self, session_id: str) -> bool:
+        """Remove a session; returns False if it did not exist"""
+        raise NotImplementedError
+
+    def sweep(self) -> int:
+        """Drop expired sessions; returns how many were removed"""
+        return 0
+
+    def sweep_files(self) -> int:
+        """Delete stale files the store keeps on disk; returns how many.
+        Touches no in-memory state, so it may run on a worker thread."""
+        return 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Figures for the health endpoint, including ``live_sessions``"""
+        return {"live_sessions": len(self)}
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+
+def estimate_session_bytes(session: InterviewSession) -> int:
+    """Rough memory footprint of a live session.
+    Sample answers are shared string constants, so they are not counted."""
+    size = 1024  # Session, interviewer and container overhead
+    size += len(session.resume) + len(session.job_description)
+    size += 64 * len(session.profile.technologies)
+    size += len(session.current_question) + len(session.current_answer)
+    size += 64 * len(session.interviewer.questions_asked)
+    size += 8 * len(SCORE_DIMENSIONS) * len(session.all_scores)
+    size += 512 + 80 * (len(session.aggregate.strengths) + len(session.aggregate.improvements))
+    size += 160 * len(session.ledger)
+    for qa_pair in session.collected_answers:
+        size += 300 + len(qa_pair.get('question', '')) + len(qa_pair.get('answer', ''))
+    for feedback in session.all_feedback:
+        size += 400 + 80 * (len(feedback.get('strengths', [])) + len(feedback.get('improvements', [])))
+    return size
+
+
+class InMemorySessionStore(SessionStore):
+    """Keeps live session objects in this process; single-process only.
+
+    Sessions idle for longer than ``ttl_seconds`` are removed by sweep().
+    Once ``max_sessions`` or ``max_bytes`` is exceeded, the least recently
+    used sessions are evicted. If ``spill_dir`` is set, completed sessions
+    are written there instead of being dropped, and reloaded on next access.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None,
+                 max_sessions: Optional[int] = None,
+                 max_bytes: Optional[int] = None,
+                 spill_dir: Optional[str] = None,
+                 spill_ttl_seconds: float = 24 * 3600):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.spill_ttl_seconds = spill_ttl_seconds
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+        # Least recently used first
+        self._sessions: "OrderedDict[str, InterviewSession]" = OrderedDict()
+        self._last_access: Dict[str, float] = {}
+        self._sizes: Dict[str, int] = {}
+        self._bytes = 0
+
+        self.evictions = 0
+        self.expirations = 0
+        self.spilled = 0
+
+    def get(self, session_id: str) -> Optional[InterviewSession]:
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._load_spilled(session_id)
+            if session is None:
+                return None
+            self._insert(session_id, session)
+            self._enforce_limits(keep=session_id)
+            return session
+
+        self._sessions.move_to_end(session_id)
+        self._last_access[session_id] = time.monotonic()
+        return session
+
+    def save(self, session_id: str, session: InterviewSession):
+        self._insert(session_id, session)
+        self._enforce_limits(keep=session_id)
+
+    def delete(self, session_id: str) -> bool:
+        found = self._remove(session_id) is not None
+        spill_path = self._spill_path(session_id)
+        if spill_path and os.path.exists(spill_path):
+            os.unlink(spill_path)
+            found = True
+        return found
+
+    def sweep(self) -> int:
+        """Expire idle sessions (stale spill files are left to sweep_files)"""
+        removed = 0
+        if self.ttl_seconds is not None:
+            cutoff = time.monotonic() - self.ttl_seconds
+            expired = [sid for sid, seen in self._last_access.items() if seen < cutoff]
+            for session_id in expired:
+                self._evict(session_id)
+                self.expirations += 1
+                removed += 1
+        return removed
+
+    def sweep_files(self) -> int:
+        """Delete spill files older than spill_ttl_seconds"""
+        if not self.spill_dir:
+            return 0
+        removed = 0
+        cutoff = time.time() - self.spill_ttl_seconds
+        for name in os.listdir(self.spill_dir):
+            path = os.path.join(self.spill_dir, name)
+            try:
+                if name.endswith(".json") and os.path.getmtime(path) < cutoff:
+                    os.unlink(path)
+                    removed += 1
+            except FileNotFoundError:
+                pass  # Reloaded or deleted meanwhile
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "live_sessions": len(self._sessions),
+            "estimated_bytes": self._bytes,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "spilled": self.spilled,
+        }
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        if session_id in self._sessions:
+            return True
+        spill_path = self._spill_path(session_id)
+        return bool(spill_path) and os.path.exists(spill_path)
+
+    def _insert(self, session_id: str, session: InterviewSession):
+        size = estimate_session_bytes(session)
+        self._bytes += size - self._sizes.get(session_id, 0)
+        self._sizes[session_id] = size
+        self._sessions[session_id] = session
+        self._sessions.move_to_end(session_id)
+        self._last_access[session_id] = time.monotonic()
+
+    def _remove(self, session_id: str) -> Optional[InterviewSession]:
+        session = self._sessions.pop(session_id, None)
+        if session is not None:
+            self._bytes -= self._sizes.pop(session_id, 0)
+            self._last_access.pop(session_id, None)
+        return session
+
+    def _over_limits(self) -> bool:
+        if self.max_sessions is not None and len(self._sessions) > self.max_sessions:
+            return True
+        return self.max_bytes is not None and self._bytes > self.max_bytes
+
+    def _enforce_limits(self, keep: str):
+        while self._over_limits():
+            session_id = next(iter(self._sessions))
+            if session_id == keep:
+                break
+            self._evict(session_id)
+            self.evictions += 1
+
+    def _evict(self, session_id: str):
+        """Remove a session from memory, spilling it to disk if completed"""
+        session = self._remove(session_id)
+        if session is not None and self.spill_dir and not session.session_active:
+            with open(self._spill_path(session_id), "w") as f:
+                json.dump(session.to_state(), f, separators=(",", ":"))
+            self.spilled += 1
+
+    def _spill_path(self, session_id: str) -> Optional[str]:
+        if not self.spill_dir:
+            return None
+        # Session ids are UUIDs; keep only safe characters for the file name
+        safe_id = "".join(c for c in session_id if c.isalnum() or c == "-")
+        return os.path.join(self.spill_dir, f"{safe_id}.json")
+
+    def _load_spilled(self, session_id: str) -> Optional[InterviewSession]:
+        spill_path = self._spill_path(session_id)
+        if not spill_path or not os.path.exists(spill_path):
+            return None
+        with open(spill_path) as f:
+            state = json.load(f)
+        os.unlink(spill_path)
+        return InterviewSession.from_state(state)
+
+
+class KeyValueBackend:
+    """Minimal bytes key-value interface used by KeyValueSessionStore.
+
+    ``get_versioned`` / ``set_versioned`` track a version per key (0 for a
+    missing key); ``set_versioned`` only writes if the version still
+    matches and returns the new one, or None if another writer got there
+    first.
+    """
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl_seconds: Optional[float] = None):
+        """Write a key; ``ttl_seconds`` overrides the backend's default expiry"""
+        raise NotImplementedError
+
+    def get_versioned(self, key: str) -> Tuple[Optional[bytes], int]:
+        raise NotImplementedError
+
+    def set_versioned(self, key: str, value: bytes, version: int) -> Optional[int]:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def keys(self, prefix: str) -> Iterator[str]:
+        raise NotImplementedError
+
+    def count(self, prefix: str) -> int:
+        """Number of live keys under prefix"""
+        return sum(1 for _ in self.keys(prefix))
+
+    def sweep(self) -> int:
+        """Drop expired keys where the backend has no native expiry"""
+        return 0
+
+
+class RedisBackend(KeyValueBackend):
+    """Redis-backed storage (requires the optional redis package)"""
+
+    def __init__(self, url: str, ttl_seconds: Optional[int] = None):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("The redis package is required for SESSION_STORE=redis (pip install redis)")
+        self._client = redis.Redis.from_url(url)
+        self._watch_error = redis.WatchError
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: Optional[float] = None):
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        self._client.set(key, value, ex=int(ttl) if ttl is not None else None)
+
+    def get_versioned(self, key: str) -> Tuple[Optional[bytes], int]:
+        value, version = self._client.mget(key, self._version_key(key))
+        return value, int(version or 0)
+
+    def set_versioned(self, key: str, value: bytes, version: int) -> Optional[int]:
+        version_key = self._version_key(key)
+        expires_at = time.time() + self.ttl_seconds if self.ttl_seconds is not None else float("inf")
+        with self._client.pipeline() as pipe:
+            try:
+                pipe.watch(version_key)
+                if int(pipe.get(version_key) or 0) != version:
+                    pipe.unwatch()
+                    return None
+                pipe.multi()
+                pipe.set(key, value, ex=self.ttl_seconds)
+                pipe.set(version_key, version + 1, ex=self.ttl_seconds)
+                pipe.zadd(self._index_key(key), {key: expires_at})
+                pipe.execute()
+            except self._watch_error:
+                return None
+        return version + 1
+
+    def delete(self, key: str) -> bool:
+        with self._client.pipeline() as pipe:
+            pipe.delete(key, self._version_key(key))
+            pipe.zrem(self._index_key(key), key)
+            deleted, _ = pipe.execute()
+        return deleted > 0
+
+    def keys(self, prefix: str) -> Iterator[str]:
+        for key in self._client.scan_iter(match=f"{prefix}*"):
+            yield key.decode("utf-8")
+
+    def count(self, prefix: str) -> int:
+        """Keys written with set_versioned, counted from the prefix's expiry
+        index rather than a keyspace scan (prefixes end with ':')"""
+        index_key = "index:" + prefix
+        with self._client.pipeline() as pipe:
+            pipe.zremrangebyscore(index_key, "-inf", time.time())
+            pipe.zcard(index_key)
+            _, count = pipe.execute()
+        return count
+
+    @staticmethod
+    def _version_key(key: str) -> str:
+        # Kept under its own prefix so keys(prefix) never lists it
+        return "version:" + key
+
+    @staticmethod
+    def _index_key(key: str) -> str:
+        # Versioned keys by expiry, one sorted set per "name:" prefix
+        return "index:" + key[:key.find(":") + 1]
+
+
+class SQLiteBackend(KeyValueBackend):
+    """SQLite-backed storage; a local, offline stand-in for Redis.
+
+    Like Redis keys, rows written with a ``ttl_seconds`` expire that long
+    after their last write: reads treat them as missing and sweep()
+    deletes them.
+    """
+
+    def __init__(self, path: str = ":memory:", ttl_seconds: Optional[float] = None):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.ttl_seconds = ttl_seconds
+        if path != ":memory:":
+            # Let several worker processes read while one writes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                "version INTEGER NOT NULL DEFAULT 0, expires_at REAL)"
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(kv)")}
+            if "version" not in columns:
+                self._conn.execute("ALTER TABLE kv ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+            if "expires_at" not in columns:
+                self._conn.execute("ALTER TABLE kv ADD COLUMN expires_at REAL")
+
+    def _expires_at(self, ttl_seconds: Optional[float] = None) -> Optional[float]:
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        return time.time() + ttl if ttl is not None else None
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM kv WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: bytes, ttl_seconds: Optional[float] = None):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, self._expires_at(ttl_seconds)),
+            )
+
+    def get_versioned(self, key: str) -> Tuple[Optional[bytes], int]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, version FROM kv WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time()),
+            ).fetchone()
+        return (row[0], row[1]) if row else (None, 0)
+
+    def set_versioned(self, key: str, value: bytes, version: int) -> Optional[int]:
+        now = time.time()
+        with self._lock, self._conn:
+            if version == 0:
+                # An expired row reads as missing, so it must not block a create
+                self._conn.execute(
+                    "DELETE FROM kv WHERE key = ? AND expires_at <= ?", (key, now)
+                )
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO kv (key, value, version, expires_at) VALUES (?, ?, 1, ?)",
+                    (key, value, self._expires_at()),
+                )
+            else:
+                cursor = self._conn.execute(
+                    "UPDATE kv SET value = ?, version = version + 1, expires_at = ? "
+                    "WHERE key = ? AND version = ? AND (expires_at IS NULL OR expires_at > ?)",
+                    (value, self._expires_at(), key, version, now),
+                )
+        return version + 1 if cursor.rowcount == 1 else None
+
+    def delete(self, key: str) -> bool:
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM kv WHERE key = ?", (key,))
+        return cursor.rowcount > 0
+
+    def keys(self, prefix: str) -> Iterator[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM kv WHERE key >= ? AND key < ? "
+                "AND (expires_at IS NULL OR expires_at > ?)",
+                (prefix, prefix + "\uffff", time.time()),
+            ).fetchall()
+        return iter([row[0] for row in rows])
+
+    def count(self, prefix: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM kv WHERE key >= ? AND key < ? "
+                "AND (expires_at IS NULL OR expires_at > ?)",
+                (prefix, prefix + "\uffff", time.time()),
+            ).fetchone()
+        return row[0]
+
+    def sweep(self) -> int:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM kv WHERE expires_at <= ?", (time.time(),)
+            )
+        return cursor.rowcount
+
+
+class KeyValueSessionStore(SessionStore):
+    """Stores compact JSON session state in a key-value backend"""
+
+    blocking = True
+
+    def __init__(self, backend: KeyValueBackend, prefix: str = "session:"):
+        self.backend = backend
+        self.prefix = prefix
+
+    def get(self, session_id: str) -> Optional[InterviewSession]:
+        data, version = self.backend.get_versioned(self.prefix + session_id)
+        if data is None:
+            return None
+        session = InterviewSession.from_state(json.loads(data))
+        session.store_version = version
+        return session
+
+    def save(self, session_id: str, session: InterviewSession):
+        data = json.dumps(session.to_state(), separators=(",", ":"))
+        version = self.backend.set_versioned(
+            self.prefix + session_id, data.encode("utf-8"), session.store_version
+        )
+        if version is None:
+            raise SessionConflictError("Session was changed by another request, retry shortly")
+        session.store_version = version
+
+    def delete(self, session_id: str) -> bool:
+        return self.backend.delete(self.prefix + session_id)
+
+    def __len__(self) -> int:
+        return self.backend.count(self.prefix)
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.backend.get(self.prefix + session_id) is not None
+
+    def sweep(self) -> int:
+        return self.backend.sweep()
+
+
+def store_from_env() -> SessionStore:
+    """Build the session store from SESSION_STORE* environment variables.
+
+    SESSION_STORE=memory (default) | redis | sqlite
+    SESSION_STORE_URL   Redis URL, e.g. redis://localhost:6379/0
+    SESSION_STORE_PATH  SQLite database file
+    SESSION_TTL_SECONDS Idle expiry for every store (default 7200; empty disables)
+    SESSION_MAX_COUNT   In-memory LRU cap on live sessions
+    SESSION_MAX_BYTES   In-memory LRU cap on estimated session memory
+    SESSION_SPILL_DIR   Directory for completed sessions evicted from memory
+    """
+    kind = os.getenv("SESSION_STORE", "memory").lower()
+    # Abandoned browser tabs never call DELETE, so expire idle sessions by default
+    ttl = os.getenv("SESSION_TTL_SECONDS", "7200")
+    if kind == "redis":
+        return KeyValueSessionStore(RedisBackend(
+            os.getenv("SESSION_STORE_URL", "redis://localhost:6379/0"),
+            ttl_seconds=int(float(ttl)) if ttl else None,
+        ))
+    if kind == "sqlite":
+        return KeyValueSessionStore(SQLiteBackend(
+            os.getenv("SESSION_STORE_PATH", "sessions.db"),
+            ttl_seconds=float(ttl) if ttl else None,
+        ))
+    max_count = os.getenv("SESSION_MAX_COUNT")
+    max_bytes = os.getenv("SESSION_MAX_BYTES")
+    return InMemorySessionStore(
+        ttl_seconds=float(ttl) if ttl else None,
+        max_sessions=int(max_count) if max_count else None,
+        max_bytes=int(max_bytes) if max_bytes else None,
+        spill_dir=os.getenv("SESSION_SPILL_DIR") or None,
+    )
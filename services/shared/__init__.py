@@ -11,11 +11,15 @@ from .models import (
     EvaluationResponse,
     SessionCreate,
     SessionStatus,
+    SessionStatsResponse,
+    NoiseProfile,
     VoiceTranscriptionRequest,
     VoiceTranscriptionResponse,
     VoiceSynthesisRequest,
     VoiceSynthesisResponse,
 )
+from utils.lru import LRUCache
+from .pools import AdmissionGate, ProcessWorkerPool
 
 __all__ = [
     'InterviewRequest',
@@ -26,9 +30,14 @@ __all__ = [
     'EvaluationResponse',
     'SessionCreate',
     'SessionStatus',
+    'SessionStatsResponse',
+    'NoiseProfile',
     'VoiceTranscriptionRequest',
     'VoiceTranscriptionResponse',
     'VoiceSynthesisRequest',
     'VoiceSynthesisResponse',
+    'LRUCache',
+    'AdmissionGate',
+    'ProcessWorkerPool',
 ]
 
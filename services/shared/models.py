@@ -43,7 +43,7 @@ class QuestionResponse(BaseModel):
 
 class AnswerSubmission(BaseModel):
     session_id: str
-    question: str
+    question: str = ""  # Empty means the session's current question
     answer: str
     question_type: Optional[str] = None
 
@@ -62,12 +62,18 @@ class EvaluationResponse(BaseModel):
     followup_question: Optional[str] = None
 
 
+class NoiseProfile(BaseModel):
+    noise_rms: float  # RMS energy of the candidate's background noise
+    energy_threshold: float  # Energy above which audio counts as speech
+
+
 class InterviewResponse(BaseModel):
     session_id: str
     status: SessionStatus
     question_count: int
     answer_count: int
     current_question: Optional[str] = None
+    noise_profile: Optional[NoiseProfile] = None
 
 
 # Voice Service Models
@@ -75,12 +81,14 @@ class VoiceTranscriptionRequest(BaseModel):
     audio_data: str  # Base64 encoded audio string
     audio_format: str = "wav"  # wav, mp3, etc.
     language: Optional[str] = None  # Auto-detect if None
+    noise_profile: Optional[NoiseProfile] = None  # Session calibration to reuse
 
 
 class VoiceTranscriptionResponse(BaseModel):
     text: str
     confidence: float
     language: Optional[str] = None
+    noise_profile: Optional[NoiseProfile] = None  # Set when this request calibrated
 
 
 class VoiceSynthesisRequest(BaseModel):
@@ -91,7 +99,7 @@ class VoiceSynthesisRequest(BaseModel):
 
 
 class VoiceSynthesisResponse(BaseModel):
-    audio_data: bytes  # Base64 encoded audio
+    audio_data: str  # Base64 encoded audio
     audio_format: str = "wav"
     duration: float  # seconds
 
@@ -107,6 +115,20 @@ class PDFParseResponse(BaseModel):
     file_name: str
 
 
+class SessionStatsResponse(BaseModel):
+    """Running statistics for the answers evaluated so far"""
+    session_id: str
+    question_count: int
+    answer_count: int
+    session_active: bool
+    average_score: float
+    averages: Dict[str, float]
+    minimums: Dict[str, float]
+    maximums: Dict[str, float]
+    top_strengths: List[str]
+    top_improvements: List[str]
+
+
 # Final Report Models
 class FinalReportRequest(BaseModel):
     session_id: str
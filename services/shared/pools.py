@@ -0,0 +1,90 @@
+"""
+Worker Pools
+Building blocks for the services' bounded worker pools: an admission gate
+that sheds load past a queue-depth limit, and a pool of spawned worker
+processes that is rebuilt when one of them dies
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, Type
+import asyncio
+import functools
+import multiprocessing
+
+
+class AdmissionGate:
+    """Caps the jobs in flight, running or waiting, at ``limit``.
+
+    Past the limit ``admit`` raises ``error(message)``, so callers shed
+    load instead of queueing without bound. Jobs enter and leave on the
+    event loop thread, so the counters need no lock.
+    """
+
+    def __init__(self, limit: int, error: Type[Exception], message: str):
+        self.limit = limit
+        self.error = error
+        self.message = message
+        self.pending = 0
+        self.rejected = 0
+
+    @contextmanager
+    def admit(self) -> Iterator[None]:
+        if self.pending >= self.limit:
+            self.rejected += 1
+            raise self.error(self.message)
+        self.pending += 1
+        try:
+            yield
+        finally:
+            self.pending -= 1
+
+
+class ProcessWorkerPool:
+    """Spawned worker processes, each set up once by ``initializer``.
+
+    A crashed worker takes the whole ProcessPoolExecutor down with it, so
+    the pool is rebuilt and the job that hit the crash raises RuntimeError.
+    """
+
+    def __init__(self, workers: int, initializer: Callable[[], None], name: str):
+        self.workers = workers
+        self.initializer = initializer
+        self.name = name
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.restarts = 0
+
+    def start(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=self.initializer,
+            )
+
+    def shutdown(self):
+        """Stop the workers, cancelling jobs that have not started"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    async def submit(self, func: Callable[..., Any], *args) -> Any:
+        """Run func(*args) in a worker process and await its result"""
+        self.start()
+        pool = self._pool
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(pool, functools.partial(func, *args))
+        except BrokenProcessPool:
+            self._restart(pool)
+            raise RuntimeError(f"{self.name} worker exited unexpectedly")
+
+    def _restart(self, broken: ProcessPoolExecutor):
+        # Concurrent jobs all see the same broken pool; replace it only once
+        if self._pool is not broken:
+            return
+        self._pool = None
+        broken.shutdown(wait=False, cancel_futures=True)
+        self.restarts += 1
+        self.start()
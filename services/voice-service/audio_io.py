@@ -0,0 +1,244 @@
+"""
+Audio I/O
+Decodes uploaded audio in memory. PCM WAV is parsed straight from the
+request bytes; AIFF and FLAC go to SpeechRecognition's decoders, and
+compressed containers (webm, ogg, mp3) straight to ffmpeg.
+"""
+
+from typing import Optional, Tuple
+import audioop
+import io
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+
+import speech_recognition as sr
+
+CHUNK_FRAMES = 4096  # Same buffer size sr.AudioFile reads with
+
+# Formats sr.AudioFile decodes; anything else goes straight to ffmpeg
+AUDIO_FILE_FORMATS = frozenset(("wav", "wave", "aif", "aiff", "aifc", "flac"))
+
+_PCM = 0x0001
+_EXTENSIBLE = 0xFFFE
+
+
+class WavInfo:
+    """Format and frame data of a PCM WAV held in memory"""
+
+    __slots__ = ("channels", "sample_rate", "sample_width", "frames")
+
+    def __init__(self, channels: int, sample_rate: int, sample_width: int, frames: memoryview):
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.frames = frames
+
+    @property
+    def duration(self) -> float:
+        frame_size = self.channels * self.sample_width
+        return len(self.frames) / float(frame_size * self.sample_rate)
+
+
+def parse_wav(data) -> Optional[WavInfo]:
+    """Parse a RIFF/WAVE PCM file without copying its sample data.
+
+    Returns None if the data is not a PCM WAV this parser understands.
+    """
+    view = memoryview(data)
+    if len(view) < 12 or view[0:4] != b"RIFF" or view[8:12] != b"WAVE":
+        return None
+
+    fmt = None
+    pos = 12
+    while pos + 8 <= len(view):
+        chunk_id = view[pos:pos + 4].tobytes()
+        (size,) = struct.unpack_from("<I", view, pos + 4)
+        body = pos + 8
+
+        if chunk_id == b"fmt " and size >= 16:
+            fmt = struct.unpack_from("<HHIIHH", view, body)
+            if fmt[0] == _EXTENSIBLE and size >= 26:
+                # The real format code is the first field of the SubFormat GUID
+                (subformat,) = struct.unpack_from("<H", view, body + 24)
+                fmt = (subformat,) + fmt[1:]
+        elif chunk_id == b"data":
+            if fmt is None:
+                return None
+            audio_format, channels, sample_rate, _, block_align, bits = fmt
+            sample_width = bits // 8
+            if (audio_format != _PCM or not 1 <= channels <= 2 or sample_rate <= 0
+                    or not 1 <= sample_width <= 4 or block_align != channels * sample_width):
+                return None
+            # Streaming recorders often leave the size as 0 or 0xFFFFFFFF
+            end = len(view) if size in (0, 0xFFFFFFFF) else min(body + size, len(view))
+            end -= (end - body) % block_align
+            return WavInfo(channels, sample_rate, sample_width, view[body:end])
+
+        pos = body + size + (size & 1)
+
+    return None
+
+
+def wav_to_audio_data(info: WavInfo) -> sr.AudioData:
+    """Build an AudioData the way sr.AudioFile would, mixing stereo to mono"""
+    frames = info.frames
+    if info.channels == 2:
+        return sr.AudioData(audioop.tomono(frames, info.sample_width, 1, 1),
+                            info.sample_rate, info.sample_width)
+    return sr.AudioData(frames.tobytes(), info.sample_rate, info.sample_width)
+
+
+def pcm_to_audio_data(data, sample_rate: int = 16000, sample_width: int = 2,
+                      channels: int = 1) -> sr.AudioData:
+    """Wrap headerless little-endian PCM, as streamed over the WebSocket"""
+    if not 1 <= channels <= 2 or not 1 <= sample_width <= 4 or sample_rate <= 0:
+        raise ValueError("PCM must be mono or stereo with 1-4 byte samples")
+    frames = memoryview(data)
+    frame_size = channels * sample_width
+    frames = frames[:len(frames) - len(frames) % frame_size]
+    return wav_to_audio_data(WavInfo(channels, sample_rate, sample_width, frames))
+
+
+def load_audio(data: bytes, audio_format: str = "wav") -> sr.AudioData:
+    """Decode uploaded audio into AudioData, touching disk only as a last resort"""
+    info = parse_wav(data)
+    if info is not None:
+        return wav_to_audio_data(info)
+
+    audio_format = (audio_format or "wav").lower()
+    if audio_format in AUDIO_FILE_FORMATS:
+        # AIFF, FLAC and WAV variants the fast parser skips
+        try:
+            with sr.AudioFile(io.BytesIO(data)) as source:
+                return sr.Recognizer().record(source)
+        except (ValueError, EOFError, OSError):
+            pass
+
+    # Compressed formats (webm, ogg, mp3) need ffmpeg
+    wav = _transcode_with_ffmpeg(data, audio_format)
+    info = parse_wav(wav) if wav else None
+    if info is None:
+        raise ValueError("Audio could not be read as PCM WAV, AIFF or FLAC")
+    return wav_to_audio_data(info)
+
+
+def _ffmpeg_command(ffmpeg: str, source: str):
+    return [ffmpeg, "-hide_banner", "-loglevel", "error", "-i", source,
+            "-f", "wav", "-acodec", "pcm_s16le", "-ac", "1", "-"]
+
+
+def _transcode_with_ffmpeg(data: bytes, audio_format: str) -> Optional[bytes]:
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        return None
+
+    # Streamable containers are decoded from a pipe
+    result = subprocess.run(_ffmpeg_command(ffmpeg, "pipe:0"), input=data, capture_output=True)
+    if result.returncode == 0 and result.stdout:
+        return result.stdout
+
+    # Containers that need seeking (e.g. mp4 with a trailing index) need a real file
+    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{audio_format}") as tmp_file:
+        tmp_file.write(data)
+        tmp_file_path = tmp_file.name
+    try:
+        result = subprocess.run(_ffmpeg_command(ffmpeg, tmp_file_path), capture_output=True)
+        return result.stdout if result.returncode == 0 else None
+    finally:
+        os.unlink(tmp_file_path)
+
+
+def measure_noise(audio: sr.AudioData, duration: float = 0.5, energy_threshold: float = 300.0,
+                  dynamic_energy_ratio: float = 1.5, damping: float = 0.15) -> Tuple[float, float]:
+    """Noise floor and speech threshold from the leading ``duration`` seconds.
+
+    Uses the same asymmetric average as Recognizer.adjust_for_ambient_noise,
+    but returns (noise_rms, energy_threshold) instead of mutating a
+    recognizer, so concurrent requests cannot disturb each other.
+    """
+    width = audio.sample_width
+    chunk_bytes = CHUNK_FRAMES * width
+    seconds_per_buffer = CHUNK_FRAMES / float(audio.sample_rate)
+    frames = memoryview(audio.frame_data)
+
+    energies = []
+    pos = 0
+    elapsed = seconds_per_buffer
+    while elapsed <= max(duration, seconds_per_buffer) and pos < len(frames):
+        buffer = frames[pos:pos + chunk_bytes]
+        energy = audioop.rms(buffer, width)
+        energies.append(energy)
+        buffer_damping = damping ** seconds_per_buffer
+        energy_threshold = energy_threshold * buffer_damping + energy * dynamic_energy_ratio * (1 - buffer_damping)
+        pos += len(buffer)
+        elapsed += seconds_per_buffer
+
+    noise_rms = sum(energies) / len(energies) if energies else 0.0
+    return float(noise_rms), float(energy_threshold)
+
+
+def trim_silence(audio: sr.AudioData, energy_threshold: float, frame_ms: int = 30,
+                 padding_ms: int = 300) -> sr.AudioData:
+    """Drop leading and trailing audio below the speech threshold, keeping some padding.
+
+    Audio with no frame above the threshold is returned unchanged, so a
+    miscalibrated threshold never turns an answer into silence.
+    """
+    width = audio.sample_width
+    frame_bytes = audio.sample_rate * frame_ms // 1000 * width
+    frames = memoryview(audio.frame_data)
+    if frame_bytes <= 0 or len(frames) <= frame_bytes:
+        return audio
+
+    loud = [start for start in range(0, len(frames), frame_bytes)
+            if audioop.rms(frames[start:start + frame_bytes], width) > energy_threshold]
+    if not loud:
+        return audio
+
+    padding = audio.sample_rate * padding_ms // 1000 * width
+    start = max(0, loud[0] - padding)
+    end = min(len(frames), loud[-1] + frame_bytes + padding)
+    if start == 0 and end == len(frames):
+        return audio
+    return sr.AudioData(frames[start:end].tobytes(), audio.sample_rate, width)
+
+
+class PCMStream:
+    """Turns streamed wav or pcm chunks into mono PCM for the segment cutter.
+
+    A wav stream's header is read from its first chunk; the header must
+    arrive whole in that chunk.
+    """
+
+    def __init__(self, audio_format: str = "pcm", sample_rate: int = 16000,
+                 sample_width: int = 2, channels: int = 1):
+        if audio_format not in ("pcm", "wav"):
+            raise ValueError("Streaming supports pcm and wav audio")
+        self.audio_format = audio_format
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.channels = channels
+        self._header_read = audio_format == "pcm"
+        self._pending = b""
+
+    def feed(self, chunk: bytes) -> bytes:
+        if not self._header_read:
+            info = parse_wav(chunk)
+            if info is None:
+                raise ValueError("First chunk of a wav stream must hold a PCM WAV header")
+            self.sample_rate = info.sample_rate
+            self.sample_width = info.sample_width
+            self.channels = info.channels
+            self._header_read = True
+            chunk = info.frames.tobytes()
+
+        if self.channels == 1:
+            return chunk
+        data = self._pending + chunk
+        frame_size = self.channels * self.sample_width
+        usable = len(data) - len(data) % frame_size
+        self._pending = data[usable:]
+        return audioop.tomono(data[:usable], self.sample_width, 1, 1)
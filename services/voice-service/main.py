@@ -1,121 +1,184 @@
 """
 Voice Service
 Handles speech-to-text and text-to-speech
-Uses SpeechRecognition as primary STT (can be extended with Whisper later)
+STT runs on a pluggable backend: local Whisper or Vosk offline, Google Web Speech,
+or a deterministic stub for tests
 """
 
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, Request, UploadFile, File, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response
+from contextlib import asynccontextmanager
+from typing import Optional
 import speech_recognition as sr
-import pyttsx3
+import asyncio
 import io
 import base64
-import tempfile
+import json
 import os
 import sys
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
 
 from services.shared.models import (
+    NoiseProfile,
     VoiceTranscriptionRequest,
     VoiceTranscriptionResponse,
     VoiceSynthesisRequest,
     VoiceSynthesisResponse,
 )
+from audio_io import PCMStream, load_audio, measure_noise, parse_wav, pcm_to_audio_data, trim_silence
+from tts_cache import TTSCache, cache_from_env
+from tts_workers import TTSQueueFullError, TTSUnavailableError, pool_from_env
+from stt_backends import STTBusyError, STTUnavailableError, stt_pool_from_env
+from vad import SegmentCutter
 
-app = FastAPI(title="Voice Service", version="1.0.0")
+# Rendered question audio, keyed by (text, voice, speed, pitch)
+tts_cache = cache_from_env()
 
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Worker processes that own the TTS engines
+tts_pool = pool_from_env()
+
+# Warm speech-to-text engines (offline Whisper/Vosk where configured)
+stt_pool = stt_pool_from_env()
 
-# Initialize recognizer and TTS engine
-recognizer = None
-tts_engine = None
+# Pause before retrying a streamed segment the STT queue turned away
+SEGMENT_RETRY_DELAY = float(os.getenv("STT_SEGMENT_RETRY_DELAY", "0.5"))
 
 
-def get_recognizer():
-    """Initialize speech recognizer"""
-    global recognizer
-    if recognizer is None:
-        recognizer = sr.Recognizer()
-    return recognizer
+async def prewarm_tts_cache():
+    """Render the interviewer's static question bank into the TTS cache"""
+    try:
+        from agents.interviewer import static_question_bank
+    except ImportError:
+        print("Warning: question bank not available, skipping TTS pre-warm")
+        return
 
+    if not await tts_pool.probe():
+        print("Warning: TTS engine not available, skipping TTS pre-warm")
+        return
 
-def get_tts_engine():
-    """Initialize TTS engine"""
-    global tts_engine
-    if tts_engine is None:
+    for text in static_question_bank():
+        key = TTSCache.key(text, None, 1.0, 1.0)
+        if await asyncio.to_thread(tts_cache.__contains__, key):
+            continue
         try:
-            tts_engine = pyttsx3.init()
-            # Configure voice properties
-            voices = tts_engine.getProperty('voices')
-            if voices:
-                tts_engine.setProperty('voice', voices[0].id)
-            tts_engine.setProperty('rate', 150)  # Speed
-            tts_engine.setProperty('volume', 0.9)  # Volume
+            audio_data = await tts_pool.synthesize(text, None, 1.0)
         except Exception as e:
-            print(f"Warning: TTS initialization failed: {e}")
-            tts_engine = None
-    return tts_engine
+            print(f"Warning: TTS pre-warm stopped: {e}")
+            return
+        await asyncio.to_thread(tts_cache.put, key, audio_data)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tts_pool.start()
+    try:
+        # Load STT models before serving, so the first answer is not slow
+        await asyncio.to_thread(stt_pool.start)
+    except Exception as e:
+        print(f"Warning: STT backend failed to load, will retry on first request: {e}")
+    prewarm = asyncio.create_task(prewarm_tts_cache())
+    yield
+    prewarm.cancel()
+    await asyncio.to_thread(tts_pool.shutdown)
+    await asyncio.to_thread(stt_pool.shutdown)
 
 
+app = FastAPI(title="Voice Service", version="1.0.0", lifespan=lifespan)
+
+# CORS middleware
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
 @app.post("/transcribe", response_model=VoiceTranscriptionResponse)
 async def transcribe_audio(file: UploadFile = File(...), language: str = None):
     """
-    Transcribe audio to text using SpeechRecognition
+    Transcribe audio to text with the configured STT backend
     Accepts audio file upload (WAV format recommended)
+    Unintelligible audio gives empty text rather than an error
     """
     try:
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file.filename.split('.')[-1]}") as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_file_path = tmp_file.name
+        content = await file.read()
         
-        try:
-            # Load recognizer
-            r = get_recognizer()
-            
-            # Load audio file
-            with sr.AudioFile(tmp_file_path) as source:
-                audio = r.record(source)
-            
-            # Try Google Speech Recognition first (free, requires internet)
-            try:
-                text = r.recognize_google(audio, language=language if language else "en-US")
-                confidence = 0.8  # Google doesn't provide confidence, use default
-            except sr.UnknownValueError:
-                # Fallback to sphinx (offline, but less accurate)
-                try:
-                    text = r.recognize_sphinx(audio)
-                    confidence = 0.6
-                except:
-                    text = ""
-                    confidence = 0.0
-            
-            language_detected = language if language else "en-US"
-            
-            return VoiceTranscriptionResponse(
-                text=text,
-                confidence=confidence,
-                language=language_detected
-            )
-        finally:
-            # Clean up temp file
-            if os.path.exists(tmp_file_path):
-                os.unlink(tmp_file_path)
-                
+        # Decode the upload in memory
+        audio = load_audio(content, file.filename.split('.')[-1])
+        
+        language_detected = language if language else "en-US"
+        text, confidence = await stt_pool.transcribe(audio, language_detected)
+        
+        return VoiceTranscriptionResponse(
+            text=text,
+            confidence=confidence,
+            language=language_detected
+        )
+    
+    except STTBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Transcription error: {str(e)}")
 
 
+def decode_upload(audio_bytes: bytes, audio_format: str = "wav", sample_rate: int = 16000,
+                  sample_width: int = 2, channels: int = 1) -> sr.AudioData:
+    """Decode request audio in memory, as a 400 if it cannot be read"""
+    try:
+        if audio_format == "pcm":
+            return pcm_to_audio_data(audio_bytes, sample_rate, sample_width, channels)
+        return load_audio(audio_bytes, audio_format)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Audio file could not be read: {str(e)}. Please ensure the audio is in a supported format (WAV, WebM).")
+
+
+def profile_from_params(noise_rms: Optional[float], energy_threshold: Optional[float]) -> Optional[NoiseProfile]:
+    """The noise profile passed as query parameters, if any"""
+    if energy_threshold is None:
+        return None
+    return NoiseProfile(noise_rms=noise_rms or 0.0, energy_threshold=energy_threshold)
+
+
+async def transcribe_bytes(audio_bytes: bytes, audio_format: str = "wav", language: str = None,
+                           sample_rate: int = 16000, sample_width: int = 2, channels: int = 1,
+                           noise_profile: Optional[NoiseProfile] = None) -> VoiceTranscriptionResponse:
+    """Recognize speech in an in-memory recording with the STT pool.
+    
+    The session's noise profile is a per-request setting. Without one, the
+    profile is measured from this recording's first half second and
+    returned, so the caller can store it for the session's later answers.
+    """
+    audio = decode_upload(audio_bytes, audio_format, sample_rate, sample_width, channels)
+    
+    calibrated = None
+    if noise_profile is None:
+        noise_rms, energy_threshold = measure_noise(audio, duration=0.5)
+        noise_profile = calibrated = NoiseProfile(noise_rms=noise_rms, energy_threshold=energy_threshold)
+    audio = trim_silence(audio, noise_profile.energy_threshold)
+    
+    language_detected = language if language else "en-US"
+    try:
+        text, confidence = await stt_pool.transcribe(audio, language_detected)
+    except STTBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except STTUnavailableError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    if not text:
+        # Could not understand audio
+        raise HTTPException(status_code=400, detail="Speech Recognition could not understand audio. Please speak more clearly.")
+    
+    return VoiceTranscriptionResponse(
+        text=text,
+        confidence=confidence,
+        language=language_detected,
+        noise_profile=calibrated
+    )
+
+
 @app.post("/transcribe-base64", response_model=VoiceTranscriptionResponse)
 async def transcribe_audio_base64(request: VoiceTranscriptionRequest):
     """
@@ -132,48 +195,8 @@ async def transcribe_audio_base64(request: VoiceTranscriptionRequest):
         # Determine file extension based on format
         file_ext = request.audio_format if request.audio_format in ['wav', 'webm', 'mp3', 'ogg'] else 'wav'
         
-        # Save to temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_ext}") as tmp_file:
-            tmp_file.write(audio_bytes)
-            tmp_file_path = tmp_file.name
-        
-        try:
-            r = get_recognizer()
-            
-            # Try to load audio file
-            try:
-                with sr.AudioFile(tmp_file_path) as source:
-                    # Adjust for ambient noise
-                    r.adjust_for_ambient_noise(source, duration=0.5)
-                    audio = r.record(source)
-            except Exception as e:
-                # If AudioFile fails, try converting with pydub if available
-                raise HTTPException(status_code=400, detail=f"Audio file could not be read: {str(e)}. Please ensure the audio is in a supported format (WAV, WebM).")
-            
-            # Try Google Speech Recognition first
-            try:
-                text = r.recognize_google(audio, language=request.language if request.language else "en-US")
-                confidence = 0.8
-            except sr.UnknownValueError:
-                # Could not understand audio
-                text = ""
-                confidence = 0.0
-                raise HTTPException(status_code=400, detail="Speech Recognition could not understand audio. Please speak more clearly.")
-            except sr.RequestError as e:
-                # API error
-                raise HTTPException(status_code=500, detail=f"Could not request results from Google Speech Recognition service: {str(e)}")
-            
-            language_detected = request.language if request.language else "en-US"
-            
-            return VoiceTranscriptionResponse(
-                text=text,
-                confidence=confidence,
-                language=language_detected
-            )
-        finally:
-            # Clean up temp file
-            if os.path.exists(tmp_file_path):
-                os.unlink(tmp_file_path)
+        return await transcribe_bytes(audio_bytes, file_ext, request.language,
+                                      noise_profile=request.noise_profile)
                 
     except HTTPException:
         raise
@@ -181,79 +204,224 @@ async def transcribe_audio_base64(request: VoiceTranscriptionRequest):
         raise HTTPException(status_code=500, detail=f"Transcription error: {str(e)}")
 
 
-@app.post("/synthesize", response_model=VoiceSynthesisResponse)
-async def synthesize_speech(request: VoiceSynthesisRequest):
+@app.post("/transcribe-raw", response_model=VoiceTranscriptionResponse)
+async def transcribe_audio_raw(request: Request, audio_format: str = "wav", language: str = None,
+                               sample_rate: int = 16000, sample_width: int = 2, channels: int = 1,
+                               noise_rms: Optional[float] = None, energy_threshold: Optional[float] = None):
     """
-    Convert text to speech
-    Returns audio as base64 encoded WAV
+    Transcribe audio sent as the raw request body, without base64 or multipart
+    audio_format may be wav, webm, ogg, mp3 or pcm (headerless, described by
+    sample_rate / sample_width / channels)
+    noise_rms / energy_threshold carry the session's noise profile, if known
     """
     try:
-        engine = get_tts_engine()
-        
-        if engine is None:
-            raise HTTPException(status_code=503, detail="TTS engine not available")
-        
-        # Set voice properties
-        if request.voice_id:
-            voices = engine.getProperty('voices')
-            if voices and request.voice_id in [v.id for v in voices]:
-                engine.setProperty('voice', request.voice_id)
-        
-        engine.setProperty('rate', int(150 * request.speed))
-        
-        # Save to temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp_file:
-            tmp_file_path = tmp_file.name
-        
+        audio_bytes = await request.body()
+        if audio_format not in ['wav', 'webm', 'mp3', 'ogg', 'pcm']:
+            audio_format = 'wav'
+        return await transcribe_bytes(audio_bytes, audio_format, language, sample_rate, sample_width, channels,
+                                      profile_from_params(noise_rms, energy_threshold))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Transcription error: {str(e)}")
+
+
+@app.websocket("/transcribe-stream")
+async def transcribe_stream(websocket: WebSocket, audio_format: str = "pcm", language: str = None,
+                            sample_rate: int = 16000, sample_width: int = 2, channels: int = 1,
+                            noise_rms: Optional[float] = None, energy_threshold: Optional[float] = None):
+    """
+    Streaming transcription
+    Binary frames carry pcm (or wav, header first) audio as it is recorded.
+    Segments are cut at pauses and transcribed while later audio arrives;
+    each result is sent as a "partial" message in order. A {"type": "end"}
+    text frame flushes the last segment and returns the "final" transcript.
+    A segment turned away by a busy STT queue is retried once; if it still
+    fails, the final message has "complete": false so the transcript is not
+    taken for the whole answer.
+    A session noise profile seeds the speech threshold; without one, the
+    final message carries the profile measured from this stream.
+    """
+    await websocket.accept()
+    
+    try:
+        stream = PCMStream(audio_format, sample_rate, sample_width, channels)
+    except ValueError as e:
+        await websocket.send_json({"type": "error", "message": str(e)})
+        await websocket.close()
+        return
+    
+    cutter = None
+    segments: asyncio.Queue = asyncio.Queue()
+    texts = []
+    confidences = []
+    failed = []
+    
+    def schedule(pcm: bytes):
+        # Segments are recognized concurrently but reported in order
+        audio = sr.AudioData(pcm, stream.sample_rate, stream.sample_width)
+        segments.put_nowait((audio, asyncio.create_task(
+            stt_pool.transcribe(audio, language if language else "en-US")
+        )))
+    
+    async def recognize(audio: sr.AudioData, task: asyncio.Task):
         try:
-            # Generate speech
-            engine.save_to_file(request.text, tmp_file_path)
-            engine.runAndWait()
-            
-            # Read audio file
-            with open(tmp_file_path, 'rb') as f:
-                audio_data = f.read()
-            
-            # Estimate duration (rough calculation)
-            duration = len(audio_data) / 16000  # Assuming 16kHz sample rate
+            return await task
+        except STTBusyError:
+            await asyncio.sleep(SEGMENT_RETRY_DELAY)
+            return await stt_pool.transcribe(audio, language if language else "en-US")
+    
+    async def report_segments():
+        index = 0
+        while True:
+            item = await segments.get()
+            if item is None:
+                return
+            index += 1
+            try:
+                text, confidence = await recognize(*item)
+            except Exception as e:
+                failed.append(index - 1)
+                await websocket.send_json({"type": "error", "message": f"Transcription error: {str(e)}"})
+                continue
+            if text:
+                texts.append(text)
+                confidences.append(confidence)
+                await websocket.send_json({
+                    "type": "partial",
+                    "segment": len(texts) - 1,
+                    "text": text,
+                    "text_so_far": " ".join(texts)
+                })
+    
+    reporter = asyncio.create_task(report_segments())
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
             
-            # Encode to base64
-            audio_base64 = base64.b64encode(audio_data).decode('utf-8')
+            if message.get("bytes") is not None:
+                pcm = stream.feed(message["bytes"])
+                if cutter is None:
+                    cutter = SegmentCutter(stream.sample_rate, stream.sample_width,
+                                           energy_threshold=energy_threshold or 300.0)
+                for segment in cutter.feed(pcm):
+                    schedule(segment)
+                continue
             
-            return VoiceSynthesisResponse(
-                audio_data=audio_base64.encode('utf-8'),  # Return as bytes for model
-                audio_format="wav",
-                duration=duration
-            )
-        finally:
-            if os.path.exists(tmp_file_path):
-                os.unlink(tmp_file_path)
-                
+            if json.loads(message["text"]).get("type") == "end":
+                break
+        
+        if cutter is not None:
+            last = cutter.flush()
+            if last:
+                schedule(last)
+        segments.put_nowait(None)
+        await reporter
+        
+        await websocket.send_json({
+            "type": "final",
+            "text": " ".join(texts),
+            "confidence": sum(confidences) / len(confidences) if confidences else 0.0,
+            "segments": len(texts),
+            "complete": not failed,
+            "failed_segments": failed,
+            "language": language if language else "en-US",
+            "noise_profile": None if energy_threshold is not None or cutter is None else {
+                "noise_rms": cutter.noise_rms,
+                "energy_threshold": cutter.energy_threshold
+            }
+        })
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        await websocket.send_json({"type": "error", "message": f"Transcription error: {str(e)}"})
+        await websocket.close()
+    finally:
+        reporter.cancel()
+        while not segments.empty():
+            item = segments.get_nowait()
+            if item is not None:
+                item[1].cancel()
+
+
+@app.post("/calibrate", response_model=NoiseProfile)
+async def calibrate_noise(request: Request, audio_format: str = "wav", sample_rate: int = 16000,
+                          sample_width: int = 2, channels: int = 1):
+    """
+    Measure a noise profile from a recording of the candidate's room
+    (raw request body, formats as for /transcribe-raw)
+    """
+    audio = decode_upload(await request.body(), audio_format, sample_rate, sample_width, channels)
+    duration = len(audio.frame_data) / float(audio.sample_rate * audio.sample_width)
+    noise_rms, energy_threshold = measure_noise(audio, duration=duration)
+    return NoiseProfile(noise_rms=noise_rms, energy_threshold=energy_threshold)
+
+
+async def synthesize_cached(request: VoiceSynthesisRequest) -> bytes:
+    """Rendered WAV bytes for a request, from the cache or the TTS workers"""
+    try:
+        cache_key = TTSCache.key(request.text, request.voice_id, request.speed, request.pitch)
+        # Misses and disk hits do file I/O, so keep it off the event loop
+        audio_data = await asyncio.to_thread(tts_cache.get, cache_key)
+        
+        if audio_data is None:
+            audio_data = await tts_pool.synthesize(request.text, request.voice_id, request.speed)
+            await asyncio.to_thread(tts_cache.put, cache_key, audio_data)
+        return audio_data
+    except TTSUnavailableError:
+        raise HTTPException(status_code=503, detail="TTS engine not available")
+    except TTSQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Speech synthesis error: {str(e)}")
 
 
+def audio_duration(audio_data: bytes) -> float:
+    """Read the duration from the WAV header, or estimate it"""
+    wav = parse_wav(audio_data)
+    return wav.duration if wav else len(audio_data) / 16000
+
+
+@app.post("/synthesize", response_model=VoiceSynthesisResponse)
+async def synthesize_speech(request: VoiceSynthesisRequest):
+    """
+    Convert text to speech
+    Returns audio as base64 encoded WAV
+    """
+    audio_data = await synthesize_cached(request)
+    
+    return VoiceSynthesisResponse(
+        audio_data=base64.b64encode(audio_data).decode('ascii'),
+        audio_format="wav",
+        duration=audio_duration(audio_data)
+    )
+
+
+@app.post("/synthesize-raw")
+async def synthesize_speech_raw(request: VoiceSynthesisRequest):
+    """
+    Convert text to speech
+    Returns the WAV itself as the response body, with the duration in a header
+    """
+    audio_data = await synthesize_cached(request)
+    
+    return Response(
+        content=audio_data,
+        media_type="audio/wav",
+        headers={"X-Audio-Duration": f"{audio_duration(audio_data):.3f}"}
+    )
+
+
 @app.get("/voices")
 async def list_voices():
     """List available TTS voices"""
     try:
-        engine = get_tts_engine()
-        
-        if engine is None:
-            return {"voices": []}
-        
-        voices = engine.getProperty('voices')
-        
-        return {
-            "voices": [
-                {
-                    "id": voice.id,
-                    "name": voice.name,
-                    "languages": getattr(voice, 'languages', [])
-                }
-                for voice in voices
-            ] if voices else []
-        }
+        return {"voices": await tts_pool.list_voices()}
+    except TTSUnavailableError:
+        return {"voices": []}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error listing voices: {str(e)}")
 
@@ -264,8 +432,10 @@ async def health_check():
     return {
         "status": "healthy",
         "service": "voice-service",
-        "recognizer_loaded": recognizer is not None,
-        "tts_loaded": tts_engine is not None
+        "stt": stt_pool.stats(),
+        "tts_loaded": tts_pool.engine_available is True,
+        "tts_workers": tts_pool.stats(),
+        "tts_cache": tts_cache.stats()
     }
 
 
@@ -0,0 +1,406 @@
+"""
+STT Backends
+Pluggable speech-to-text engines behind one interface, run in a bounded
+pool of warm instances
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import audioop
+import json
+import os
+import queue
+import threading
+
+import speech_recognition as sr
+
+from services.shared.pools import AdmissionGate
+
+
+class STTBusyError(Exception):
+    """Raised when the transcription queue-depth limit has been reached"""
+
+
+class STTUnavailableError(Exception):
+    """Raised when the backend cannot produce a result (engine or network failure)"""
+
+
+def _language_code(language: str) -> str:
+    """'en-US' -> 'en', for engines that take bare language codes"""
+    return language.split("-")[0].lower() if language else "en"
+
+
+class STTBackend:
+    """Interface for a speech-to-text engine.
+
+    ``load`` does any expensive setup once, before the first request.
+    ``transcribe`` returns (text, confidence) and returns empty text when no
+    speech was recognized. ``shareable`` backends may serve several worker
+    threads from one instance; others get one instance per worker.
+    Backends that set ``supports_batching`` get whole micro-batches through
+    ``transcribe_batch``.
+    """
+
+    name = "base"
+    shareable = True
+    supports_batching = False
+
+    def load(self):
+        pass
+
+    def transcribe(self, audio: sr.AudioData, language: str) -> Tuple[str, float]:
+        raise NotImplementedError
+
+    def transcribe_batch(self, audios: List[sr.AudioData],
+                         languages: List[str]) -> List[Tuple[str, float]]:
+        return [self.transcribe(audio, language) for audio, language in zip(audios, languages)]
+
+
+class GoogleBackend(STTBackend):
+    """Google Web Speech API via SpeechRecognition (needs network)"""
+
+    name = "google"
+
+    def __init__(self):
+        self.recognizer = sr.Recognizer()
+
+    def transcribe(self, audio: sr.AudioData, language: str) -> Tuple[str, float]:
+        try:
+            # Google doesn't provide confidence, use default
+            return self.recognizer.recognize_google(audio, language=language), 0.8
+        except sr.UnknownValueError:
+            return "", 0.0
+        except sr.RequestError as e:
+            raise STTUnavailableError(f"Could not request results from Google Speech Recognition service: {str(e)}")
+
+
+class WhisperBackend(STTBackend):
+    """Local OpenAI Whisper on CPU (offline).
+
+    Whisper installs decoding hooks on the model while it runs, so each
+    worker keeps its own model instance. Batches of clips that fit one
+    30 s window are decoded in a single forward pass per language.
+    """
+
+    name = "whisper"
+    shareable = False
+    supports_batching = True
+
+    def __init__(self, model_name: str = "base"):
+        self.model_name = model_name
+        self.model = None
+
+    def load(self):
+        import whisper
+        self.model = whisper.load_model(self.model_name, device="cpu")
+
+    @staticmethod
+    def _samples(audio: sr.AudioData):
+        import numpy as np
+
+        pcm = audio.get_raw_data(convert_rate=16000, convert_width=2)
+        return np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+
+    def transcribe(self, audio: sr.AudioData, language: str) -> Tuple[str, float]:
+        return self._transcribe_samples(self._samples(audio), language)
+
+    def transcribe_batch(self, audios: List[sr.AudioData],
+                         languages: List[str]) -> List[Tuple[str, float]]:
+        import numpy as np
+        import torch
+        import whisper
+
+        results: List[Tuple[str, float]] = [("", 0.0)] * len(audios)
+        windows: Dict[str, List[Tuple[int, Any]]] = {}
+        for i, (audio, language) in enumerate(zip(audios, languages)):
+            samples = self._samples(audio)
+            if len(samples) > whisper.audio.N_SAMPLES:
+                # Longer than one window; needs the sliding-window transcribe
+                results[i] = self._transcribe_samples(samples, language)
+            else:
+                windows.setdefault(_language_code(language), []).append((i, samples))
+
+        for code, items in windows.items():
+            mel = torch.stack([
+                whisper.log_mel_spectrogram(whisper.pad_or_trim(samples), self.model.dims.n_mels)
+                for _, samples in items
+            ]).to(self.model.device)
+            try:
+                decoded = whisper.decode(self.model, mel, whisper.DecodingOptions(language=code, fp16=False))
+            except Exception as e:
+                raise STTUnavailableError(f"Whisper transcription failed: {str(e)}")
+            for (i, _), result in zip(items, decoded):
+                # Whisper's own no-speech rule
+                if result.no_speech_prob > 0.6 and result.avg_logprob < -1.0:
+                    continue
+                results[i] = (result.text.strip(), round(float(np.exp(result.avg_logprob)), 3))
+        return results
+
+    def _transcribe_samples(self, samples, language: str) -> Tuple[str, float]:
+        import numpy as np
+
+        try:
+            result = self.model.transcribe(samples, language=_language_code(language), fp16=False)
+        except Exception as e:
+            raise STTUnavailableError(f"Whisper transcription failed: {str(e)}")
+
+        segments = result.get("segments") or []
+        if not segments:
+            return result.get("text", "").strip(), 0.0
+        confidence = sum(float(np.exp(s["avg_logprob"])) for s in segments) / len(segments)
+        return result.get("text", "").strip(), round(confidence, 3)
+
+
+class VoskBackend(STTBackend):
+    """Local Vosk/Kaldi model (offline). The model is shared; recognizers are per call."""
+
+    name = "vosk"
+
+    def __init__(self, model_path: str):
+        self.model_path = model_path
+        self.model = None
+
+    def load(self):
+        from vosk import Model, SetLogLevel
+        SetLogLevel(-1)
+        self.model = Model(self.model_path)
+
+    def transcribe(self, audio: sr.AudioData, language: str) -> Tuple[str, float]:
+        from vosk import KaldiRecognizer
+
+        recognizer = KaldiRecognizer(self.model, 16000)
+        recognizer.SetWords(True)
+        recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=16000, convert_width=2))
+        result = json.loads(recognizer.FinalResult())
+
+        words = result.get("result") or []
+        if not words:
+            return result.get("text", ""), 0.0
+        return result.get("text", ""), round(sum(w["conf"] for w in words) / len(words), 3)
+
+
+class StubBackend(STTBackend):
+    """Deterministic backend for tests: fixed text for any audio with sound in it"""
+
+    name = "stub"
+    supports_batching = True  # Lets tests exercise the batching path
+
+    def __init__(self, text: str = "This is a stub transcription."):
+        self.text = text
+
+    def transcribe(self, audio: sr.AudioData, language: str) -> Tuple[str, float]:
+        if not audio.frame_data or audioop.max(audio.frame_data, audio.sample_width) == 0:
+            return "", 0.0
+        return self.text, 1.0
+
+
+def backend_factory_from_env() -> Callable[[], STTBackend]:
+    """Pick the backend from STT_BACKEND (auto, google, whisper, vosk, stub).
+
+    auto prefers an offline engine: Whisper if installed, then Vosk if
+    VOSK_MODEL_PATH is set, and only then Google.
+    """
+    choice = os.getenv("STT_BACKEND", "auto").lower()
+    model_path = os.getenv("VOSK_MODEL_PATH", "")
+
+    if choice == "auto":
+        try:
+            import whisper  # noqa: F401
+            choice = "whisper"
+        except ImportError:
+            choice = "vosk" if model_path else "google"
+
+    if choice == "whisper":
+        model_name = os.getenv("WHISPER_MODEL", "base")
+        return lambda: WhisperBackend(model_name)
+    if choice == "vosk":
+        if not model_path:
+            raise RuntimeError("STT_BACKEND=vosk needs VOSK_MODEL_PATH")
+        return lambda: VoskBackend(model_path)
+    if choice == "stub":
+        text = os.getenv("STT_STUB_TEXT", "This is a stub transcription.")
+        return lambda: StubBackend(text)
+    if choice == "google":
+        return GoogleBackend
+    raise RuntimeError(f"Unknown STT_BACKEND '{choice}'")
+
+
+class STTPool:
+    """Bounded pool of warm backend instances.
+
+    ``workers`` threads each borrow an instance per job; instances are
+    created and loaded once by ``start``. Up to ``max_pending`` more jobs
+    may wait; beyond that ``transcribe`` raises STTBusyError.
+
+    For backends that support batching, jobs are micro-batched: the first
+    waiting job opens a batch that closes after ``batch_wait_ms`` or at
+    ``batch_size`` jobs, and the whole batch runs as one backend call.
+    While every worker is busy, the next batch keeps filling.
+    """
+
+    def __init__(self, factory: Callable[[], STTBackend], workers: int = 2, max_pending: int = 16,
+                 batch_size: int = 8, batch_wait_ms: float = 25.0):
+        self.factory = factory
+        self.workers = workers
+        self.max_pending = max_pending
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = batch_wait_ms / 1000.0
+        self._batch_queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._batch_slots: Optional[asyncio.Semaphore] = None
+        self.batches = 0
+        self.batched_jobs = 0
+        self.backend_name = None
+        self.batching = False
+        self._instances: "queue.Queue[STTBackend]" = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stt")
+        # Batching backends serve batch_size jobs per worker; the limit grows once that is known
+        self._gate = AdmissionGate(
+            workers + max_pending, STTBusyError, "Transcription queue is full, retry shortly"
+        )
+        self._start_lock = threading.Lock()
+        self.loaded = False
+        self.completed = 0
+        self.failed = 0
+
+    def start(self):
+        """Create and load the backend instances (blocking; model loads can take a while)"""
+        with self._start_lock:
+            if not self.loaded:
+                self._load_instances()
+
+    def _load_instances(self):
+        first = self.factory()
+        first.load()
+        instances: List[STTBackend] = [first]
+        for _ in range(self.workers - 1):
+            if first.shareable:
+                instances.append(first)
+            else:
+                instance = self.factory()
+                instance.load()
+                instances.append(instance)
+        for instance in instances:
+            self._instances.put(instance)
+        self.backend_name = first.name
+        self.batching = first.supports_batching and self.batch_size > 1
+        self._gate.limit = self.workers * (self.batch_size if self.batching else 1) + self.max_pending
+        self.loaded = True
+
+    async def transcribe(self, audio: sr.AudioData, language: str = "en-US") -> Tuple[str, float]:
+        with self._gate.admit():
+            if not self.loaded:
+                await asyncio.to_thread(self.start)
+            try:
+                loop = asyncio.get_running_loop()
+                if self.batching:
+                    result = await self._enqueue(audio, language)
+                else:
+                    result = await loop.run_in_executor(self._executor, self._run, audio, language)
+                self.completed += 1
+                return result
+            except Exception:
+                self.failed += 1
+                raise
+
+    def _run(self, audio: sr.AudioData, language: str) -> Tuple[str, float]:
+        backend = self._instances.get()
+        try:
+            return backend.transcribe(audio, language)
+        finally:
+            self._instances.put(backend)
+
+    def _run_batch(self, audios: List[sr.AudioData], languages: List[str]) -> List[Tuple[str, float]]:
+        backend = self._instances.get()
+        try:
+            return backend.transcribe_batch(audios, languages)
+        finally:
+            self._instances.put(backend)
+
+    async def _enqueue(self, audio: sr.AudioData, language: str) -> Tuple[str, float]:
+        if self._batcher is None or self._batcher.done():
+            self._batch_queue = asyncio.Queue()
+            self._batch_slots = asyncio.Semaphore(self.workers)
+            self._batcher = asyncio.create_task(self._collect_batches())
+        future = asyncio.get_running_loop().create_future()
+        self._batch_queue.put_nowait((audio, language, future))
+        return await future
+
+    async def _collect_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._batch_queue.get()]
+            deadline = loop.time() + self.batch_wait
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._batch_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Wait for a free worker, topping the batch up with jobs that arrive meanwhile
+            await self._batch_slots.acquire()
+            while len(batch) < self.batch_size and not self._batch_queue.empty():
+                batch.append(self._batch_queue.get_nowait())
+            asyncio.create_task(self._dispatch(batch))
+
+    async def _dispatch(self, batch: list):
+        # Requests that gave up while waiting don't need decoding
+        batch = [job for job in batch if not job[2].done()]
+        try:
+            if not batch:
+                return
+            self.batches += 1
+            self.batched_jobs += len(batch)
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(
+                self._executor, self._run_batch,
+                [audio for audio, _, _ in batch], [language for _, language, _ in batch]
+            )
+            for (_, _, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._batch_slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Current load figures for health reporting"""
+        return {
+            "backend": self.backend_name,
+            "loaded": self.loaded,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "in_flight": self._gate.pending,
+            "completed": self.completed,
+            "rejected": self._gate.rejected,
+            "failed": self.failed,
+            "batching": self.batching,
+            "batch_size": self.batch_size,
+            "batch_wait_ms": self.batch_wait * 1000,
+            "batches": self.batches,
+            "mean_batch_size": round(self.batched_jobs / self.batches, 2) if self.batches else 0.0,
+        }
+
+    def shutdown(self):
+        if self._batcher is not None:
+            # May be called from a worker thread during lifespan shutdown
+            self._batcher.get_loop().call_soon_threadsafe(self._batcher.cancel)
+        self._executor.shutdown(wait=True)
+
+
+def stt_pool_from_env() -> STTPool:
+    """Build the pool from STT_* environment variables"""
+    return STTPool(
+        backend_factory_from_env(),
+        workers=int(os.getenv("STT_WORKERS", "2")),
+        max_pending=int(os.getenv("STT_MAX_PENDING", "16")),
+        batch_size=int(os.getenv("STT_BATCH_SIZE", "8")),
+        batch_wait_ms=float(os.getenv("STT_BATCH_WAIT_MS", "25")),
+    )
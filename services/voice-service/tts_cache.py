@@ -0,0 +1,170 @@
+"""
+TTS Cache
+Content-addressed cache of synthesized audio with a memory LRU tier and
+an on-disk tier
+"""
+
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from utils.lru import LRUCache
+
+
+class TTSCache:
+    """Caches rendered audio keyed by a hash of (text, voice_id, speed, pitch).
+
+    Lookups check the in-memory LRU first, then the disk directory; disk
+    hits are promoted back into memory. The disk tier is capped at
+    ``disk_max_bytes``: reads refresh a file's mtime, and once the cap is
+    passed the least recently used files are deleted down to 90% of it.
+    Safe to use from worker threads; ``get``, ``put`` and ``in`` touch
+    the disk, so callers on an event loop run them on one.
+    """
+
+    def __init__(self, max_items: int = 512, max_bytes: int = 64 * 1024 * 1024,
+                 disk_dir: Optional[str] = None, disk_max_bytes: int = 256 * 1024 * 1024):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+
+        self._memory = LRUCache(max_items, max_size=max_bytes)
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._disk_bytes = sum(size for _, size, _ in self._disk_files())
+
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(text: str, voice_id: Optional[str], speed: float, pitch: float) -> str:
+        payload = json.dumps([text, voice_id, float(speed), float(pitch)], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        audio = self._memory.get(key)
+        if audio is not None:
+            return audio
+
+        audio = self._read_disk(key)
+        if audio is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+        self._memory.put(key, audio)
+        return audio
+
+    def put(self, key: str, audio: bytes):
+        self._memory.put(key, audio)
+        self._write_disk(key, audio)
+
+    def __contains__(self, key: str) -> bool:
+        if key in self._memory:
+            return True
+        path = self._disk_path(key)
+        return bool(path) and os.path.exists(path)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "memory_items": len(self._memory),
+                "memory_bytes": self._memory.size,
+                "disk_bytes": self._disk_bytes,
+                "memory_hits": self._memory.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+            }
+
+    def _disk_path(self, key: str) -> Optional[str]:
+        if not self.disk_dir:
+            return None
+        return os.path.join(self.disk_dir, f"{key}.wav")
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        path = self._disk_path(key)
+        if not path:
+            return None
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+            # The mtime is the disk tier's recency
+            os.utime(path)
+            return audio
+        except FileNotFoundError:
+            return None
+
+    def _write_disk(self, key: str, audio: bytes):
+        path = self._disk_path(key)
+        if not path or len(audio) > self.disk_max_bytes:
+            return
+        # Write then rename, so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(audio)
+            try:
+                replaced = os.stat(path).st_size
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: could not write TTS cache file: {e}")
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return
+        with self._lock:
+            self._disk_bytes += len(audio) - replaced
+            over = self._disk_bytes > self.disk_max_bytes
+        if over:
+            self._evict_disk()
+
+    def _disk_files(self) -> List[Tuple[str, int, float]]:
+        """(path, size, mtime) of every cached file"""
+        files = []
+        with os.scandir(self.disk_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".wav"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((entry.path, stat.st_size, stat.st_mtime))
+        return files
+
+    def _evict_disk(self):
+        # Rescan rather than trust the running total: other worker
+        # processes may share the directory
+        files = sorted(self._disk_files(), key=lambda item: item[2])
+        total = sum(size for _, size, _ in files)
+        target = self.disk_max_bytes * 0.9
+        for path, size, _ in files:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        with self._lock:
+            self._disk_bytes = total
+
+
+def cache_from_env() -> TTSCache:
+    """Build the cache from TTS_CACHE_* environment variables"""
+    disk_dir = os.getenv("TTS_CACHE_DIR", os.path.join(tempfile.gettempdir(), "interview-tts-cache"))
+    return TTSCache(
+        max_items=int(os.getenv("TTS_CACHE_MAX_ITEMS", "512")),
+        max_bytes=int(os.getenv("TTS_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+        disk_dir=disk_dir or None,
+        disk_max_bytes=int(os.getenv("TTS_CACHE_DISK_MAX_BYTES", str(256 * 1024 * 1024))),
+    )
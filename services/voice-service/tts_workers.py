@@ -0,0 +1,177 @@
+"""
+TTS Workers
+Pool of worker processes, each owning its own pyttsx3 engine, so synthesis
+never blocks the event loop and concurrent jobs never share engine state
+"""
+
+from typing import Any, Dict, List, Optional
+import multiprocessing.util
+import os
+import tempfile
+
+from services.shared.pools import AdmissionGate, ProcessWorkerPool
+
+BASE_RATE = 150  # Words per minute at speed 1.0
+VOLUME = 0.9
+
+# pyttsx3 can only render to a file path, so render onto tmpfs when it exists
+SCRATCH_DIR = os.getenv("TTS_SCRATCH_DIR") or (
+    "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+)
+
+
+class TTSQueueFullError(Exception):
+    """Raised when the synthesis queue-depth limit has been reached"""
+
+
+class TTSUnavailableError(RuntimeError):
+    """Raised by a worker whose engine could not be initialized"""
+
+
+# Per-process engine, created by _init_worker in each worker
+_engine = None
+_default_voice: Optional[str] = None
+_scratch_path: Optional[str] = None
+
+
+def _init_worker():
+    """Create this worker's engine once, when the process starts"""
+    global _engine, _default_voice, _scratch_path
+    _scratch_path = os.path.join(SCRATCH_DIR, f"tts-worker-{os.getpid()}.wav")
+    # Worker processes skip atexit; multiprocessing finalizers still run
+    multiprocessing.util.Finalize(None, _remove_scratch, exitpriority=0)
+    try:
+        import pyttsx3
+        _engine = pyttsx3.init()
+        voices = _engine.getProperty('voices')
+        if voices:
+            _default_voice = voices[0].id
+        _engine.setProperty('volume', VOLUME)
+    except Exception as e:
+        print(f"Warning: TTS initialization failed in worker {os.getpid()}: {e}")
+        _engine = None
+
+
+def _remove_scratch():
+    if _scratch_path and os.path.exists(_scratch_path):
+        os.unlink(_scratch_path)
+
+
+def _require_engine():
+    if _engine is None:
+        raise TTSUnavailableError("TTS engine not available")
+    return _engine
+
+
+def _engine_ready() -> bool:
+    return _engine is not None
+
+
+def _render_job(text: str, voice_id: Optional[str], speed: float) -> bytes:
+    """Render one job to WAV bytes.
+
+    Voice and rate are set on every job, so settings from a previous job
+    never leak into the next one.
+    """
+    engine = _require_engine()
+
+    voice = _default_voice
+    if voice_id:
+        voices = engine.getProperty('voices')
+        if voices and voice_id in [v.id for v in voices]:
+            voice = voice_id
+    if voice:
+        engine.setProperty('voice', voice)
+    engine.setProperty('rate', int(BASE_RATE * speed))
+
+    # Each worker reuses one scratch file; jobs in a worker never overlap
+    engine.save_to_file(text, _scratch_path)
+    engine.runAndWait()
+    with open(_scratch_path, 'rb') as f:
+        return f.read()
+
+
+def _list_voices_job() -> List[Dict[str, Any]]:
+    engine = _require_engine()
+    voices = engine.getProperty('voices') or []
+    return [
+        {
+            "id": voice.id,
+            "name": voice.name,
+            "languages": list(getattr(voice, 'languages', []) or []),
+        }
+        for voice in voices
+    ]
+
+
+class TTSWorkerPool:
+    """Bounded pool of TTS worker processes.
+
+    At most ``workers`` jobs render at once. Up to ``max_queue`` more may
+    wait; beyond that ``synthesize`` raises TTSQueueFullError so callers can
+    shed load. A crashed worker takes the pool down with it, so the pool is
+    rebuilt on the next job.
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 16):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._processes = ProcessWorkerPool(workers, _init_worker, "TTS")
+        self._gate = AdmissionGate(
+            workers + max_queue, TTSQueueFullError, "Synthesis queue is full, retry shortly"
+        )
+        self.engine_available: Optional[bool] = None  # Unknown until probed
+        self.completed = 0
+        self.failed = 0
+
+    def start(self):
+        self._processes.start()
+
+    def shutdown(self):
+        """Stop the workers, cancelling jobs that have not started"""
+        self._processes.shutdown()
+
+    async def probe(self) -> bool:
+        """Start a worker and record whether it could create an engine"""
+        self.engine_available = await self._processes.submit(_engine_ready)
+        return self.engine_available
+
+    async def synthesize(self, text: str, voice_id: Optional[str] = None,
+                         speed: float = 1.0) -> bytes:
+        """Render text to WAV bytes in a worker process"""
+        with self._gate.admit():
+            try:
+                audio = await self._processes.submit(_render_job, text, voice_id, speed)
+                self.engine_available = True
+                self.completed += 1
+                return audio
+            except TTSUnavailableError:
+                self.engine_available = False
+                raise
+            except Exception:
+                self.failed += 1
+                raise
+
+    async def list_voices(self) -> List[Dict[str, Any]]:
+        return await self._processes.submit(_list_voices_job)
+
+    def stats(self) -> Dict[str, Any]:
+        """Current load figures for health reporting"""
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._gate.pending,
+            "engine_available": self.engine_available,
+            "completed": self.completed,
+            "rejected": self._gate.rejected,
+            "failed": self.failed,
+            "restarts": self._processes.restarts,
+        }
+
+
+def pool_from_env() -> TTSWorkerPool:
+    """Build the pool from TTS_WORKERS / TTS_MAX_QUEUE environment variables"""
+    return TTSWorkerPool(
+        workers=int(os.getenv("TTS_WORKERS", "2")),
+        max_queue=int(os.getenv("TTS_MAX_QUEUE", "16")),
+    )
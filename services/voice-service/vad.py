@@ -0,0 +1,139 @@
+"""
+Voice Activity Detection
+Cuts a live PCM stream into speech segments at pauses, so each segment can
+be transcribed while the candidate is still talking
+"""
+
+from collections import deque
+from typing import List, Optional
+import audioop
+
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+WEBRTC_RATES = (8000, 16000, 32000, 48000)
+
+
+class SegmentCutter:
+    """Splits mono PCM into speech segments.
+
+    Frames are classified with WebRTC VAD when it is installed and the
+    format allows it, otherwise by RMS energy against a threshold that
+    adapts to background noise the way Recognizer.listen does. A segment
+    ends after ``pause_ms`` of non-speech or when it reaches
+    ``max_segment_s``; segments with less than ``min_speech_ms`` of speech
+    are dropped as noise.
+    """
+
+    def __init__(self, sample_rate: int, sample_width: int, frame_ms: int = 30,
+                 pause_ms: int = 800, min_speech_ms: int = 250, pre_roll_ms: int = 300,
+                 max_segment_s: float = 15.0, energy_threshold: float = 300.0,
+                 dynamic_energy: bool = True):
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.frame_bytes = sample_rate * frame_ms // 1000 * sample_width
+        self.seconds_per_frame = frame_ms / 1000.0
+
+        self.pause_frames = max(1, pause_ms // frame_ms)
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.max_frames = max(1, int(max_segment_s * 1000) // frame_ms)
+
+        self.energy_threshold = energy_threshold
+        self.dynamic_energy = dynamic_energy
+        self.damping = 0.15 ** self.seconds_per_frame  # Recognizer defaults
+        self.energy_ratio = 1.5
+
+        self._webrtc = None
+        if (webrtcvad is not None and sample_width == 2
+                and sample_rate in WEBRTC_RATES and frame_ms in (10, 20, 30)):
+            self._webrtc = webrtcvad.Vad(2)
+
+        self._pending = b""
+        self._pre_roll: deque = deque(maxlen=max(0, pre_roll_ms // frame_ms))
+        self._segment = bytearray()
+        self._segment_frames = 0
+        self._speech_frames = 0
+        self._silent_frames = 0
+        self.frames_seen = 0
+        self._noise_energy = 0.0
+        self._noise_frames = 0
+
+    @property
+    def noise_rms(self) -> float:
+        """Mean energy of the frames classified as non-speech so far"""
+        return self._noise_energy / self._noise_frames if self._noise_frames else 0.0
+
+    @property
+    def in_speech(self) -> bool:
+        return self._segment_frames > 0
+
+    def feed(self, pcm: bytes) -> List[bytes]:
+        """Add audio; returns the segments it completed"""
+        data = self._pending + pcm if self._pending else pcm
+        usable = len(data) - len(data) % self.frame_bytes
+        self._pending = data[usable:]
+
+        segments = []
+        view = memoryview(data)
+        for start in range(0, usable, self.frame_bytes):
+            segment = self._process(view[start:start + self.frame_bytes])
+            if segment is not None:
+                segments.append(segment)
+        return segments
+
+    def flush(self) -> Optional[bytes]:
+        """End of stream; returns the trailing segment, if it holds speech"""
+        self._pending = b""
+        return self._close_segment()
+
+    def _is_speech(self, frame: memoryview) -> bool:
+        energy = audioop.rms(frame, self.sample_width)
+        if self._webrtc is not None:
+            speech = self._webrtc.is_speech(frame.tobytes(), self.sample_rate)
+        else:
+            speech = energy > self.energy_threshold
+        if speech:
+            return True
+
+        self._noise_energy += energy
+        self._noise_frames += 1
+        if self.dynamic_energy:
+            target = energy * self.energy_ratio
+            self.energy_threshold = self.energy_threshold * self.damping + target * (1 - self.damping)
+        return False
+
+    def _process(self, frame: memoryview) -> Optional[bytes]:
+        self.frames_seen += 1
+        speech = self._is_speech(frame)
+
+        if not self.in_speech:
+            if not speech:
+                self._pre_roll.append(frame)
+                return None
+            # Keep a little audio from before the onset so first syllables survive
+            for earlier in self._pre_roll:
+                self._segment += earlier
+            self._segment_frames = len(self._pre_roll)
+            self._pre_roll.clear()
+
+        self._segment += frame
+        self._segment_frames += 1
+        if speech:
+            self._speech_frames += 1
+            self._silent_frames = 0
+        else:
+            self._silent_frames += 1
+
+        if self._silent_frames >= self.pause_frames or self._segment_frames >= self.max_frames:
+            return self._close_segment()
+        return None
+
+    def _close_segment(self) -> Optional[bytes]:
+        segment = bytes(self._segment) if self._speech_frames >= self.min_speech_frames else None
+        self._segment = bytearray()
+        self._segment_frames = 0
+        self._speech_frames = 0
+        self._silent_frames = 0
+        return segment
@@ -3,53 +3,214 @@ Interview Session Manager
 Coordinates all agents to conduct interview sessions
 """
 
-from typing import Optional, Dict, List, Any
+from array import array
+from typing import Optional, Dict, Iterator, List, Any, Tuple
+import hashlib
 from agents import (
     InterviewerAgent,
     FollowupAgent,
     EvaluatorAgent,
     FeedbackAgent,
     ReportAgent,
+    CandidateProfile,
 )
+from agents.aggregate import SessionAggregate
+from agents.evaluation_cache import evaluation_cache
+from agents.rubric import extract_features
+
+
+# Rubric dimensions, in the order EvaluatorAgent returns them
+SCORE_DIMENSIONS = (
+    "clarity", "communication", "star_structure",
+    "role_relevance", "technical_depth", "overall",
+)
+
+
+class ScoreStore:
+    """Compact store of per-answer scores: one flat float array holding a
+    row of SCORE_DIMENSIONS values per answer. Behaves like a list of score
+    dicts for the agents that read it."""
+    
+    __slots__ = ("_values",)
+    
+    def __init__(self, scores: Optional[List[Dict[str, float]]] = None):
+        self._values = array('d')
+        if scores:
+            self.extend(scores)
+    
+    def append(self, scores: Dict[str, float]):
+        self._values.extend(scores[key] for key in SCORE_DIMENSIONS)
+    
+    def extend(self, scores: List[Dict[str, float]]):
+        for answer_scores in scores:
+            self.append(answer_scores)
+    
+    def column(self, key: str) -> array:
+        """All scores for one dimension"""
+        return self._values[SCORE_DIMENSIONS.index(key)::len(SCORE_DIMENSIONS)]
+    
+    def to_columns(self) -> Dict[str, List[float]]:
+        """Compact, JSON-serializable form"""
+        return {key: self.column(key).tolist() for key in SCORE_DIMENSIONS}
+    
+    @classmethod
+    def from_columns(cls, columns: Dict[str, List[float]]) -> "ScoreStore":
+        store = cls()
+        rows = zip(*(columns.get(key, []) for key in SCORE_DIMENSIONS))
+        for row in rows:
+            store._values.extend(row)
+        return store
+    
+    def __setitem__(self, index: int, scores: Dict[str, float]):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("score index out of range")
+        start = index * len(SCORE_DIMENSIONS)
+        self._values[start:start + len(SCORE_DIMENSIONS)] = array('d', (scores[key] for key in SCORE_DIMENSIONS))
+    
+    def __len__(self) -> int:
+        return len(self._values) // len(SCORE_DIMENSIONS)
+    
+    def __getitem__(self, index: int) -> Dict[str, float]:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("score index out of range")
+        start = index * len(SCORE_DIMENSIONS)
+        return dict(zip(SCORE_DIMENSIONS, self._values[start:start + len(SCORE_DIMENSIONS)]))
+    
+    def __iter__(self) -> Iterator[Dict[str, float]]:
+        for index in range(len(self)):
+            yield self[index]
+
+
+class EvaluationLedger:
+    """Which collected answers have been evaluated. Maps an answer's index in
+    collected_answers to a digest of its question, answer and type, and to
+    the position of its scores in all_scores / all_feedback, so each answer
+    is scored at most once however often it is submitted for evaluation."""
+    
+    __slots__ = ("_entries",)
+    
+    def __init__(self):
+        self._entries: Dict[int, Tuple[str, int]] = {}
+    
+    @staticmethod
+    def digest(qa_pair: Dict[str, str]) -> str:
+        payload = "\0".join((
+            qa_pair.get('question', ''),
+            qa_pair.get('answer', ''),
+            qa_pair.get('question_type') or "general",
+        ))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def lookup(self, index: int, digest: str) -> Optional[int]:
+        """Position of the answer's evaluation, if it was scored with this content"""
+        entry = self._entries.get(index)
+        if entry is not None and entry[0] == digest:
+            return entry[1]
+        return None
+    
+    def position(self, index: int) -> Optional[int]:
+        """Position of the answer's evaluation, whatever content it was scored with"""
+        entry = self._entries.get(index)
+        return entry[1] if entry is not None else None
+    
+    def record(self, index: int, digest: str, position: int):
+        self._entries[index] = (digest, position)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def to_state(self) -> List[List[Any]]:
+        """JSON-serializable form: [index, digest, position] rows"""
+        return [[index, digest, position] for index, (digest, position) in self._entries.items()]
+    
+    @classmethod
+    def from_state(cls, rows: List[List[Any]]) -> "EvaluationLedger":
+        ledger = cls()
+        for index, digest, position in rows:
+            ledger._entries[index] = (digest, position)
+        return ledger
 
 
 class InterviewSession:
     """Manages the interview session and coordinates agents"""
     
+    __slots__ = (
+        "resume", "job_description", "interview_type", "interviewer",
+        "question_count", "current_question", "current_answer", "all_scores",
+        "all_feedback", "session_active", "current_question_type", "collected_answers",
+        "noise_profile", "profile", "_aggregate", "_ledger", "store_version",
+        "final_result",
+    )
+    
+    # Stateless agents, shared by every session
+    followup = FollowupAgent()
+    evaluator = EvaluatorAgent()
+    feedback = FeedbackAgent()
+    report = ReportAgent()
+    
     def __init__(self):
         self.resume = ""
         self.job_description = ""
         self.interview_type = "Mixed"
+        self.profile = CandidateProfile()
         
-        # Initialize agents
-        self.interviewer = InterviewerAgent()
-        self.followup = FollowupAgent()
-        self.evaluator = EvaluatorAgent()
-        self.feedback = FeedbackAgent()
-        self.report = ReportAgent()
+        # The interviewer tracks which questions this session has asked
+        self.interviewer = InterviewerAgent(profile=self.profile)
         
         # Session state
         self.question_count = 0
         self.current_question = ""
         self.current_answer = ""
-        self.all_scores = []
+        self.all_scores = ScoreStore()
         self.all_feedback = []
+        self._aggregate: Optional[SessionAggregate] = None  # Created with the first score
         self.session_active = False
         self.current_question_type = "general"
         self.collected_answers = []  # For iterative collection mode
+        self._ledger: Optional[EvaluationLedger] = None  # Created with the first batch evaluation
+        self.noise_profile = None  # Microphone calibration, reused for every answer
+        self.store_version = 0  # Stored version this object was loaded from (key-value stores)
+        self.final_result: Optional[Dict[str, Any]] = None  # end_interview's result, once ended
+    
+    @property
+    def aggregate(self) -> SessionAggregate:
+        """Running statistics over all_scores / all_feedback.
+        Sessions without answers share no state; they get an empty one."""
+        return self._aggregate if self._aggregate is not None else SessionAggregate()
+    
+    @property
+    def ledger(self) -> EvaluationLedger:
+        """Which collected answers are already scored"""
+        return self._ledger if self._ledger is not None else EvaluationLedger()
+    
+    def _record(self, scores: Dict[str, float], feedback: Dict[str, Any]):
+        """Append an evaluated answer to the history and the running aggregate"""
+        self.all_scores.append(scores)
+        self.all_feedback.append(feedback)
+        if self._aggregate is None:
+            self._aggregate = SessionAggregate()
+        self._aggregate.add(scores, feedback)
     
     def initialize(self, resume: str = "", job_description: str = "", 
-                  interview_type: str = "Mixed"):
-        """Initialize the session with user inputs"""
+                  interview_type: str = "Mixed", profile: Optional[CandidateProfile] = None):
+        """Initialize the session with user inputs.
+        The job description is analysed here, once; the interviewer
+        reads the resulting profile."""
         self.resume = resume
         self.job_description = job_description
         self.interview_type = interview_type
+        self.profile = profile or CandidateProfile(job_description)
         
         # Update agent contexts
-        self.interviewer.update_context(resume, job_description, interview_type)
+        self.interviewer.update_context(resume, job_description, interview_type, self.profile)
         
         self.session_active = True
         self.question_count = 0
+        self.final_result = None
     
     def start_interview(self) -> str:
         """Start the interview and return the first question"""
@@ -57,6 +218,7 @@ class InterviewSession:
             return "Please share your resume (paste text) and the job description for the role you are targeting. Also tell me the interview style you want: Behavioral, Technical, or Mixed."
         
         self.session_active = True
+        self.final_result = None
         question = self.interviewer.generate_opening_question()
         self.current_question = question
         self.question_count += 1
@@ -77,17 +239,21 @@ class InterviewSession:
                 self.current_question, answer, self.current_question_type
             )
         
-        # Evaluate the answer
-        scores = self.evaluator.evaluate(
-            self.current_question, answer, self.current_question_type
-        )
-        self.all_scores.append(scores)
-        
-        # Generate feedback
-        feedback = self.feedback.generate_feedback(
-            self.current_question, answer, scores, self.current_question_type
-        )
-        self.all_feedback.append(feedback)
+        # Evaluate the answer and generate feedback, unless an identical
+        # answer to the same question was already scored
+        key = evaluation_cache.key(self.current_question, answer, self.current_question_type)
+        cached = evaluation_cache.get(key)
+        if cached is not None:
+            scores, feedback = cached
+        else:
+            scores = self.evaluator.evaluate(
+                self.current_question, answer, self.current_question_type
+            )
+            feedback = self.feedback.generate_feedback(
+                self.current_question, answer, scores, self.current_question_type
+            )
+            evaluation_cache.put(key, scores, feedback)
+        self._record(scores, feedback)
         
         # Format response
         response = {
@@ -103,6 +269,95 @@ class InterviewSession:
         
         return response
     
+    def evaluate_answers(self, qa_pairs: List[Dict[str, str]], start: int = 0) -> List[Dict[str, Any]]:
+        """Evaluate a batch of collected answers in one pass.
+        qa_pairs[i] is collected answer start + i. Answers already scored
+        with the same content are not scored again; their stored results
+        are returned instead. Each pair carries its own question and
+        question_type, so results do not depend on which question is current."""
+        ledger = self.ledger
+        digests = [ledger.digest(qa) for qa in qa_pairs]
+        pending = [
+            offset for offset, digest in enumerate(digests)
+            if ledger.lookup(start + offset, digest) is None
+        ]
+        
+        if pending:
+            self._ledger = ledger
+            questions = [qa_pairs[offset]['question'] for offset in pending]
+            answers = [qa_pairs[offset]['answer'] for offset in pending]
+            question_types = [qa_pairs[offset].get('question_type') or "general" for offset in pending]
+            scores, feedback = self._evaluate_batch(questions, answers, question_types)
+            
+            rescored = False
+            for offset, answer_scores, answer_feedback in zip(pending, scores, feedback):
+                position = ledger.position(start + offset)
+                if position is None:
+                    position = len(self.all_scores)
+                    self._record(answer_scores, answer_feedback)
+                else:
+                    # The answer changed since it was scored; replace its result
+                    self.all_scores[position] = answer_scores
+                    self.all_feedback[position] = answer_feedback
+                    rescored = True
+                ledger.record(start + offset, digests[offset], position)
+            
+            if rescored:
+                self._aggregate = SessionAggregate.from_history(self.all_scores, self.all_feedback)
+        
+        results = []
+        for offset, qa in enumerate(qa_pairs):
+            position = ledger.position(start + offset)
+            feedback = self.all_feedback[position]
+            if "sample_answer" not in feedback:
+                # Stored state drops sample answers; they depend only on the question
+                feedback = {**feedback, "sample_answer": self.feedback.generate_sample_answer(
+                    qa['question'], qa.get('question_type') or "general"
+                )}
+            results.append({
+                "question": qa['question'],
+                "answer": qa['answer'],
+                "scores": self.all_scores[position],
+                "feedback": feedback,
+            })
+        return results
+    
+    def _evaluate_batch(self, questions: List[str], answers: List[str],
+                        question_types: List[str]) -> Tuple[List[Dict[str, float]], List[Dict[str, Any]]]:
+        """Scores and feedback for a batch, scoring only the answers missing
+        from the process-wide evaluation cache"""
+        keys = [
+            evaluation_cache.key(question, answer, question_type)
+            for question, answer, question_type in zip(questions, answers, question_types)
+        ]
+        cached = [evaluation_cache.get(key) for key in keys]
+        misses = [i for i, entry in enumerate(cached) if entry is None]
+        
+        if misses:
+            miss_questions = [questions[i] for i in misses]
+            miss_answers = [answers[i] for i in misses]
+            miss_types = [question_types[i] for i in misses]
+            features = extract_features(miss_answers)
+            scores = self.evaluator.evaluate_batch(
+                miss_questions, miss_answers, miss_types, features
+            )
+            feedback = self.feedback.generate_feedback_batch(
+                miss_questions, miss_answers, scores, miss_types, features
+            )
+            for i, answer_scores, answer_feedback in zip(misses, scores, feedback):
+                evaluation_cache.put(keys[i], answer_scores, answer_feedback)
+                cached[i] = (answer_scores, answer_feedback)
+        
+        return [entry[0] for entry in cached], [entry[1] for entry in cached]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Live statistics for the answers evaluated so far"""
+        return {
+            "question_count": self.question_count,
+            "session_active": self.session_active,
+            **self.aggregate.stats(),
+        }
+    
     def get_next_question(self) -> Optional[str]:
         """Get the next interview question"""
         if not self.session_active:
@@ -118,7 +373,12 @@ class InterviewSession:
         return question
     
     def end_interview(self) -> Dict[str, Any]:
-        """End the interview and generate final report"""
+        """End the interview and generate the final report.
+        The report is returned as structured data; render it with
+        format_final_report when text is needed.
+        Ending an ended session returns the same result again."""
+        if self.final_result is not None:
+            return self.final_result
         if not self.session_active:
             return {"error": "No active session to end."}
         
@@ -126,16 +386,77 @@ class InterviewSession:
         
         # Generate final report
         report = self.report.generate_report(
-            self.all_scores, self.all_feedback, self.interview_type
+            self.all_scores, self.all_feedback, self.interview_type, self.aggregate
         )
         
-        return {
-            "final_report": self._format_final_report(report),
+        self.final_result = {
+            "report": report,
             "session_summary": {
                 "total_questions": self.question_count,
                 "total_answers": len(self.all_scores),
             }
         }
+        return self.final_result
+    
+    def to_state(self) -> Dict[str, Any]:
+        """Compact, JSON-serializable snapshot of the session.
+        Agents are not stored; they are rebuilt from this state on load.
+        Sample answers are dropped from feedback since they are not needed
+        once returned to the client."""
+        return {
+            "resume": self.resume,
+            "job_description": self.job_description,
+            "interview_type": self.interview_type,
+            "question_count": self.question_count,
+            "current_question": self.current_question,
+            "current_answer": self.current_answer,
+            "current_question_type": self.current_question_type,
+            "session_active": self.session_active,
+            "questions_asked": list(self.interviewer.questions_asked),
+            "noise_profile": self.noise_profile,
+            "profile": self.profile.to_state(),
+            "all_scores": self.all_scores.to_columns(),
+            "all_feedback": [
+                {
+                    "strengths": feedback.get("strengths", []),
+                    "improvements": feedback.get("improvements", []),
+                }
+                for feedback in self.all_feedback
+            ],
+            "collected_answers": self.collected_answers,
+            "aggregate": self._aggregate.to_state() if self._aggregate is not None else None,
+            "ledger": self._ledger.to_state() if self._ledger is not None else [],
+            "final_result": self.final_result,
+        }
+    
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "InterviewSession":
+        """Rebuild a session from a to_state() snapshot"""
+        session = cls()
+        session.initialize(
+            state.get("resume", ""),
+            state.get("job_description", ""),
+            state.get("interview_type", "Mixed"),
+            CandidateProfile.from_state(state.get("profile")),
+        )
+        session.question_count = state.get("question_count", 0)
+        session.current_question = state.get("current_question", "")
+        session.current_answer = state.get("current_answer", "")
+        session.current_question_type = state.get("current_question_type", "general")
+        session.session_active = state.get("session_active", False)
+        session.interviewer.restore_asked(state.get("questions_asked", []))
+        session.all_scores = ScoreStore.from_columns(state.get("all_scores", {}))
+        session.all_feedback = list(state.get("all_feedback", []))
+        if state.get("aggregate") is not None:
+            session._aggregate = SessionAggregate.from_state(state["aggregate"])
+        elif session.all_scores:
+            session._aggregate = SessionAggregate.from_history(session.all_scores, session.all_feedback)
+        session.collected_answers = list(state.get("collected_answers", []))
+        if state.get("ledger"):
+            session._ledger = EvaluationLedger.from_state(state["ledger"])
+        session.noise_profile = state.get("noise_profile")
+        session.final_result = state.get("final_result")
+        return session
     
     def _determine_question_type(self, question: str):
         """Determine the type of question (behavioral, technical, general)"""
@@ -186,8 +507,8 @@ Areas to Improve:
 Sample Improved Answer:
 {sample}"""
     
-    def _format_final_report(self, report: Dict[str, Any]) -> str:
-        """Format final report"""
+    def format_final_report(self, report: Dict[str, Any]) -> str:
+        """Render a report from end_interview as text"""
         avg_score = report.get("average_score", 0.0)
         strengths = "\n".join(f"• {s}" for s in report.get("key_strengths", []))
         improvements = "\n".join(f"• {i}" for i in report.get("key_improvements", []))
@@ -0,0 +1,60 @@
+"""
+Shared test fixtures.
+Each service's main.py is imported under its own module name, since they
+are all called main (as is the CLI at the project root).
+"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def load_service(name: str):
+    """Import services/<name>/main.py once, as <name>_main"""
+    module_name = name.replace("-", "_") + "_main"
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    service_dir = os.path.join(ROOT, "services", name)
+    if service_dir not in sys.path:
+        # Services import their helper modules top-level
+        sys.path.insert(0, service_dir)
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(service_dir, "main.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def interview_service(monkeypatch):
+    """The interview service with a fresh in-memory session store and
+    executor (the app's lifespan shuts the executor down on exit)"""
+    service = load_service("interview-service")
+    from executor import EvaluationExecutor
+    from session_store import InMemorySessionStore
+    monkeypatch.setattr(service, "sessions", InMemorySessionStore())
+    monkeypatch.setattr(service, "executor", EvaluationExecutor())
+    return service
+
+
+@pytest.fixture
+def voice_service(monkeypatch):
+    """The voice service with a fresh pool of the deterministic stub STT
+    backend (the app's lifespan shuts the pool down on exit)"""
+    monkeypatch.setenv("STT_BACKEND", "stub")
+    service = load_service("voice-service")
+    from stt_backends import stt_pool_from_env
+    monkeypatch.setattr(service, "stt_pool", stt_pool_from_env())
+    return service
+
+
+@pytest.fixture
+def gateway_service():
+    """The API gateway; with no services running, every upstream call fails fast"""
+    return load_service("api-gateway")
@@ -0,0 +1,36 @@
+"""
+The shared evaluation tier is bounded by a TTL and never fails a lookup.
+"""
+
+import sqlite3
+
+from agents.evaluation_cache import EvaluationCache
+
+
+def test_corrupt_shared_entry_is_a_miss(interview_service):
+    from session_store import SQLiteBackend
+    backend = SQLiteBackend()
+    cache = EvaluationCache(backend=backend)
+    key = cache.key("Tell me about yourself", "I build APIs", "behavioral")
+    backend.set(cache.prefix + key, b"{not json")
+
+    assert cache.get(key) is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_shared_entries_expire(interview_service, tmp_path):
+    from session_store import SQLiteBackend
+    path = str(tmp_path / "shared.db")
+    backend = SQLiteBackend(path)
+    writer = EvaluationCache(backend=backend, shared_ttl_seconds=60)
+    key = writer.key("Tell me about yourself", "I build APIs", "behavioral")
+    writer.put(key, {"overall": 7.0}, {"strengths": []})
+
+    # Another worker reads it through the shared tier until it expires
+    assert EvaluationCache(backend=backend).get(key) == ({"overall": 7.0}, {"strengths": []})
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("UPDATE kv SET expires_at = 0 WHERE key = ?", (writer.prefix + key,))
+    conn.close()
+    assert EvaluationCache(backend=backend).get(key) is None
+    assert backend.sweep() == 1
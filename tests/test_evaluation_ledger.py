@@ -0,0 +1,179 @@
+"""
+Each collected answer is scored at most once, however often evaluate-all,
+the stream and /end run, and whether or not they overlap.
+"""
+
+import asyncio
+import time
+
+import httpx
+from fastapi.testclient import TestClient
+
+RESUME = "Python developer who built AWS services"
+JOB_DESCRIPTION = "Backend engineer: Python, AWS, Docker"
+
+
+def collect_answers(client, count: int) -> str:
+    session_id = client.post("/sessions", json={
+        "resume": RESUME, "job_description": JOB_DESCRIPTION,
+    }).json()["session_id"]
+    client.post(f"/sessions/{session_id}/start")
+    for i in range(count):
+        response = client.post(f"/sessions/{session_id}/submit-answer", json={
+            "session_id": session_id,
+            "answer": f"I built service {i} in Python on AWS because we needed to scale it.",
+        })
+        assert response.status_code == 200
+    return session_id
+
+
+def test_repeated_evaluation_scores_each_answer_once(interview_service):
+    with TestClient(interview_service.app) as client:
+        session_id = collect_answers(client, 5)
+
+        first = client.post(f"/sessions/{session_id}/evaluate-all").json()
+        second = client.post(f"/sessions/{session_id}/evaluate-all").json()
+        report = client.post(f"/sessions/{session_id}/end").json()
+
+    assert first == second
+    assert report["total_answers"] == 5
+    session = interview_service.sessions.get(session_id)
+    assert len(session.all_scores) == 5
+    assert session.aggregate.count == 5
+
+
+def test_ending_twice_returns_the_same_report(interview_service):
+    with TestClient(interview_service.app) as client:
+        session_id = collect_answers(client, 3)
+
+        first = client.post(f"/sessions/{session_id}/end")
+        second = client.post(f"/sessions/{session_id}/end")
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    assert first.json()["total_answers"] == 3
+    assert len(interview_service.sessions.get(session_id).all_scores) == 3
+
+
+def test_stream_and_end_reuse_scores(interview_service):
+    with TestClient(interview_service.app) as client:
+        session_id = collect_answers(client, 3)
+
+        stream = client.post(f"/sessions/{session_id}/evaluate-all/stream")
+        client.post(f"/sessions/{session_id}/evaluate-all")
+        client.post(f"/sessions/{session_id}/end")
+
+    assert stream.text.count('"type": "evaluation"') == 3
+    session = interview_service.sessions.get(session_id)
+    assert len(session.all_scores) == 3
+    assert session.aggregate.count == 3
+
+
+def test_memoized_results_match_with_key_value_store(interview_service, monkeypatch):
+    from session_store import KeyValueSessionStore, SQLiteBackend
+    monkeypatch.setattr(interview_service, "sessions", KeyValueSessionStore(SQLiteBackend()))
+
+    with TestClient(interview_service.app) as client:
+        session_id = collect_answers(client, 2)
+        first = client.post(f"/sessions/{session_id}/evaluate-all").json()
+        second = client.post(f"/sessions/{session_id}/evaluate-all").json()
+
+    assert "sample_answer" in first["evaluations"][0]["feedback"]
+    assert first == second
+
+
+def test_concurrent_evaluation_scores_each_answer_once(interview_service, monkeypatch):
+    from session import EvaluationLedger
+    count = 50
+
+    # Widen the window between storing an answer's scores and recording
+    # them in the ledger, so overlapping requests would reliably double-score
+    record = EvaluationLedger.record
+
+    def slow_record(self, *args):
+        time.sleep(0.001)
+        return record(self, *args)
+
+    monkeypatch.setattr(EvaluationLedger, "record", slow_record)
+
+    async def run():
+        transport = httpx.ASGITransport(app=interview_service.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as client:
+            session_id = (await client.post("/sessions", json={
+                "resume": RESUME, "job_description": JOB_DESCRIPTION,
+            })).json()["session_id"]
+            await client.post(f"/sessions/{session_id}/start")
+            for i in range(count):
+                await client.post(f"/sessions/{session_id}/submit-answer", json={
+                    "session_id": session_id,
+                    "answer": f"Answer {i}: I profiled the Python service and fixed the slow query.",
+                })
+
+            responses = await asyncio.gather(
+                *(client.post(f"/sessions/{session_id}/evaluate-all") for _ in range(3)),
+                client.post(f"/sessions/{session_id}/evaluate-all/stream"),
+                client.post(f"/sessions/{session_id}/end"),
+            )
+            assert [response.status_code for response in responses] == [200] * 5
+            return session_id
+
+    session_id = asyncio.run(run())
+    session = interview_service.sessions.get(session_id)
+    assert len(session.all_scores) == count
+    assert session.aggregate.count == count
+    assert len(session.ledger) == count
+    assert len(interview_service.session_locks) == 0
+
+
+def test_aggregate_and_ledger_are_created_with_the_first_answer():
+    from session import InterviewSession
+
+    session = InterviewSession()
+    session.initialize(RESUME, JOB_DESCRIPTION, "Mixed")
+    session.start_interview()
+    restored = InterviewSession.from_state(session.to_state())
+    assert session._aggregate is None and session._ledger is None
+    assert restored._aggregate is None and restored._ledger is None
+    assert session.get_stats()["answer_count"] == 0
+
+    session.evaluate_answers([{"question": "Why Python?", "answer": "Because we measured it."}])
+    restored = InterviewSession.from_state(session.to_state())
+    assert restored.aggregate.count == 1
+    assert len(restored.ledger) == 1
+
+
+def test_stats_wait_for_a_running_evaluation(interview_service, monkeypatch):
+    from session import EvaluationLedger
+    count = 20
+    record = EvaluationLedger.record
+
+    def slow_record(self, *args):
+        time.sleep(0.005)
+        return record(self, *args)
+
+    monkeypatch.setattr(EvaluationLedger, "record", slow_record)
+
+    async def run():
+        transport = httpx.ASGITransport(app=interview_service.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as client:
+            session_id = (await client.post("/sessions", json={
+                "resume": RESUME, "job_description": JOB_DESCRIPTION,
+            })).json()["session_id"]
+            await client.post(f"/sessions/{session_id}/start")
+            for i in range(count):
+                await client.post(f"/sessions/{session_id}/submit-answer", json={
+                    "session_id": session_id,
+                    "answer": f"Answer {i}: I profiled the Python service and fixed the slow query.",
+                })
+
+            async def stats_midway():
+                await asyncio.sleep(0.03)  # Evaluation is now part-way through
+                return await client.get(f"/sessions/{session_id}/stats")
+
+            evaluation, stats = await asyncio.gather(
+                client.post(f"/sessions/{session_id}/evaluate-all"), stats_midway(),
+            )
+            assert evaluation.status_code == 200
+            return stats.json()
+
+    assert asyncio.run(run())["answer_count"] == count
@@ -0,0 +1,15 @@
+"""
+The gateway reports each route's upstream calls in a Server-Timing header.
+"""
+
+from fastapi.testclient import TestClient
+
+
+def test_server_timing_lists_upstream_spans(gateway_service):
+    with TestClient(gateway_service.app) as client:
+        response = client.get("/health")
+
+    timing = response.headers["Server-Timing"]
+    assert "interview.health;dur=" in timing
+    assert "voice.health;dur=" in timing
+    assert "total;dur=" in timing
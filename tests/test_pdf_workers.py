@@ -0,0 +1,42 @@
+"""
+The per-document CPU limit holds even if the parser swallows the
+interruption.
+"""
+
+import time
+
+import pytest
+
+
+def burn(seconds: float):
+    deadline = time.process_time() + seconds
+    while time.process_time() < deadline:
+        pass
+
+
+def test_cpu_limit_survives_a_swallowed_timeout(gateway_service, monkeypatch):
+    import pdf_workers
+    from utils.parser import PDFTimeoutError
+
+    interruptions = []
+
+    def swallowing_parser(data, max_pages=None):
+        # Like a parser with a blanket except around each page
+        for _ in range(6):
+            try:
+                burn(0.1)
+            except Exception as e:
+                interruptions.append(e)
+        return "text"
+
+    monkeypatch.setattr(pdf_workers, "extract_pdf_text", swallowing_parser)
+    with pytest.raises(PDFTimeoutError):
+        pdf_workers._extract_job(b"%PDF", None, 0.15)
+    assert len(interruptions) >= 2  # The timer fired again after the first was swallowed
+
+
+def test_documents_within_the_cpu_limit_parse(gateway_service, monkeypatch):
+    import pdf_workers
+
+    monkeypatch.setattr(pdf_workers, "extract_pdf_text", lambda data, max_pages=None: "text")
+    assert pdf_workers._extract_job(b"%PDF", None, 5.0) == "text"
@@ -0,0 +1,121 @@
+"""
+Golden outputs for the rubric: fixed answers must keep the scores and
+feedback the rule-based evaluator has always given them, one at a time
+and in batches. Update these only when grading is meant to change.
+"""
+
+import pytest
+
+from agents.evaluator import EvaluatorAgent
+from agents.feedback import FeedbackAgent
+
+# (question, question type, answer, expected scores, expected strengths, expected improvements)
+GOLDEN = [
+    (
+        "Tell me about a time you resolved a conflict on your team.",
+        "behavioral",
+        ("In my last role two engineers disagreed about the API design. My task was to get the "
+         "release out on time. I set up a meeting, listened to both proposals and we agreed on a "
+         "versioned endpoint. As a result we shipped a week early and the team adopted the review "
+         "process."),
+        {"clarity": 6.5, "communication": 7.0, "technical_depth": 7.0,
+         "role_relevance": 6.9, "star_structure": 6.5, "overall": 6.78},
+        ["Effective communication with good detail"],
+        ["Ensure you cover all STAR components, especially: situation, action"],
+    ),
+    (
+        "How would you design a rate limiter for a public API?",
+        "technical",
+        ("I would use a token bucket per client stored in Redis, because it handles bursts. The "
+         "algorithm refills tokens at a fixed rate; for scalability I would shard keys and cache "
+         "limits in memory, and test it with load tests."),
+        {"clarity": 6.0, "communication": 5.5, "technical_depth": 6.5,
+         "role_relevance": 5.6, "star_structure": 7.0, "overall": 6.12},
+        ["Attempted to address the question"],
+        [
+            "Enhance communication - provide more context and detail",
+            "Better connect your answer to the role requirements",
+            "Provide more detail and examples",
+        ],
+    ),
+    (
+        "Why do you want to work here?",
+        "general",
+        "Um, like, I guess, you know, it seems like a good company and um I like the product.",
+        {"clarity": 4.5, "communication": 3.5, "technical_depth": 7.0,
+         "role_relevance": 5.0, "star_structure": 7.0, "overall": 5.4},
+        ["Attempted to address the question"],
+        [
+            "Work on clarity - be more specific and concise",
+            "Enhance communication - provide more context and detail",
+            "Better connect your answer to the role requirements",
+            "Provide more detail and examples",
+            "Reduce filler words - practice speaking more confidently",
+        ],
+    ),
+    (
+        "Explain how a hash map works.",
+        "technical",
+        "It stores keys.",
+        {"clarity": 3.0, "communication": 3.0, "technical_depth": 4.0,
+         "role_relevance": 5.0, "star_structure": 7.0, "overall": 4.4},
+        ["Attempted to address the question"],
+        [
+            "Work on clarity - be more specific and concise",
+            "Enhance communication - provide more context and detail",
+            "Provide more technical depth - explain your approach and reasoning",
+            "Better connect your answer to the role requirements",
+            "Provide more detail and examples",
+        ],
+    ),
+    (
+        "Describe a project you are proud of.",
+        "general",
+        "",
+        {"clarity": 3.0, "communication": 3.0, "technical_depth": 3.0,
+         "role_relevance": 3.0, "star_structure": 3.0, "overall": 3.0},
+        ["Attempted to address the question"],
+        [
+            "Work on clarity - be more specific and concise",
+            "Enhance communication - provide more context and detail",
+            "Better connect your answer to the role requirements",
+            "Provide more detail and examples",
+        ],
+    ),
+    (
+        "Tell me about a time you failed.",
+        "behavioral",
+        ("I missed a deadline once. " * 12
+         + "I learned to plan better and now I estimate tasks with buffers, which improved "
+         "delivery by 30 percent."),
+        {"clarity": 6.5, "communication": 6.5, "technical_depth": 7.0,
+         "role_relevance": 5.0, "star_structure": 6.5, "overall": 6.3},
+        ["Attempted to address the question"],
+        [
+            "Better connect your answer to the role requirements",
+            "Ensure you cover all STAR components, especially: situation, action, result",
+        ],
+    ),
+]
+
+
+def assert_matches(scores, feedback, expected_scores, strengths, improvements):
+    assert scores == pytest.approx(expected_scores)
+    assert feedback["strengths"] == strengths
+    assert feedback["improvements"] == improvements
+
+
+@pytest.mark.parametrize("question, question_type, answer, expected_scores, strengths, improvements", GOLDEN)
+def test_single_answer_grading_is_unchanged(question, question_type, answer, expected_scores,
+                                            strengths, improvements):
+    scores = EvaluatorAgent().evaluate(question, answer, question_type)
+    feedback = FeedbackAgent().generate_feedback(question, answer, scores, question_type)
+    assert_matches(scores, feedback, expected_scores, strengths, improvements)
+
+
+def test_batch_grading_matches_the_golden_outputs():
+    questions, question_types, answers = zip(*(case[:3] for case in GOLDEN))
+    scores = EvaluatorAgent().evaluate_batch(questions, answers, question_types)
+    feedback = FeedbackAgent().generate_feedback_batch(questions, answers, scores, question_types)
+    for case, answer_scores, answer_feedback in zip(GOLDEN, scores, feedback):
+        assert_matches(answer_scores, answer_feedback, *case[3:])
@@ -0,0 +1,135 @@
+"""
+Session expiry applies to every store, not just the in-memory one.
+"""
+
+import sqlite3
+
+from session import InterviewSession
+
+
+def make_store(monkeypatch, kind: str, ttl: str, path: str = None):
+    from session_store import store_from_env
+    monkeypatch.setenv("SESSION_STORE", kind)
+    monkeypatch.setenv("SESSION_TTL_SECONDS", ttl)
+    if path:
+        monkeypatch.setenv("SESSION_STORE_PATH", path)
+    return store_from_env()
+
+
+def test_every_store_gets_the_default_ttl(interview_service, monkeypatch, tmp_path):
+    monkeypatch.delenv("SESSION_TTL_SECONDS", raising=False)
+    from session_store import store_from_env
+    monkeypatch.setenv("SESSION_STORE", "memory")
+    assert store_from_env().ttl_seconds == 7200
+    monkeypatch.setenv("SESSION_STORE", "sqlite")
+    monkeypatch.setenv("SESSION_STORE_PATH", str(tmp_path / "sessions.db"))
+    assert store_from_env().backend.ttl_seconds == 7200
+
+
+def test_sqlite_sessions_expire(interview_service, monkeypatch, tmp_path):
+    store = make_store(monkeypatch, "sqlite", "60", str(tmp_path / "sessions.db"))
+    store.save("a", InterviewSession())
+    store.save("b", InterviewSession())
+    assert len(store) == 2
+
+    # Age "a" past its expiry
+    conn = sqlite3.connect(str(tmp_path / "sessions.db"))
+    with conn:
+        conn.execute("UPDATE kv SET expires_at = 0 WHERE key = 'session:a'")
+    conn.close()
+
+    assert store.get("a") is None
+    assert "a" not in store
+    assert len(store) == 1
+
+    # An expired id can be created again
+    store.save("a", InterviewSession())
+    assert store.get("a") is not None
+
+    conn = sqlite3.connect(str(tmp_path / "sessions.db"))
+    with conn:
+        conn.execute("UPDATE kv SET expires_at = 0 WHERE key = 'session:b'")
+    conn.close()
+    assert store.sweep() == 1
+    assert len(store) == 1
+
+
+def test_sqlite_migrates_tables_without_expiry(interview_service, tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("CREATE TABLE kv (key TEXT PRIMARY KEY, value BLOB NOT NULL)")
+        conn.execute("INSERT INTO kv (key, value) VALUES ('session:old', x'7b7d')")
+    conn.close()
+
+    from session_store import SQLiteBackend
+    backend = SQLiteBackend(path, ttl_seconds=60)
+    assert backend.get("session:old") == b"{}"
+    assert backend.sweep() == 0
+
+
+def test_key_value_store_calls_run_off_the_event_loop(interview_service, monkeypatch):
+    import threading
+    from fastapi.testclient import TestClient
+    from session_store import KeyValueSessionStore, SQLiteBackend
+
+    threads = set()
+
+    class RecordingStore(KeyValueSessionStore):
+        def get(self, session_id):
+            threads.add(threading.current_thread().name)
+            return super().get(session_id)
+
+        def save(self, session_id, session):
+            threads.add(threading.current_thread().name)
+            super().save(session_id, session)
+
+    monkeypatch.setattr(interview_service, "sessions", RecordingStore(SQLiteBackend()))
+    with TestClient(interview_service.app) as client:
+        session_id = client.post("/sessions", json={
+            "resume": "Python developer", "job_description": "Backend engineer: Python",
+        }).json()["session_id"]
+        assert client.post(f"/sessions/{session_id}/start").status_code == 200
+        assert client.get(f"/sessions/{session_id}").status_code == 200
+
+    # asyncio.to_thread runs them on the loop's default executor
+    assert threads and all(name.startswith("asyncio") for name in threads)
+
+
+def test_health_counts_key_value_sessions_once(interview_service, monkeypatch):
+    from fastapi.testclient import TestClient
+    from session_store import KeyValueSessionStore, SQLiteBackend
+
+    counts = []
+
+    class CountingBackend(SQLiteBackend):
+        def count(self, prefix):
+            counts.append(prefix)
+            return super().count(prefix)
+
+    store = KeyValueSessionStore(CountingBackend())
+    store.save("a", InterviewSession())
+    monkeypatch.setattr(interview_service, "sessions", store)
+    with TestClient(interview_service.app) as client:
+        health = client.get("/health").json()
+
+    assert health["active_sessions"] == 1
+    assert health["session_store"]["live_sessions"] == 1
+    assert counts == ["session:"]
+
+
+def test_spill_files_are_swept_separately(interview_service, tmp_path):
+    import os
+    from session_store import InMemorySessionStore
+
+    store = InMemorySessionStore(max_sessions=1, spill_dir=str(tmp_path), spill_ttl_seconds=60)
+    for session_id in ("a", "b"):
+        store.save(session_id, InterviewSession())  # Inactive, so "a" spills
+    spilled = tmp_path / "a.json"
+    assert spilled.exists()
+
+    assert store.sweep() == 0
+    assert store.sweep_files() == 0
+    os.utime(spilled, (0, 0))
+    assert store.sweep_files() == 1
+    assert not spilled.exists()
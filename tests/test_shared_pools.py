@@ -0,0 +1,33 @@
+"""
+The shared LRU and admission gate behind the services' caches and pools.
+"""
+
+import pytest
+
+from utils.lru import LRUCache
+from services.shared.pools import AdmissionGate
+
+
+def test_lru_evicts_by_count_and_size():
+    cache = LRUCache(max_items=3, max_size=10)
+    cache.put("a", b"xxxx")
+    cache.put("b", b"xxxx")
+    assert cache.get("a") == b"xxxx"
+    cache.put("c", b"xxxx")  # 12 bytes: "b" is the least recently used
+
+    assert "b" not in cache
+    assert cache.size == 8
+    cache.put("d", b"x" * 11)  # Larger than the whole cache
+    assert "d" not in cache and len(cache) == 2
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_gate_rejects_past_its_limit():
+    gate = AdmissionGate(1, RuntimeError, "full")
+    with gate.admit():
+        with pytest.raises(RuntimeError, match="full"):
+            with gate.admit():
+                pass
+    assert (gate.pending, gate.rejected) == (0, 1)
+    with gate.admit():
+        assert gate.pending == 1
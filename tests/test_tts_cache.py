@@ -0,0 +1,45 @@
+"""
+The TTS cache's disk tier stays within its byte cap, evicting the least
+recently used files first.
+"""
+
+import os
+
+
+def test_disk_tier_evicts_least_recently_used(voice_service, tmp_path):
+    from tts_cache import TTSCache
+    cache = TTSCache(max_items=0, disk_dir=str(tmp_path), disk_max_bytes=3500)
+    for name in ("a", "b", "c"):
+        cache.put(name, b"x" * 1000)
+        # Distinct mtimes without sleeping
+        os.utime(tmp_path / f"{name}.wav", (0, {"a": 10, "b": 20, "c": 30}[name]))
+
+    assert cache.get("a") == b"x" * 1000  # Now the most recently used
+    cache.put("d", b"x" * 1000)
+
+    assert sorted(os.listdir(tmp_path)) == ["a.wav", "c.wav", "d.wav"]
+    assert cache.stats()["disk_bytes"] == 3000
+
+
+def test_disk_usage_survives_restart(voice_service, tmp_path):
+    from tts_cache import TTSCache
+    TTSCache(disk_dir=str(tmp_path)).put("a", b"x" * 1000)
+    assert TTSCache(disk_dir=str(tmp_path)).stats()["disk_bytes"] == 1000
+
+
+def test_oversized_audio_is_not_written(voice_service, tmp_path):
+    from tts_cache import TTSCache
+    cache = TTSCache(disk_dir=str(tmp_path), disk_max_bytes=100)
+    cache.put("a", b"x" * 1000)
+    assert os.listdir(tmp_path) == []
+
+
+def test_overwriting_a_key_replaces_its_disk_usage(voice_service, tmp_path):
+    from tts_cache import TTSCache
+    cache = TTSCache(max_items=0, disk_dir=str(tmp_path), disk_max_bytes=10000)
+    cache.put("b", b"x" * 1000)
+    for _ in range(5):
+        cache.put("a", b"x" * 1000)
+
+    assert sorted(os.listdir(tmp_path)) == ["a.wav", "b.wav"]
+    assert cache.stats()["disk_bytes"] == 2000
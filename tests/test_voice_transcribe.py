@@ -0,0 +1,154 @@
+"""
+/transcribe and /transcribe-stream against the stub STT backend, which
+returns fixed text for any audio with sound in it.
+"""
+
+import array
+import io
+import math
+import wave
+
+import pytest
+from fastapi.testclient import TestClient
+
+STUB_TEXT = "This is a stub transcription."
+SAMPLE_RATE = 16000
+
+
+def tone(seconds: float) -> bytes:
+    return array.array("h", (
+        int(8000 * math.sin(2 * math.pi * 440 * i / SAMPLE_RATE))
+        for i in range(int(SAMPLE_RATE * seconds))
+    )).tobytes()
+
+
+def silence(seconds: float) -> bytes:
+    return bytes(int(SAMPLE_RATE * seconds) * 2)
+
+
+def to_wav(pcm: bytes) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
+# Two phrases separated by a pause longer than the segment cutter's 800 ms
+TWO_PHRASES = tone(1.0) + silence(1.2) + tone(1.0) + silence(1.2)
+
+
+@pytest.fixture
+def client(voice_service):
+    with TestClient(voice_service.app) as client:
+        yield client
+
+
+def stream(client, audio: bytes, query: str = "energy_threshold=300"):
+    """Send audio to /transcribe-stream; returns every message up to the final one"""
+    with client.websocket_connect(f"/transcribe-stream?{query}") as websocket:
+        websocket.send_bytes(audio)
+        websocket.send_json({"type": "end"})
+        messages = [websocket.receive_json()]
+        while messages[-1]["type"] != "final":
+            messages.append(websocket.receive_json())
+        return messages
+
+
+def test_transcribe_upload(client):
+    response = client.post("/transcribe", files={"file": ("answer.wav", to_wav(tone(1.0)), "audio/wav")})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "text": STUB_TEXT, "confidence": 1.0, "language": "en-US", "noise_profile": None,
+    }
+
+
+def test_transcribe_silence_is_empty(client):
+    response = client.post("/transcribe", files={"file": ("answer.wav", to_wav(silence(1.0)), "audio/wav")},
+                           params={"language": "en-GB"})
+
+    assert response.status_code == 200
+    assert response.json()["text"] == ""
+    assert response.json()["language"] == "en-GB"
+
+
+def test_transcribe_unreadable_upload(client):
+    response = client.post("/transcribe", files={"file": ("answer.wav", b"not audio", "audio/wav")})
+
+    assert response.status_code == 500
+
+
+def test_stream_reports_each_phrase(client):
+    messages = stream(client, TWO_PHRASES)
+
+    assert [m["type"] for m in messages] == ["partial", "partial", "final"]
+    assert messages[1]["text_so_far"] == f"{STUB_TEXT} {STUB_TEXT}"
+    final = messages[-1]
+    assert final["text"] == f"{STUB_TEXT} {STUB_TEXT}"
+    assert final["segments"] == 2
+    assert final["complete"] is True
+    # The session's profile was passed in, so none is measured
+    assert final["noise_profile"] is None
+
+
+def test_stream_accepts_wav_and_measures_noise(client):
+    messages = stream(client, to_wav(TWO_PHRASES), query="audio_format=wav")
+
+    final = messages[-1]
+    assert final["segments"] == 2
+    assert set(final["noise_profile"]) == {"noise_rms", "energy_threshold"}
+
+
+def test_stream_rejects_unsupported_format(client):
+    with client.websocket_connect("/transcribe-stream?audio_format=mp3") as websocket:
+        assert websocket.receive_json()["type"] == "error"
+
+
+def flaky_transcribe(voice_service, monkeypatch, failures: int):
+    """Make the STT pool turn away its first ``failures`` jobs"""
+    from stt_backends import STTBusyError
+    transcribe = voice_service.stt_pool.transcribe
+    calls = []
+
+    async def flaky(audio, language):
+        calls.append(language)
+        if len(calls) <= failures:
+            raise STTBusyError("Transcription queue is full, retry shortly")
+        return await transcribe(audio, language)
+
+    monkeypatch.setattr(voice_service.stt_pool, "transcribe", flaky)
+    monkeypatch.setattr(voice_service, "SEGMENT_RETRY_DELAY", 0.01)
+
+
+def test_stream_retries_busy_segments(voice_service, client, monkeypatch):
+    flaky_transcribe(voice_service, monkeypatch, failures=2)
+
+    final = stream(client, TWO_PHRASES)[-1]
+
+    assert final["segments"] == 2
+    assert final["complete"] is True
+
+
+def test_stream_marks_lost_segments(voice_service, client, monkeypatch):
+    flaky_transcribe(voice_service, monkeypatch, failures=100)
+
+    messages = stream(client, TWO_PHRASES)
+
+    assert [m["type"] for m in messages] == ["error", "error", "final"]
+    assert messages[-1]["complete"] is False
+    assert messages[-1]["failed_segments"] == [0, 1]
+
+
+def test_compressed_uploads_skip_audio_file(voice_service, monkeypatch):
+    import audio_io
+
+    def no_audio_file(source):
+        raise AssertionError("sr.AudioFile was tried for a compressed format")
+
+    monkeypatch.setattr(audio_io.sr, "AudioFile", no_audio_file)
+    monkeypatch.setattr(audio_io, "_transcode_with_ffmpeg", lambda data, audio_format: to_wav(tone(0.5)))
+    audio = audio_io.load_audio(b"\x1aE\xdf\xa3 not really webm", "WEBM")
+    assert audio.sample_rate == 16000
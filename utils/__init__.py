@@ -2,7 +2,8 @@
 Utility functions for the Interview Practice System
 """
 
-from .parser import parse_pdf, parse_text
+from .lru import LRUCache
+from .parser import PDFTextCache, PDFTimeoutError, extract_pdf_text, parse_pdf, parse_pdf_bytes, parse_text, pdf_cache
 
-__all__ = ['parse_pdf', 'parse_text']
+__all__ = ['LRUCache', 'PDFTextCache', 'PDFTimeoutError', 'extract_pdf_text', 'parse_pdf', 'parse_pdf_bytes', 'parse_text', 'pdf_cache']
 
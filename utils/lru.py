@@ -0,0 +1,67 @@
+"""
+LRU Cache
+Thread-safe least-recently-used mapping shared by the agents', parser's
+and services' caches. Standard library only, so any layer can use it
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+import threading
+
+
+class LRUCache:
+    """Keeps the most recently used entries within ``max_items`` and, when
+    set, ``max_size``: the summed ``sizeof`` of the values (bytes of audio,
+    characters of text). A value larger than ``max_size`` on its own is not
+    stored. ``hits`` and ``misses`` count lookups. Safe to use from worker
+    threads.
+    """
+
+    def __init__(self, max_items: int, max_size: Optional[int] = None,
+                 sizeof: Callable[[Any], int] = len):
+        self.max_items = max_items
+        self.max_size = max_size
+        self.sizeof = sizeof
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        size = self.sizeof(value) if self.max_size is not None else 0
+        if self.max_size is not None and size > self.max_size:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None and self.max_size is not None:
+                self._size -= self.sizeof(previous)
+            self._entries[key] = value
+            self._size += size
+            while len(self._entries) > self.max_items or (
+                    self.max_size is not None and self._size > self.max_size):
+                _, evicted = self._entries.popitem(last=False)
+                if self.max_size is not None:
+                    self._size -= self.sizeof(evicted)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Summed size of the stored values (0 without ``max_size``)"""
+        return self._size
@@ -2,42 +2,137 @@
 PDF and text parsing utilities
 """
 
+from typing import Dict, Iterator, Optional
+import hashlib
+import io
 import os
-from typing import Optional
+import time
 
+from .lru import LRUCache
 
-def parse_pdf(file_path: str) -> Optional[str]:
+
+class PDFTimeoutError(TimeoutError):
+    """Text extraction ran past its deadline"""
+
+
+class PDFTextCache:
+    """LRU cache of extracted PDF text keyed by a hash of the file's bytes.
+
+    Re-uploading the same resume or job description skips extraction
+    entirely. Safe to use from worker threads.
     """
-    Parse PDF file and extract text content.
-    Falls back to basic text extraction if PyPDF2 is not available.
+
+    def __init__(self, max_items: int = 128, max_chars: int = 8 * 1024 * 1024):
+        self.max_items = max_items
+        self.max_chars = max_chars
+        self._texts = LRUCache(max_items, max_size=max_chars)
+
+    @staticmethod
+    def key(data: bytes, max_pages: Optional[int] = None) -> str:
+        return f"{hashlib.sha256(data).hexdigest()}:{max_pages or 'all'}"
+
+    def get(self, key: str) -> Optional[str]:
+        return self._texts.get(key)
+
+    def put(self, key: str, text: str):
+        self._texts.put(key, text)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "items": len(self._texts),
+            "chars": self._texts.size,
+            "hits": self._texts.hits,
+            "misses": self._texts.misses,
+        }
+
+
+pdf_cache = PDFTextCache(
+    max_items=int(os.getenv("PDF_CACHE_MAX_ITEMS", "128")),
+    max_chars=int(os.getenv("PDF_CACHE_MAX_CHARS", str(8 * 1024 * 1024))),
+)
+
+
+def iter_pdf_pages(data: bytes, max_pages: Optional[int] = None) -> Iterator[str]:
+    """
+    Yield the text of each page of an in-memory PDF, one page at a time.
+    Uses PyPDF2, falling back to pdfplumber; raises ImportError if neither
+    is installed.
     """
-    if not os.path.exists(file_path):
-        return None
-    
     try:
         import PyPDF2
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text.strip()
     except ImportError:
-        # Fallback: try pdfplumber
-        try:
-            import pdfplumber
-            with pdfplumber.open(file_path) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    text += page.extract_text() + "\n"
-                return text.strip()
-        except ImportError:
-            # If no PDF library available, return None
-            return None
+        PyPDF2 = None
+
+    if PyPDF2 is not None:
+        pages = PyPDF2.PdfReader(io.BytesIO(data)).pages
+        count = len(pages) if max_pages is None else min(max_pages, len(pages))
+        for index in range(count):
+            yield pages[index].extract_text() or ""
+        return
+
+    import pdfplumber
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        pages = pdf.pages if max_pages is None else pdf.pages[:max_pages]
+        for page in pages:
+            yield page.extract_text() or ""
+            # Release the page's parsed objects before moving on
+            page.close()
+
+
+def extract_pdf_text(data: bytes, max_pages: Optional[int] = None,
+                     timeout: Optional[float] = None) -> Optional[str]:
+    """
+    Extract text from PDF bytes held in memory, without the cache.
+    Stops after max_pages pages; raises PDFTimeoutError if extraction is
+    still running after timeout seconds (checked between pages).
+    """
+    deadline = time.monotonic() + timeout if timeout else None
+    parts = []
+    try:
+        for page_text in iter_pdf_pages(data, max_pages):
+            parts.append(page_text)
+            if deadline is not None and time.monotonic() > deadline:
+                raise PDFTimeoutError(f"PDF parsing exceeded {timeout}s after {len(parts)} pages")
+    except PDFTimeoutError:
+        raise
+    except ImportError:
+        # If no PDF library available, return None
+        return None
     except Exception as e:
         print(f"Error parsing PDF: {e}")
         return None
 
+    return "\n".join(parts).strip()
+
+
+def parse_pdf_bytes(data: bytes, max_pages: Optional[int] = None,
+                    timeout: Optional[float] = None) -> Optional[str]:
+    """
+    Extract text from PDF bytes held in memory, caching results by content hash
+    """
+    key = PDFTextCache.key(data, max_pages)
+    cached = pdf_cache.get(key)
+    if cached is not None:
+        return cached
+
+    text = extract_pdf_text(data, max_pages, timeout)
+    if text:
+        pdf_cache.put(key, text)
+    return text
+
+
+def parse_pdf(file_path: str, max_pages: Optional[int] = None,
+              timeout: Optional[float] = None) -> Optional[str]:
+    """
+    Parse PDF file and extract text content.
+    Falls back to pdfplumber if PyPDF2 is not available.
+    """
+    if not os.path.exists(file_path):
+        return None
+
+    with open(file_path, 'rb') as file:
+        return parse_pdf_bytes(file.read(), max_pages=max_pages, timeout=timeout)
+
 
 def parse_text(content: str) -> str:
     """
@@ -46,4 +141,3 @@ def parse_text(content: str) -> str:
     Can be extended for cleaning/normalization.
     """
     return content.strip()
-